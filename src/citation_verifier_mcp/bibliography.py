@@ -0,0 +1,391 @@
+# src/citation_verifier_mcp/bibliography.py
+
+"""Parse BibTeX, RIS and CSL-JSON bibliographies and verify every entry.
+
+The parsers are generators that scan the document and yield one compact
+:class:`BibEntry` at a time, so parsing a reference list of thousands of
+entries never builds a parse tree for more than the current entry. Entries
+with a DOI go through the cached, deduplicated consistency check; entries
+without one are looked up by title on Crossref, up to a limit per call.
+"""
+
+import asyncio
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import env_int
+from .consistency import check_citations, format_fields
+from .search import CitationSearcher
+from .verification import VerificationService
+
+FORMATS = ("bibtex", "ris", "csl-json")
+
+_DOI = re.compile(r"10\.\d{4,9}/[^\s\"'<>{}]+")
+
+
+@dataclass(frozen=True, slots=True)
+class BibEntry:
+    """The fields of a bibliography entry that can be checked."""
+
+    key: str
+    doi: str = ""
+    title: str = ""
+    authors: str = ""
+    year: str = ""
+    journal: str = ""
+
+    def citation(self) -> Dict[str, Any]:
+        """The entry as a ``check_citations`` citation, with only the fields given."""
+        fields = ("doi", "title", "authors", "year", "journal")
+        return {name: getattr(self, name) for name in fields if getattr(self, name)}
+
+
+def detect_format(text: str) -> str:
+    """Guess a bibliography's format from its first non-blank characters."""
+    head = text.lstrip()[:1]
+    if head in ("[", "{"):
+        return "csl-json"
+    if re.search(r"^TY  - ", text[:4096], re.MULTILINE):
+        return "ris"
+    return "bibtex"
+
+
+def parse_bibliography(text: str, format: Optional[str] = None) -> Iterator[BibEntry]:
+    """Yield the entries of a BibTeX, RIS or CSL-JSON document."""
+    format = (format or detect_format(text)).lower()
+    if format == "bibtex":
+        return parse_bibtex(text)
+    if format == "ris":
+        return parse_ris(text)
+    if format in ("csl-json", "csl", "json"):
+        return parse_csl_json(text)
+    raise ValueError(f"Unknown bibliography format: {format} (expected one of {FORMATS})")
+
+
+def _find_doi(value: str) -> str:
+    match = _DOI.search(value)
+    return match.group(0).rstrip(".,;") if match else ""
+
+
+def _year(value: str) -> str:
+    match = re.search(r"\d{4}", value)
+    return match.group(0) if match else ""
+
+
+def _person(name: str) -> str:
+    """Turn "Family, Given" into "Given Family"; other forms are kept."""
+    family, comma, given = name.partition(",")
+    return f"{given.strip()} {family.strip()}".strip() if comma else name.strip()
+
+
+# BibTeX
+
+_BIBTEX_ENTRY = re.compile(r"@\s*([A-Za-z]+)\s*([{(])")
+_BIBTEX_DELIMITERS = re.compile(r"[{}()]")
+_BIBTEX_FIELD = re.compile(r"[\s,]*([A-Za-z][\w:-]*)\s*=\s*")
+_BIBTEX_BARE = re.compile(r"[^,\s]*")
+_LATEX_ESCAPE = re.compile(r"\\([&%$#_{}])")
+_LATEX_ACCENT = re.compile(r"\\([`'^\"~=.])\s*\{?([A-Za-z])\}?")
+_LATEX_COMMAND = re.compile(r"\\[A-Za-z]+\s*|\\[`'^\"~=.]")
+_COMBINING = {
+    "`": "\u0300",
+    "'": "\u0301",
+    "^": "\u0302",
+    "~": "\u0303",
+    "=": "\u0304",
+    ".": "\u0307",
+    '"': "\u0308",
+}
+
+
+def _closing(text: str, start: int, close: str) -> int:
+    """Index of the delimiter that closes a BibTeX entry or braced value."""
+    depth = 0
+    for match in _BIBTEX_DELIMITERS.finditer(text, start):
+        char = match.group(0)
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            if depth == 0 and close == "}":
+                return match.start()
+            depth -= 1
+        elif char == close and depth == 0:
+            return match.start()
+    return len(text)
+
+
+def _bibtex_value(body: str, start: int) -> Tuple[str, int]:
+    """Read one field value starting at ``start``; return it and the position after it."""
+    if start >= len(body):
+        return "", start
+    if body[start] == "{":
+        end = _closing(body, start + 1, "}")
+        return body[start + 1 : end], end + 1
+    if body[start] == '"':
+        depth = 0
+        for index in range(start + 1, len(body)):
+            char = body[index]
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+            elif char == '"' and depth == 0 and body[index - 1] != "\\":
+                return body[start + 1 : index], index + 1
+        return body[start + 1 :], len(body)
+    match = _BIBTEX_BARE.match(body, start)
+    end = match.end() if match else start
+    return body[start:end], end
+
+
+def _clean_latex(value: str) -> str:
+    value = _LATEX_ESCAPE.sub(r"\1", value)
+    value = _LATEX_ACCENT.sub(lambda m: m.group(2) + _COMBINING[m.group(1)], value)
+    value = unicodedata.normalize("NFC", value)
+    value = _LATEX_COMMAND.sub("", value).replace("{", "").replace("}", "")
+    return " ".join(value.split())
+
+
+def _bibtex_fields(body: str, macros: Dict[str, str]) -> Dict[str, str]:
+    """Parse ``name = value`` pairs, expanding bare words defined by @string."""
+    fields: Dict[str, str] = {}
+    cursor = 0
+    while (field := _BIBTEX_FIELD.match(body, cursor)) is not None:
+        bare = body[field.end() : field.end() + 1] not in ("{", '"')
+        value, cursor = _bibtex_value(body, field.end())
+        if bare:
+            value = macros.get(value.lower(), value)
+        fields[field.group(1).lower()] = _clean_latex(value)
+    return fields
+
+
+def parse_bibtex(text: str) -> Iterator[BibEntry]:
+    """Yield the entries of a BibTeX document, skipping @preamble and @comment.
+
+    @string abbreviations are remembered and expanded in later entries.
+    """
+    macros: Dict[str, str] = {}
+    position = 0
+    while True:
+        match = _BIBTEX_ENTRY.search(text, position)
+        if match is None:
+            return
+        end = _closing(text, match.end(), "}" if match.group(2) == "{" else ")")
+        position = end + 1
+        kind = match.group(1).lower()
+        if kind == "string":
+            for name, value in _bibtex_fields(text[match.end() : end], macros).items():
+                macros[name] = value
+            continue
+        if kind in ("comment", "preamble"):
+            continue
+
+        key, _, rest = text[match.end() : end].partition(",")
+        fields = _bibtex_fields(rest, macros)
+
+        authors = re.split(r"\s+and\s+", fields.get("author", "")) if "author" in fields else []
+        yield BibEntry(
+            key=key.strip(),
+            doi=_find_doi(fields.get("doi", "")) or _find_doi(fields.get("url", "")),
+            title=fields.get("title", ""),
+            authors=", ".join(_person(author) for author in authors if author),
+            year=_year(fields.get("year", "") or fields.get("date", "")),
+            journal=fields.get("journal", "") or fields.get("journaltitle", ""),
+        )
+
+
+# RIS
+
+_RIS_LINE = re.compile(r"^([A-Z][A-Z0-9])  -(?: ([^\r\n]*))?\r?$", re.MULTILINE)
+
+
+def parse_ris(text: str) -> Iterator[BibEntry]:
+    """Yield the records of an RIS document, one ``TY`` ... ``ER`` block at a time."""
+    record: Dict[str, List[str]] = {}
+    count = 0
+    for match in _RIS_LINE.finditer(text):
+        tag, value = match.group(1), (match.group(2) or "").strip()
+        if tag == "TY":
+            record = {}
+        elif tag == "ER":
+            count += 1
+            yield _ris_entry(record, count)
+            record = {}
+        else:
+            record.setdefault(tag, []).append(value)
+
+
+def _ris_entry(record: Dict[str, List[str]], number: int) -> BibEntry:
+    def first(*tags: str) -> str:
+        for tag in tags:
+            if record.get(tag):
+                return record[tag][0]
+        return ""
+
+    authors = record.get("AU", []) + record.get("A1", [])
+    return BibEntry(
+        key=first("ID") or f"record-{number}",
+        doi=_find_doi(first("DO")) or _find_doi(" ".join(record.get("UR", []))),
+        title=first("TI", "T1"),
+        authors=", ".join(_person(author) for author in authors),
+        year=_year(first("PY", "Y1", "DA")),
+        journal=first("JO", "JF", "T2", "JA"),
+    )
+
+
+# CSL-JSON
+
+
+def parse_csl_json(text: str) -> Iterator[BibEntry]:
+    """Yield the items of a CSL-JSON array (or a single item), decoding one at a time."""
+    decoder = json.JSONDecoder()
+    position = len(text) - len(text.lstrip())
+    if text.startswith("{", position):
+        item, _ = decoder.raw_decode(text, position)
+        yield _csl_entry(item, 1)
+        return
+    if not text.startswith("[", position):
+        raise ValueError("CSL-JSON must be an array of items")
+
+    position += 1
+    count = 0
+    while True:
+        while position < len(text) and text[position] in " \t\r\n,":
+            position += 1
+        if position >= len(text) or text[position] == "]":
+            return
+        item, position = decoder.raw_decode(text, position)
+        count += 1
+        if isinstance(item, dict):
+            yield _csl_entry(item, count)
+
+
+def _csl_entry(item: Dict[str, Any], number: int) -> BibEntry:
+    def text_of(value: Any) -> str:
+        return str(value[0] if isinstance(value, list) and value else value or "")
+
+    authors = []
+    for person in item.get("author") or []:
+        name = person.get("literal") or f"{person.get('given', '')} {person.get('family', '')}"
+        authors.append(name.strip())
+    date_parts = (item.get("issued") or {}).get("date-parts") or [[]]
+    year = str(date_parts[0][0]) if date_parts and date_parts[0] else ""
+    return BibEntry(
+        key=str(item.get("id") or f"item-{number}"),
+        doi=_find_doi(text_of(item.get("DOI"))) or _find_doi(text_of(item.get("URL"))),
+        title=text_of(item.get("title")),
+        authors=", ".join(authors),
+        year=year or _year(text_of((item.get("issued") or {}).get("raw"))),
+        journal=text_of(item.get("container-title")),
+    )
+
+
+# Verification
+
+
+def _parse_entries(text: str, format: Optional[str], max_entries: int) -> List[BibEntry]:
+    entries: List[BibEntry] = []
+    for entry in parse_bibliography(text, format):
+        entries.append(entry)
+        if len(entries) > max_entries:
+            raise ValueError(f"Too many bibliography entries in one call: > {max_entries}")
+    return entries
+
+
+async def check_bibliography(
+    service: VerificationService,
+    verifier: Any,
+    searcher: CitationSearcher,
+    text: str,
+    format: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Verify every entry of a bibliography, returning one report per entry in order.
+
+    Entries with a DOI get a consistency report (see :func:`check_citations`).
+    Entries with only a title are searched on Crossref, at most
+    ``CITATION_BIBLIOGRAPHY_SEARCHES`` per call; the rest are reported as
+    ``unresolved``.
+    """
+    max_entries = env_int("CITATION_MAX_BIBLIOGRAPHY", 5000)
+    # Parsing thousands of entries takes long enough to stall the event loop
+    entries = await asyncio.to_thread(_parse_entries, text, format, max_entries)
+
+    with_doi = [entry for entry in entries if entry.doi]
+    checked = iter(
+        await check_citations(
+            service, verifier, [entry.citation() for entry in with_doi], max_batch=max_entries
+        )
+    )
+
+    search_budget = env_int("CITATION_BIBLIOGRAPHY_SEARCHES", 50)
+    semaphore = asyncio.Semaphore(4)
+
+    async def search(entry: BibEntry) -> Dict[str, Any]:
+        async with semaphore:
+            candidates = await searcher.search(
+                entry.title, authors=entry.authors, year=entry.year, limit=1
+            )
+        if not candidates:
+            return {"status": "unresolved", "error": "No DOI given and no matching work found"}
+        return {"status": "suggested", "suggestion": candidates[0]}
+
+    searches: List["asyncio.Future[Dict[str, Any]]"] = []
+    for entry in entries:
+        if not entry.doi and entry.title and len(searches) < search_budget:
+            searches.append(asyncio.ensure_future(search(entry)))
+    found = iter(await asyncio.gather(*searches))
+
+    reports: List[Dict[str, Any]] = []
+    searched = 0
+    for entry in entries:
+        if entry.doi:
+            report = next(checked)
+        elif entry.title and searched < len(searches):
+            searched += 1
+            report = next(found)
+        else:
+            reason = "No DOI or title" if not entry.title else "Search limit reached"
+            report = {"status": "unresolved", "error": reason}
+        reports.append({"key": entry.key, "title": entry.title, **report})
+    return reports
+
+
+def format_bibliography_report(reports: List[Dict[str, Any]]) -> str:
+    """Format bibliography reports for display, problems first."""
+    counts: Dict[str, int] = {}
+    for report in reports:
+        counts[report["status"]] = counts.get(report["status"], 0) + 1
+
+    lines = [
+        "# 📚 Bibliography Verification Report",
+        "",
+        f"**Entries:** {len(reports)} | **Consistent:** {counts.get('match', 0)} | "
+        f"**Mismatched:** {counts.get('mismatch', 0)} | "
+        f"**Not found:** {counts.get('not_found', 0)} | "
+        f"**DOI suggested:** {counts.get('suggested', 0)} | "
+        f"**Unresolved:** {counts.get('unresolved', 0)}",
+    ]
+
+    order = {"mismatch": 0, "not_found": 1, "unresolved": 2, "suggested": 3, "match": 4}
+    for report in sorted(reports, key=lambda r: order[r["status"]]):
+        lines.append("")
+        status = report["status"]
+        if status in ("not_found", "unresolved"):
+            lines.append(
+                f"## ❌ {report['key']}" + (f" ({report['doi']})" if "doi" in report else "")
+            )
+            lines.append(f"**Error:** {report['error']}")
+        elif status == "suggested":
+            suggestion = report["suggestion"]
+            lines.append(f"## 🔎 {report['key']}: no DOI given")
+            lines.append(
+                f"**Best match:** {suggestion['title']} ({suggestion['year']}), "
+                f"DOI {suggestion['doi']} (score {suggestion['score']:.2f})"
+            )
+        else:
+            icon = "✅" if status == "match" else "⚠️"
+            lines.append(f"## {icon} {report['key']} ({report['doi']})")
+            lines.extend(format_fields(report["fields"]))
+    return "\n".join(lines)
@@ -0,0 +1,83 @@
+# src/citation_verifier_mcp/breaker.py
+
+"""Circuit breaker for upstream lookups.
+
+When Crossref is down, every lookup would otherwise hold a worker thread
+until it times out. After ``threshold`` consecutive failures the breaker
+opens and lookups fail at once; after ``cooldown`` seconds one probe is let
+through, and its outcome closes the breaker or opens it again. Cache hits
+are served throughout.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from . import metrics
+from .config import env_float, env_int
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+open_gauge = metrics.gauge(
+    "citation_upstream_circuit_open", "1 while upstream lookups are refused after failures"
+)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._state = CLOSED
+        self._changed_at = time.monotonic()
+
+    @classmethod
+    def from_env(cls) -> Optional["CircuitBreaker"]:
+        """Create a breaker from ``CITATION_BREAKER_*`` variables.
+
+        Returns None when ``CITATION_BREAKER_THRESHOLD`` is 0.
+        """
+        threshold = env_int("CITATION_BREAKER_THRESHOLD", 5)
+        if threshold <= 0:
+            return None
+        return cls(threshold=threshold, cooldown=env_float("CITATION_BREAKER_COOLDOWN", 30.0))
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a lookup may go upstream now.
+
+        Once the cooldown has passed, one caller is let through as a probe.
+        If the probe never reports back (it was cancelled), another is let
+        through after a further cooldown.
+        """
+        if self._state == CLOSED:
+            return True
+        if time.monotonic() - self._changed_at < self.cooldown:
+            return False
+        self._set(HALF_OPEN)
+        return True
+
+    def record(self, success: bool) -> None:
+        """Report the outcome of a lookup that :meth:`allow` let through."""
+        if success:
+            self.failures = 0
+            if self._state != CLOSED:
+                self._set(CLOSED)
+            return
+        self.failures += 1
+        if self._state == HALF_OPEN or self.failures >= self.threshold:
+            self._set(OPEN)
+
+    def _set(self, state: str) -> None:
+        self._state = state
+        self._changed_at = time.monotonic()
+        open_gauge.set(1 if state == OPEN else 0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self._state, "failures": self.failures, "threshold": self.threshold}
@@ -0,0 +1,216 @@
+# src/citation_verifier_mcp/cache.py
+
+"""In-process cache for DOI verification results."""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import env_float, env_int
+from .records import Status, VerificationRecord
+
+# URL and scheme prefixes that clients commonly put in front of a DOI
+DOI_PREFIXES = (
+    "https://doi.org/",
+    "http://doi.org/",
+    "https://dx.doi.org/",
+    "http://dx.doi.org/",
+    "doi:",
+)
+
+
+def strip_doi(doi: str) -> str:
+    """Strip whitespace and URL prefixes from a DOI, preserving its case."""
+    doi = doi.strip()
+    lowered = doi.lower()
+    for prefix in DOI_PREFIXES:
+        if lowered.startswith(prefix):
+            return doi[len(prefix) :].strip()
+    return doi
+
+
+def normalize_doi(doi: str) -> str:
+    """Return the canonical cache key for a DOI.
+
+    DOIs are case-insensitive, so the key is the stripped DOI in lower case.
+    """
+    return strip_doi(doi).lower()
+
+
+def is_cacheable(record: VerificationRecord) -> bool:
+    """Return True for definitive results (found, or reported missing)."""
+    return record.status is not Status.ERROR
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """A cached verification result with its bookkeeping.
+
+    ``origin`` says how the entry got here: ``upstream``, ``shared`` (the
+    L2 cache) or ``import``.
+    """
+
+    value: VerificationRecord
+    stored_at: float
+    expires_at: float
+    hits: int = 0
+    origin: str = "upstream"
+
+
+class VerificationCache:
+    """Thread-safe LRU cache of verification results with per-entry TTLs.
+
+    Negative results (DOIs Crossref reports as missing) are kept for a
+    shorter time than verified ones, since a very recent paper may appear
+    in the index later. Each TTL is shortened by a random ``jitter``
+    fraction so entries cached together don't all expire together.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 86400.0,
+        negative_ttl: float = 3600.0,
+        jitter: float = 0.1,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.jitter = jitter
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "VerificationCache":
+        """Create a cache configured from ``CITATION_CACHE_*`` variables."""
+        return cls(
+            max_entries=env_int("CITATION_CACHE_SIZE", 10000),
+            ttl=env_float("CITATION_CACHE_TTL", 86400.0),
+            negative_ttl=env_float("CITATION_CACHE_NEGATIVE_TTL", 3600.0),
+            jitter=env_float("CITATION_CACHE_TTL_JITTER", 0.1),
+        )
+
+    def get(self, doi: str) -> Optional[VerificationRecord]:
+        """Return the cached result for a DOI, or None if missing or expired."""
+        key = normalize_doi(doi)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, doi: str, record: VerificationRecord, origin: str = "upstream") -> None:
+        """Store a result, evicting the least recently used entry when full.
+
+        Hit counts start from zero, so they measure demand during the
+        entry's current lifetime.
+        """
+        key = normalize_doi(doi)
+        ttl = self.ttl if record.verified else self.negative_ttl
+        ttl *= 1.0 - self.jitter * random.random()
+        now = time.time()
+        entry = CacheEntry(value=record, stored_at=now, expires_at=now + ttl, origin=origin)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load(self, entries: Iterable[Tuple[str, CacheEntry]]) -> int:
+        """Store entries as they are, keeping their timestamps; returns how many.
+
+        Used to import a cache in bulk: one lock for the whole batch, and
+        entries that have already expired are skipped.
+        """
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for key, entry in entries:
+                if entry.expires_at <= now:
+                    continue
+                self._entries.pop(key, None)
+                self._entries[key] = entry
+                loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return loaded
+
+    def peek(self, doi: str) -> Optional[CacheEntry]:
+        """Return a DOI's live entry without counting a hit or touching its recency."""
+        with self._lock:
+            entry = self._entries.get(normalize_doi(doi))
+        return entry if entry is not None and entry.expires_at > time.time() else None
+
+    def invalidate(self, doi: str) -> bool:
+        """Drop a DOI's entry; False if there was none."""
+        with self._lock:
+            return self._entries.pop(normalize_doi(doi), None) is not None
+
+    def invalidate_prefix(self, prefix: str) -> List[str]:
+        """Drop every entry whose key starts with ``prefix``, returning their keys."""
+        prefix = normalize_doi(prefix)
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+        return keys
+
+    def items(self) -> List[Tuple[str, CacheEntry]]:
+        """Snapshot of the live entries, least recently used first."""
+        now = time.time()
+        with self._lock:
+            return [(key, entry) for key, entry in self._entries.items() if entry.expires_at > now]
+
+    def expiring(self, within: float, min_hits: int = 1) -> List[Tuple[str, CacheEntry]]:
+        """Return live entries expiring in the next ``within`` seconds, busiest first.
+
+        Only entries read at least ``min_hits`` times since they were stored
+        are returned; entries nobody asks for are left to expire.
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if now < entry.expires_at <= now + within and entry.hits >= min_hits
+            ]
+        candidates.sort(key=lambda item: item[1].hits, reverse=True)
+        return candidates
+
+    def __contains__(self, doi: object) -> bool:
+        """Check for a live entry without counting a hit."""
+        if not isinstance(doi, str):
+            return False
+        with self._lock:
+            entry = self._entries.get(normalize_doi(doi))
+            return entry is not None and entry.expires_at > time.time()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count and hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,121 @@
+# src/citation_verifier_mcp/cache_cli.py
+
+"""Command line client for the remote server's cache admin endpoints.
+
+Usage::
+
+    citation-verifier-cache show 10.1038/nature12373
+    citation-verifier-cache invalidate 10.1038/nature12373
+    citation-verifier-cache invalidate --prefix 10.1234/
+    citation-verifier-cache export cache.jsonl.zst
+    citation-verifier-cache import cache.jsonl.zst
+
+The server is ``--url`` (default ``CITATION_SERVER_URL`` or
+``http://localhost:8000``) and the token ``--token`` (default
+``CITATION_ADMIN_TOKEN``). Exports and imports are streamed, so large
+caches never have to fit in memory on either side.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+from .cache_transfer import EXTENSIONS
+from .config import env_str
+
+CHUNK_SIZE = 1 << 16
+
+
+def _compression_for(path: str) -> Optional[str]:
+    """Guess an export's compression from its file name."""
+    for compression, extension in EXTENSIONS.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def _read_chunks(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one command against the server and return its JSON result."""
+    url = f"{args.url.rstrip('/')}/admin/cache"
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    response: requests.Response
+
+    if args.command == "show":
+        response = requests.get(url, params={"doi": args.doi}, headers=headers, timeout=30)
+    elif args.command == "stats":
+        response = requests.get(url, headers=headers, timeout=30)
+    elif args.command == "invalidate":
+        params = {"prefix": args.prefix} if args.prefix else {"doi": args.doi}
+        response = requests.delete(url, params=params, headers=headers, timeout=30)
+    elif args.command == "export":
+        params = {"compression": args.compression or _compression_for(args.path)}
+        with requests.get(
+            f"{url}/export", params=params, headers=headers, stream=True, timeout=30
+        ) as response:
+            response.raise_for_status()
+            written = 0
+            with open(args.path, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    written += f.write(chunk)
+        return {"path": args.path, "bytes": written}
+    else:
+        response = requests.post(
+            f"{url}/import", data=_read_chunks(args.path), headers=headers, timeout=None
+        )
+    response.raise_for_status()
+    result: Dict[str, Any] = response.json()
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="citation-verifier-cache", description="Inspect and move a server's DOI cache."
+    )
+    parser.add_argument(
+        "--url", default=env_str("CITATION_SERVER_URL", "http://localhost:8000"), help="Server URL"
+    )
+    parser.add_argument("--token", default=env_str("CITATION_ADMIN_TOKEN"), help="Admin token")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="Show cache statistics")
+    show = commands.add_parser("show", help="Show a DOI's cache entry")
+    show.add_argument("doi")
+
+    invalidate = commands.add_parser("invalidate", help="Drop a DOI or every DOI under a prefix")
+    target = invalidate.add_mutually_exclusive_group(required=True)
+    target.add_argument("doi", nargs="?")
+    target.add_argument("--prefix")
+
+    export = commands.add_parser("export", help="Download the cache to a file")
+    export.add_argument("path")
+    export.add_argument("--compression", choices=list(EXTENSIONS))
+
+    load = commands.add_parser("import", help="Upload an exported cache")
+    load.add_argument("path")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for ``citation-verifier-cache``."""
+    args = build_parser().parse_args(argv)
+    try:
+        result = run(args)
+    except requests.HTTPError as e:
+        detail = e.response.text if e.response is not None else str(e)
+        sys.exit(f"Error: {detail}")
+    except (requests.RequestException, OSError) as e:
+        sys.exit(f"Error: {e}")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# src/citation_verifier_mcp/cache_transfer.py
+
+"""Export and import of the verification cache as compressed JSON lines.
+
+An export is a header line followed by one ``[key, stored_at, expires_at,
+row]`` array per entry, where ``row`` is :meth:`VerificationRecord.to_row`.
+It is compressed with zstd when the ``zstandard`` package is installed and
+gzip otherwise. Exports are produced and consumed chunk by chunk, so a warm
+cache can be moved to a new instance without holding the whole file and
+without repeating hours of upstream lookups. Imported entries keep their
+original timestamps, so they expire when they would have on the old
+instance.
+"""
+
+import json
+import zlib
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from .cache import CacheEntry, VerificationCache
+from .records import VerificationRecord
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install "citation-verifier-mcp[zstd]"
+    zstandard = None
+
+FORMAT = "citation-verifier-cache"
+VERSION = 1
+
+COMPRESSIONS = ("zstd", "gzip", "none")
+
+# Content types and file extensions for each compression
+MEDIA_TYPES = {
+    "zstd": "application/zstd",
+    "gzip": "application/gzip",
+    "none": "application/x-ndjson",
+}
+EXTENSIONS = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz", "none": ".jsonl"}
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def default_compression() -> str:
+    """zstd when available, else gzip."""
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _compressor(compression: str) -> Any:
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    if compression == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "none":
+        return None
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def export_cache(
+    cache: VerificationCache, compression: Optional[str] = None, batch: int = 1000
+) -> Iterator[bytes]:
+    """Yield the cache's live entries as compressed chunks.
+
+    The entries are snapshotted up front (references only); encoding and
+    compression happen ``batch`` entries at a time as the output is read.
+    """
+    compressor = _compressor(compression or default_compression())
+    entries = cache.items()
+
+    def encode(lines: List[Any]) -> bytes:
+        data = b"".join(json.dumps(line, separators=(",", ":")).encode() + b"\n" for line in lines)
+        return compressor.compress(data) if compressor is not None else data
+
+    yield encode([{"format": FORMAT, "version": VERSION, "entries": len(entries)}])
+    for start in range(0, len(entries), batch):
+        chunk = encode(
+            [
+                [key, entry.stored_at, entry.expires_at, entry.value.to_row()]
+                for key, entry in entries[start : start + batch]
+            ]
+        )
+        if chunk:
+            yield chunk
+    if compressor is not None:
+        yield compressor.flush()
+
+
+class CacheImporter:
+    """Load an export into a cache as its chunks arrive.
+
+    The compression is detected from the first bytes. Entries are stored
+    with :meth:`VerificationCache.load`, one batch per chunk, with
+    ``origin="import"``; entries that expired in transit are skipped.
+    Raises ValueError for anything that isn't a cache export.
+    """
+
+    def __init__(self, cache: VerificationCache) -> None:
+        self.cache = cache
+        self.loaded = 0
+        self.skipped = 0
+        self._decompressor: Any = None
+        self._started = False
+        self._header = False
+        self._head = b""
+        self._buffer = b""
+
+    def feed(self, chunk: bytes) -> None:
+        """Decompress ``chunk`` and load the complete lines it finishes."""
+        if not self._started:
+            # Wait for enough bytes to recognise the compression
+            self._head += chunk
+            if len(self._head) < len(_ZSTD_MAGIC):
+                return
+            chunk, self._head = self._head, b""
+            self._started = True
+            if chunk.startswith(_ZSTD_MAGIC):
+                if zstandard is None:
+                    raise ValueError("zstd input needs the zstandard package")
+                self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+            elif chunk.startswith(_GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(47)
+        if self._decompressor is not None:
+            try:
+                chunk = self._decompressor.decompress(chunk)
+            except Exception as e:
+                raise ValueError(f"Corrupt cache export: {e}") from e
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        self._load(lines)
+
+    def close(self) -> None:
+        """Load the last line; raises ValueError if no header was seen.
+
+        A compressed export that stops before its end marker (a cut-off
+        upload or copy) also raises, rather than passing as a smaller cache.
+        """
+        if self._head:
+            self._started = True
+            self._buffer, self._head = self._head, b""
+        if self._decompressor is not None:
+            try:
+                self._buffer += self._decompressor.flush()
+            except Exception as e:
+                raise ValueError(f"Corrupt cache export: {e}") from e
+            if not self._decompressor.eof:
+                raise ValueError("Truncated cache export")
+        if self._buffer.strip():
+            self._load([self._buffer])
+        self._buffer = b""
+        if not self._header:
+            raise ValueError("Not a cache export")
+
+    def _load(self, lines: Iterable[bytes]) -> None:
+        entries: List[Tuple[str, CacheEntry]] = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                if not self._header:
+                    self._check_header(item)
+                    continue
+                key, stored_at, expires_at, row = item
+                record = VerificationRecord.from_row(row)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid cache export line: {e}") from e
+            entries.append((key, CacheEntry(record, stored_at, expires_at, origin="import")))
+        if entries:
+            loaded = self.cache.load(entries)
+            self.loaded += loaded
+            self.skipped += len(entries) - loaded
+
+    def _check_header(self, item: Any) -> None:
+        if not isinstance(item, dict) or item.get("format") != FORMAT:
+            raise ValueError("Not a cache export")
+        if item.get("version") != VERSION:
+            raise ValueError(f"Unsupported cache export version: {item.get('version')}")
+        self._header = True
+
+
+def import_cache(cache: VerificationCache, chunks: Iterable[bytes]) -> CacheImporter:
+    """Load an export given as an iterable of byte chunks."""
+    importer = CacheImporter(cache)
+    for chunk in chunks:
+        importer.feed(chunk)
+    importer.close()
+    return importer
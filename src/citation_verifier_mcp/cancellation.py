@@ -0,0 +1,146 @@
+# src/citation_verifier_mcp/cancellation.py
+
+"""Cancellation and deadlines for tool calls on the remote transports.
+
+Each WebSocket connection and Streamable HTTP session keeps a
+:class:`CallRegistry` of its running tool calls by JSON-RPC request id, so
+an MCP ``notifications/cancelled`` message or the client going away can
+cancel them. A client may also bound a call with ``_meta.timeoutMs``;
+``CITATION_REQUEST_TIMEOUT`` caps it on the server side. The deadline is
+visible to code inside the call through :func:`time_left`.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Set, TypeVar
+
+from .config import env_float
+
+T = TypeVar("T")
+
+# JSON-RPC error codes for calls that didn't run to completion
+REQUEST_CANCELLED = -32800
+DEADLINE_EXCEEDED = -32008
+
+_deadline: ContextVar[Optional[float]] = ContextVar("citation_deadline", default=None)
+
+
+class RequestCancelledError(Exception):
+    """Raised when a call was cancelled by the client."""
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a call ran past its deadline."""
+
+
+def request_timeout(message: Dict[str, Any]) -> Optional[float]:
+    """Seconds a request may run: the client's ``_meta.timeoutMs``, capped by the server."""
+    limit = env_float("CITATION_REQUEST_TIMEOUT", 0.0) or None
+    meta = (message.get("params") or {}).get("_meta") or {}
+    try:
+        requested = float(meta["timeoutMs"]) / 1000 if "timeoutMs" in meta else None
+    except (TypeError, ValueError):
+        requested = None
+    if requested is not None and requested > 0:
+        return min(requested, limit) if limit else requested
+    return limit
+
+
+def cancelled_request(message: Dict[str, Any]) -> Optional[Any]:
+    """The request id named by a ``notifications/cancelled`` message, else None."""
+    if message.get("method") != "notifications/cancelled":
+        return None
+    return (message.get("params") or {}).get("requestId")
+
+
+def time_left(default: float) -> float:
+    """``default``, shortened to the time left before the current call's deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return max(0.0, min(default, deadline - time.monotonic()))
+
+
+class CallRegistry:
+    """Running tool calls of one connection or session, by request id."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Any, "asyncio.Future[Any]"] = {}
+        self._cancelled: Set["asyncio.Future[Any]"] = set()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(
+        self, request_id: Any, awaitable: Awaitable[T], timeout: Optional[float] = None
+    ) -> T:
+        """Run a call that can be cancelled by id and is bounded by ``timeout`` seconds.
+
+        Raises :class:`RequestCancelledError` if :meth:`cancel` stopped it and
+        :class:`DeadlineExceededError` if it timed out. If the caller itself
+        is cancelled (the client went away), the call is cancelled with it.
+        """
+        token = _deadline.set(time.monotonic() + timeout if timeout else None)
+        try:
+            call = asyncio.ensure_future(awaitable)
+        finally:
+            _deadline.reset(token)
+        if request_id is not None:
+            self._calls[request_id] = call
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.CancelledError:
+            if call in self._cancelled:
+                raise RequestCancelledError(f"Request {request_id} was cancelled") from None
+            raise
+        except asyncio.TimeoutError:
+            if not call.cancelled():
+                raise
+            raise DeadlineExceededError(f"Request exceeded its {timeout:g}s deadline") from None
+        finally:
+            self._cancelled.discard(call)
+            if request_id is not None and self._calls.get(request_id) is call:
+                del self._calls[request_id]
+
+    def cancel(self, request_id: Any) -> bool:
+        """Cancel a running call; False if there is none with that id."""
+        call = self._calls.get(request_id)
+        if call is None or call.done():
+            return False
+        self._cancelled.add(call)
+        call.cancel()
+        return True
+
+    def cancel_all(self) -> int:
+        """Cancel every running call, returning how many there were."""
+        return sum(self.cancel(request_id) for request_id in list(self._calls))
+
+
+async def cancel_on_disconnect(
+    receive: Callable[[], Awaitable[Mapping[str, Any]]], awaitable: Awaitable[T]
+) -> Optional[T]:
+    """Await ``awaitable``, cancelling it if the HTTP client disconnects first.
+
+    ``receive`` is the request's ASGI receive channel, whose body has already
+    been read. Returns None if the client went away.
+    """
+    work = asyncio.ensure_future(awaitable)
+    disconnected = False
+
+    async def watch() -> None:
+        nonlocal disconnected
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected = True
+        work.cancel()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        return await work
+    except asyncio.CancelledError:
+        if disconnected:
+            return None
+        raise
+    finally:
+        watcher.cancel()
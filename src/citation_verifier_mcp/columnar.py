@@ -0,0 +1,246 @@
+# src/citation_verifier_mcp/columnar.py
+
+"""Bulk verification with results written as Parquet or Arrow.
+
+Usage::
+
+    citation-verifier-bulk dois.txt -o results.parquet
+    citation-verifier-bulk dois.txt -o results.arrow --concurrency 16
+
+DOIs are read one per line (``-`` for stdin) and verified in chunks of
+``--row-group-size`` through a local :class:`~.verification.VerificationService`,
+so memory stays constant however long the input is. Each chunk becomes
+one Parquet row group or Arrow IPC record batch with one row per input DOI,
+in input order. ``latency_ms`` is the Crossref round trip for DOIs looked up
+in this run and null for DOIs answered from a cache. Needs the ``arrow``
+extra (``pyarrow``).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .breaker import CircuitBreaker
+from .cache import normalize_doi
+from .records import VerificationRecord
+from .registries import RegistryResolver
+from .shared_cache import SharedCache
+from .verification import VerificationService
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: pip install "citation-verifier-mcp[arrow]"
+    pa = None
+    pq = None
+
+FORMATS = ("parquet", "arrow")
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Column names and types, in file order
+COLUMNS = [
+    ("doi", "string"),
+    ("verified", "bool"),
+    ("title", "string"),
+    ("authors", "string"),
+    ("journal", "string"),
+    ("publisher", "string"),
+    ("year", "string"),
+    ("url", "string"),
+    ("error", "string"),
+    ("source", "string"),
+    ("latency_ms", "float64"),
+]
+
+
+def result_schema() -> Any:
+    """The Arrow schema of a results file."""
+    if pa is None:
+        raise ValueError("Parquet and Arrow output need the pyarrow package")
+    return pa.schema([(name, pa.type_for_alias(kind)) for name, kind in COLUMNS])
+
+
+def format_for(path: str) -> str:
+    """Guess the output format from a file name, defaulting to Parquet."""
+    for format, extension in EXTENSIONS.items():
+        if path.endswith(extension):
+            return format
+    return "parquet"
+
+
+class ResultWriter:
+    """Writes verification records to a Parquet or Arrow IPC stream in row groups.
+
+    Rows are buffered column by column and written out every
+    ``row_group_size`` rows, and on :meth:`close`.
+    """
+
+    def __init__(
+        self, sink: Union[str, IO[bytes]], format: str = "parquet", row_group_size: int = 10000
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format: {format}")
+        self.schema = result_schema()
+        self.format = format
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self.row_groups = 0
+        self._columns: Dict[str, List[Any]] = {name: [] for name, _ in COLUMNS}
+        if format == "parquet":
+            self._writer = pq.ParquetWriter(sink, self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_stream(sink, self.schema)
+
+    def write(self, record: VerificationRecord, latency: Optional[float] = None) -> None:
+        """Add a row; ``latency`` is in seconds, or None for a cache hit."""
+        # Fields a result doesn't have (title of a missing DOI, error of a found one) are blank
+        row = record.to_dict()
+        columns = self._columns
+        for name, _ in COLUMNS[:-1]:
+            columns[name].append(row.get(name, ""))
+        columns["latency_ms"].append(None if latency is None else round(latency * 1000, 3))
+        if len(columns["doi"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows as one row group."""
+        count = len(self._columns["doi"])
+        if not count:
+            return
+        batch = pa.record_batch(list(self._columns.values()), schema=self.schema)
+        if self.format == "parquet":
+            self._writer.write_batch(batch, row_group_size=count)
+        else:
+            self._writer.write_batch(batch)
+        self.rows += count
+        self.row_groups += 1
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class TimedVerifier:
+    """Wraps a verifier to remember how long each upstream lookup took."""
+
+    def __init__(self, verifier: Any) -> None:
+        self.verifier = verifier
+        self.latencies: Dict[str, float] = {}
+
+    def verify_doi(self, doi: str) -> Dict[str, Any]:
+        started = time.monotonic()
+        try:
+            result: Dict[str, Any] = self.verifier.verify_doi(doi)
+            return result
+        finally:
+            self.latencies[normalize_doi(doi)] = time.monotonic() - started
+
+
+def _chunks(dois: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for doi in dois:
+        chunk.append(doi)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def verify_to_file(
+    service: VerificationService,
+    verifier: Any,
+    dois: Iterable[str],
+    sink: Union[str, IO[bytes]],
+    format: str = "parquet",
+    row_group_size: int = 10000,
+    concurrency: int = 8,
+) -> Dict[str, Any]:
+    """Verify DOIs chunk by chunk, writing one row group per chunk.
+
+    Returns a summary with the row, row group and verified counts.
+    """
+    timed = TimedVerifier(verifier)
+    verified = 0
+    with ResultWriter(sink, format, row_group_size) as writer:
+        for chunk in _chunks(dois, row_group_size):
+            async for index, record in service.verify_stream(timed, chunk, concurrency):
+                latency = timed.latencies.get(normalize_doi(chunk[index]))
+                writer.write(record, latency)
+                verified += record.verified
+            # Latencies are only needed until their chunk is written
+            timed.latencies.clear()
+    return {
+        "rows": writer.rows,
+        "row_groups": writer.row_groups,
+        "verified": verified,
+        "format": format,
+    }
+
+
+def _read_dois(stream: IO[str]) -> Iterator[str]:
+    for line in stream:
+        if line.strip():
+            yield line.strip()
+
+
+def _create_citation_verifier() -> Any:
+    from llm_citation_verifier import CitationVerifier
+
+    return CitationVerifier()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="citation-verifier-bulk",
+        description="Verify a list of DOIs and write the results as Parquet or Arrow.",
+    )
+    parser.add_argument("input", help="File with one DOI per line, or - for stdin")
+    parser.add_argument("-o", "--output", required=True, help="Output .parquet or .arrow file")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from name)")
+    parser.add_argument("--row-group-size", type=int, default=10000, help="Rows per row group")
+    parser.add_argument("--concurrency", type=int, default=8, help="Upstream lookups at once")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for ``citation-verifier-bulk``."""
+    args = build_parser().parse_args(argv)
+    service = VerificationService(
+        resolver=RegistryResolver.from_env(),
+        shared=SharedCache.from_env(),
+        breaker=CircuitBreaker.from_env(),
+    )
+    verifier = _create_citation_verifier()
+    format = args.format or format_for(args.output)
+    try:
+        with sys.stdin if args.input == "-" else open(args.input, encoding="utf-8") as stream:
+            summary = asyncio.run(
+                verify_to_file(
+                    service,
+                    verifier,
+                    _read_dois(stream),
+                    args.output,
+                    format,
+                    args.row_group_size,
+                    args.concurrency,
+                )
+            )
+    except (ValueError, OSError) as e:
+        sys.exit(f"Error: {e}")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# src/citation_verifier_mcp/config.py
+
+"""Helpers for reading server configuration from environment variables."""
+
+import os
+from typing import Optional
+
+
+def env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Return a string setting, treating empty values as unset."""
+    value = os.getenv(name)
+    return value if value else default
+
+
+def env_int(name: str, default: int) -> int:
+    """Return an integer setting."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Return a float setting."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """Return a boolean setting ("1", "true", "yes" and "on" are truthy)."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,132 @@
+# src/citation_verifier_mcp/consistency.py
+
+"""Check claimed citation metadata against the DOI's Crossref record."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from .config import env_int
+from .similarity import author_overlap, similarity_pairs
+from .verification import VerificationService
+
+# Minimum score for each field to count as a match
+FIELD_THRESHOLDS = {"title": 0.85, "authors": 0.5, "journal": 0.8, "year": 1.0}
+
+
+def _year_score(claimed: str, actual: str) -> float:
+    """1.0 for the same year, 0.0 otherwise."""
+    return 1.0 if claimed.strip() == actual.strip() else 0.0
+
+
+async def check_citations(
+    service: VerificationService,
+    verifier: Any,
+    citations: List[Dict[str, Any]],
+    max_batch: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Compare each citation's claimed fields with its Crossref record.
+
+    Records are fetched through the verification cache in one concurrent
+    batch, with each distinct DOI looked up once. Title and journal scores
+    are then computed column-wise, so a whole reference list is scored in
+    one pass.
+    """
+    max_batch = max_batch or env_int("CITATION_MAX_BATCH", 500)
+    if len(citations) > max_batch:
+        raise ValueError(f"Too many citations in one call: {len(citations)} > {max_batch}")
+
+    results = await service.verify_many(verifier, [str(c["doi"]) for c in citations])
+
+    # Collect (report index, claimed, actual) per text field for the column-wise scoring
+    columns: Dict[str, List[Any]] = {"title": [], "journal": []}
+    reports: List[Dict[str, Any]] = []
+    for index, (citation, result) in enumerate(zip(citations, results)):
+        report: Dict[str, Any] = {"doi": result.doi, "verified": result.verified, "fields": {}}
+        reports.append(report)
+        if not result.verified:
+            report["status"] = "not_found"
+            report["error"] = result.error
+            continue
+
+        for field in ("title", "journal"):
+            if citation.get(field):
+                columns[field].append((index, str(citation[field]), getattr(result, field)))
+        if citation.get("authors"):
+            claimed = citation["authors"]
+            if isinstance(claimed, list):
+                claimed = ", ".join(claimed)
+            report["fields"]["authors"] = _field(
+                "authors", claimed, result.authors, author_overlap(claimed, result.authors)
+            )
+        if citation.get("year"):
+            claimed_year = str(citation["year"])
+            report["fields"]["year"] = _field(
+                "year", claimed_year, result.year, _year_score(claimed_year, result.year)
+            )
+
+    for field, rows in columns.items():
+        if not rows:
+            continue
+        # Thousands of pairs take seconds without rapidfuzz; keep them off the event loop
+        scores = await asyncio.to_thread(
+            similarity_pairs, [row[1] for row in rows], [row[2] for row in rows]
+        )
+        for (index, claimed, actual), score in zip(rows, scores):
+            reports[index]["fields"][field] = _field(field, claimed, actual, score)
+
+    for report in reports:
+        if "status" not in report:
+            matched = all(field["match"] for field in report["fields"].values())
+            report["status"] = "match" if matched else "mismatch"
+    return reports
+
+
+def _field(name: str, claimed: str, actual: str, score: float) -> Dict[str, Any]:
+    """Build the per-field entry of a consistency report."""
+    return {
+        "claimed": claimed,
+        "actual": actual,
+        "score": round(score, 3),
+        "match": score >= FIELD_THRESHOLDS[name],
+    }
+
+
+def format_consistency_report(reports: List[Dict[str, Any]]) -> str:
+    """Format consistency reports for display, mismatches first."""
+    counts = {status: 0 for status in ("match", "mismatch", "not_found")}
+    for report in reports:
+        counts[report["status"]] += 1
+
+    lines = [
+        "# 📋 Citation Consistency Report",
+        "",
+        f"**Checked:** {len(reports)} | **Consistent:** {counts['match']} | "
+        f"**Mismatched:** {counts['mismatch']} | **Not found:** {counts['not_found']}",
+    ]
+
+    order = {"mismatch": 0, "not_found": 1, "match": 2}
+    for report in sorted(reports, key=lambda r: order[r["status"]]):
+        lines.append("")
+        if report["status"] == "not_found":
+            lines.append(f"## ❌ {report['doi']}")
+            lines.append(f"**Error:** {report['error']}")
+            continue
+
+        icon = "✅" if report["status"] == "match" else "⚠️"
+        lines.append(f"## {icon} {report['doi']}")
+        lines.extend(format_fields(report["fields"]))
+    return "\n".join(lines)
+
+
+def format_fields(fields: Dict[str, Dict[str, Any]]) -> List[str]:
+    """One Markdown bullet per compared field of a consistency report."""
+    lines = []
+    for name, field in fields.items():
+        if field["match"]:
+            lines.append(f"- **{name.title()}:** matches ({field['score']:.2f})")
+        else:
+            lines.append(
+                f'- **{name.title()}:** claimed "{field["claimed"]}", '
+                f'record says "{field["actual"]}" ({field["score"]:.2f})'
+            )
+    return lines
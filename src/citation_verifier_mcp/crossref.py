@@ -0,0 +1,100 @@
+# src/citation_verifier_mcp/crossref.py
+
+"""Minimal Crossref REST client for queries the verifier library doesn't cover."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from .config import env_float, env_int, env_str
+from .tracing import span
+
+CROSSREF_API = "https://api.crossref.org"
+
+# Fields needed to describe a search candidate; keeps responses small
+SEARCH_FIELDS = "DOI,title,author,container-title,publisher,issued,published-print,published-online"
+
+
+def format_authors(authors: List[Dict[str, Any]]) -> str:
+    """Format Crossref author records the same way the verifier does."""
+    names = []
+    for author in authors[:3]:
+        family = author.get("family", "")
+        if family:
+            names.append(f"{author.get('given', '')} {family}".strip())
+    if len(authors) > 3:
+        names.append("et al.")
+    return ", ".join(names) if names else "Unknown"
+
+
+def extract_year(work: Dict[str, Any]) -> str:
+    """Return the publication year of a Crossref work, or "Unknown"."""
+    for field in ("published-print", "published-online", "issued"):
+        parts = (work.get(field) or {}).get("date-parts") or [[]]
+        if parts[0] and parts[0][0]:
+            return str(parts[0][0])
+    return "Unknown"
+
+
+def summarize_work(work: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a Crossref work to the fields used in verification results."""
+    doi = work.get("DOI", "")
+    return {
+        "doi": doi,
+        "title": (work.get("title") or ["Unknown"])[0],
+        "authors": format_authors(work.get("author", [])),
+        "journal": (work.get("container-title") or ["Unknown"])[0],
+        "publisher": work.get("publisher", "Unknown"),
+        "year": extract_year(work),
+        "url": f"https://doi.org/{doi}",
+    }
+
+
+class CrossrefClient:
+    """Blocking Crossref client with a pooled session and bounded concurrency.
+
+    Calls are meant to run in worker threads; at most ``max_concurrency``
+    requests are sent at once across all threads.
+    """
+
+    def __init__(
+        self,
+        base_url: str = CROSSREF_API,
+        timeout: float = 10.0,
+        max_concurrency: int = 4,
+        mailto: Optional[str] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "citation-verifier-mcp" + (
+            f" (mailto:{mailto})" if mailto else ""
+        )
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    @classmethod
+    def from_env(cls) -> "CrossrefClient":
+        """Create a client configured from ``CROSSREF_*`` variables."""
+        return cls(
+            base_url=env_str("CROSSREF_API_URL", CROSSREF_API) or CROSSREF_API,
+            timeout=env_float("CROSSREF_TIMEOUT", 10.0),
+            max_concurrency=env_int("CROSSREF_MAX_CONCURRENCY", 4),
+            mailto=env_str("CROSSREF_MAILTO"),
+        )
+
+    def search_works(self, params: Dict[str, Any], rows: int = 5) -> List[Dict[str, Any]]:
+        """Run a ``/works`` query and return the matching items."""
+        query = {**params, "rows": rows, "select": SEARCH_FIELDS}
+        with span("upstream.crossref.search") as search:
+            waited = time.monotonic()
+            with self._slots:
+                search.set_attribute("slot_wait_ms", round((time.monotonic() - waited) * 1000, 3))
+                response = self.session.get(
+                    f"{self.base_url}/works", params=query, timeout=self.timeout
+                )
+            search.set_attribute("http.status_code", response.status_code)
+        response.raise_for_status()
+        items: List[Dict[str, Any]] = response.json()["message"]["items"]
+        return items
@@ -0,0 +1,123 @@
+# src/citation_verifier_mcp/health.py
+
+"""Signals behind the liveness and readiness endpoints.
+
+Liveness only says the process is up and answering; restarting it won't
+fix a slow Crossref. Readiness says whether this instance should be sent
+more work, so a load balancer can shed load before latency explodes. It
+fails while the verifier is starting or the cache is warming, when work
+is queueing for worker threads, when the upstream circuit breaker is open,
+and when the event loop is running late.
+"""
+
+import asyncio
+import collections
+import time
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from . import metrics
+from .breaker import OPEN, CircuitBreaker
+from .config import env_float, env_int
+
+lag_gauge = metrics.gauge(
+    "citation_event_loop_lag_seconds", "Recent worst delay in waking the event loop"
+)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a short sleep.
+
+    A sleep of ``interval`` that returns noticeably later means callbacks
+    are waiting behind something: CPU-bound work or a blocking call on the
+    loop. :attr:`lag` is the worst of the last ``window`` samples.
+    """
+
+    def __init__(self, interval: float = 0.25, window: int = 20) -> None:
+        self.interval = interval
+        self._samples: Deque[float] = collections.deque(maxlen=window)
+
+    @property
+    def lag(self) -> float:
+        """Worst recent lag in seconds."""
+        return max(self._samples, default=0.0)
+
+    def sample(self, lag: float) -> None:
+        self._samples.append(max(0.0, lag))
+        lag_gauge.set(self.lag)
+
+    async def run(self) -> None:
+        """Sample until cancelled."""
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.sample(time.monotonic() - started - self.interval)
+
+
+def executor_backlog() -> int:
+    """Jobs waiting for a thread in the running loop's default executor."""
+    # asyncio.to_thread uses the loop's default ThreadPoolExecutor, which
+    # doesn't expose its queue publicly
+    executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    queue = getattr(executor, "_work_queue", None)
+    return queue.qsize() if queue is not None else 0
+
+
+class ReadinessProbe:
+    """Compares the instance's load with configurable thresholds."""
+
+    def __init__(
+        self,
+        max_queue: int = 100,
+        max_lag: float = 0.5,
+        lag_monitor: Optional[LoopLagMonitor] = None,
+    ) -> None:
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.lag_monitor = lag_monitor or LoopLagMonitor()
+
+    @classmethod
+    def from_env(cls) -> "ReadinessProbe":
+        """Create a probe from ``CITATION_READY_*`` variables."""
+        return cls(
+            max_queue=env_int("CITATION_READY_MAX_QUEUE", 100),
+            max_lag=env_float("CITATION_READY_MAX_LAG_MS", 500.0) / 1000,
+        )
+
+    def check(
+        self,
+        initialized: bool,
+        warm: bool,
+        queued: int,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        """Return the readiness status and the individual checks.
+
+        ``queued`` counts lookups waiting for a worker thread or an upstream
+        slot. The status is ``ready`` when every check passes; otherwise it
+        names the first failure: ``warming``, ``overloaded`` or
+        ``upstream_unavailable``.
+        """
+        lag = self.lag_monitor.lag
+        checks: Dict[str, Dict[str, Any]] = {
+            "verifier": {"ok": initialized},
+            "warmup": {"ok": warm},
+            "queue": {"ok": queued <= self.max_queue, "depth": queued, "limit": self.max_queue},
+            "event_loop": {
+                "ok": lag <= self.max_lag,
+                "lag_ms": round(lag * 1000, 1),
+                "limit_ms": self.max_lag * 1000,
+            },
+            "upstream": {"ok": breaker is None or breaker.state != OPEN},
+        }
+        if breaker is not None:
+            checks["upstream"].update(breaker.stats())
+
+        if not (initialized and warm):
+            status = "warming"
+        elif not (checks["queue"]["ok"] and checks["event_loop"]["ok"]):
+            status = "overloaded"
+        elif not checks["upstream"]["ok"]:
+            status = "upstream_unavailable"
+        else:
+            status = "ready"
+        return status, checks
@@ -0,0 +1,53 @@
+# src/citation_verifier_mcp/jsonrpc.py
+
+"""JSON-RPC 2.0 batch handling shared by the remote transports."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from .config import env_int
+
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def error_response(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    """A JSON-RPC error response."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def is_notification(message: Dict[str, Any]) -> bool:
+    """Return True for messages that expect no response."""
+    return "id" not in message
+
+
+async def handle_batch(
+    messages: List[Any],
+    handle: MessageHandler,
+    concurrency: Optional[int] = None,
+    max_size: Optional[int] = None,
+) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+    """Process a JSON-RPC batch, at most ``concurrency`` messages at a time.
+
+    Responses come back in request order with notifications left out. Returns
+    None when the batch held only notifications (nothing should be sent), and
+    a single error for an empty or oversized batch, as JSON-RPC specifies.
+    """
+    concurrency = concurrency or env_int("CITATION_BATCH_CONCURRENCY", 8)
+    max_size = max_size or env_int("CITATION_MAX_RPC_BATCH", 100)
+    if not messages:
+        return error_response(None, -32600, "Invalid Request: empty batch")
+    if len(messages) > max_size:
+        return error_response(None, -32600, f"Invalid Request: batch exceeds {max_size} messages")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def handle_one(message: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(message, dict):
+            return error_response(None, -32600, "Invalid Request")
+        async with semaphore:
+            response = await handle(message)
+        return None if is_notification(message) else response
+
+    responses = await asyncio.gather(*(handle_one(message) for message in messages))
+    answered = [response for response in responses if response is not None]
+    return answered or None
@@ -0,0 +1,127 @@
+# src/citation_verifier_mcp/limits.py
+
+"""Adaptive limit on the number of upstream lookups in flight.
+
+A fixed concurrency is either too low for a fast Crossref or high enough to
+pile up latency and 429s when it slows down. :class:`AdaptiveLimit` moves
+the limit with what it observes, in the style of TCP congestion control:
+it grows by one per limit's worth of fast, successful lookups and shrinks
+by a factor when lookups fail or take much longer than the recent baseline.
+The current limit is exported as a gauge and read by
+:class:`~.scheduling.FairScheduler` as its capacity.
+"""
+
+import time
+from typing import Optional
+
+from . import metrics
+from .config import env_bool, env_float, env_int
+
+limit_gauge = metrics.gauge(
+    "citation_upstream_concurrency_limit", "Upstream lookups currently allowed in flight"
+)
+baseline_gauge = metrics.gauge(
+    "citation_upstream_baseline_rtt_seconds", "Fastest recent upstream lookup time"
+)
+decreases = metrics.counter(
+    "citation_upstream_limit_decreases_total", "Times the upstream limit was lowered", ("reason",)
+)
+
+
+class AdaptiveLimit:
+    """Additive-increase, multiplicative-decrease concurrency limit.
+
+    Each finished lookup is reported with :meth:`observe`. A lookup slower
+    than ``tolerance`` times the baseline, or one that failed, multiplies
+    the limit by ``backoff``; at most once per round trip, so a burst of
+    failures from the same moment counts once. Otherwise, while the limit
+    is actually being used, each success adds ``1 / limit``, about one per
+    round of lookups. The baseline is the fastest lookup in the current
+    and previous ``window`` samples, so it follows Crossref as it speeds up
+    or slows down during the day.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        window: int = 100,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.window = window
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._baseline: Optional[float] = None
+        self._window_min: Optional[float] = None
+        self._previous_min: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = 0.0
+        limit_gauge.set(self.limit)
+
+    @classmethod
+    def from_env(cls) -> Optional["AdaptiveLimit"]:
+        """Create a limit from ``CITATION_UPSTREAM_*`` variables.
+
+        Returns None unless ``CITATION_ADAPTIVE_CONCURRENCY`` is set. The
+        starting limit is ``CITATION_UPSTREAM_CONCURRENCY``.
+        """
+        if not env_bool("CITATION_ADAPTIVE_CONCURRENCY"):
+            return None
+        return cls(
+            initial=env_int("CITATION_UPSTREAM_CONCURRENCY", 8),
+            min_limit=env_int("CITATION_UPSTREAM_MIN_CONCURRENCY", 1),
+            max_limit=env_int("CITATION_UPSTREAM_MAX_CONCURRENCY", 64),
+            tolerance=env_float("CITATION_UPSTREAM_LATENCY_TOLERANCE", 2.0),
+        )
+
+    @property
+    def limit(self) -> int:
+        """Upstream lookups allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def baseline(self) -> Optional[float]:
+        """Round-trip time the limit considers normal, once there are samples."""
+        return self._baseline
+
+    def observe(self, rtt: float, inflight: int, dropped: bool = False) -> None:
+        """Adjust the limit after a lookup that took ``rtt`` seconds.
+
+        ``inflight`` is the number of lookups running when it finished,
+        including itself; ``dropped`` marks a failed lookup (an error or a
+        rate-limit response rather than an answer).
+        """
+        if not dropped:
+            self._sample(rtt)
+
+        reason = None
+        if dropped:
+            reason = "error"
+        elif self._baseline is not None and rtt > self.tolerance * self._baseline:
+            reason = "latency"
+
+        now = time.monotonic()
+        if reason is not None:
+            if now - self._last_decrease >= rtt:
+                self._last_decrease = now
+                self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                decreases.inc(reason=reason)
+        elif 2 * inflight >= self.limit:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        limit_gauge.set(self.limit)
+
+    def _sample(self, rtt: float) -> None:
+        self._window_min = rtt if self._window_min is None else min(self._window_min, rtt)
+        self._samples += 1
+        previous = self._previous_min if self._previous_min is not None else self._window_min
+        self._baseline = min(previous, self._window_min)
+        baseline_gauge.set(self._baseline)
+        if self._samples >= self.window:
+            self._previous_min = self._window_min
+            self._samples = 0
+            self._window_min = None
@@ -0,0 +1,143 @@
+# src/citation_verifier_mcp/metrics.py
+
+"""Minimal Prometheus metrics, rendered in the text exposition format.
+
+Metrics are created with :func:`counter` and :func:`gauge`, which return
+the existing metric if one with the same name was already registered, so
+modules can declare their metrics at import time. Values that already live
+elsewhere (cache sizes, pool stats...) can be exported with
+:func:`register_collector` instead of being copied into gauges.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+MetricFamily = Tuple[str, str, str, List[Sample]]
+
+
+class Metric:
+    """A named metric family with a fixed set of label names."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels: str) -> float:
+        """Current value for a label combination (0 if never set)."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            samples = [
+                (dict(zip(self.labelnames, key)), value) for key, value in self._values.items()
+            ]
+        return self.name, self.type, self.documentation, samples
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """A value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+_metrics: Dict[str, Metric] = {}
+_collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+_lock = threading.Lock()
+
+
+def _register(cls: type, name: str, documentation: str, labelnames: Tuple[str, ...]) -> Metric:
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = cls(name, documentation, labelnames)
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    """Return the counter called ``name``, creating it on first use."""
+    metric = _register(Counter, name, documentation, labelnames)
+    assert isinstance(metric, Counter)
+    return metric
+
+
+def gauge(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    """Return the gauge called ``name``, creating it on first use."""
+    metric = _register(Gauge, name, documentation, labelnames)
+    assert isinstance(metric, Gauge)
+    return metric
+
+
+def register_collector(collector: Callable[[], Iterable[MetricFamily]]) -> None:
+    """Add a callback that yields ``(name, type, help, samples)`` at scrape time."""
+    with _lock:
+        _collectors.append(collector)
+
+
+def unregister_collector(collector: Callable[[], Iterable[MetricFamily]]) -> None:
+    with _lock:
+        if collector in _collectors:
+            _collectors.remove(collector)
+
+
+def _format_value(value: Union[int, float]) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text format."""
+    with _lock:
+        families = [metric.collect() for metric in _metrics.values()]
+        collectors = list(_collectors)
+    for collector in collectors:
+        families.extend(collector())
+
+    lines = []
+    for name, kind, documentation, samples in families:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            if labels:
+                rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,172 @@
+# src/citation_verifier_mcp/profiling.py
+
+"""Live-instance latency diagnostics.
+
+- :class:`SamplingProfiler` samples every thread's stack for a bounded time
+  and returns collapsed stacks, the input format of ``flamegraph.pl`` and
+  speedscope. Nothing runs between profiles.
+- :class:`SlowRequestLog` records tool calls that exceed a threshold, with a
+  per-stage timing breakdown taken from the request's tracing spans.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from . import tracing
+from .config import env_float, env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads at a fixed interval.
+
+    Only one profile runs at a time. :meth:`profile` blocks for the whole
+    duration, so async callers should run it in a worker thread; the event
+    loop thread is sampled like any other.
+    """
+
+    def __init__(self, max_seconds: float = 60.0) -> None:
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, interval: float = 0.005) -> str:
+        """Sample for ``seconds`` and return collapsed stacks, one per line."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            return self._sample(min(seconds, self.max_seconds), max(interval, 0.001))
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> str:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                current: Optional[FrameType] = frame
+                while current is not None:
+                    labels.append(_frame_label(current))
+                    current = current.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(labels))] += 1
+            time.sleep(interval)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def _summarize(value: Any, limit: int = 200) -> Any:
+    """Shorten an argument for the log: long strings and lists are truncated."""
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + "..."
+    if isinstance(value, list):
+        return {"items": len(value), "first": [_summarize(v) for v in value[:3]]}
+    if isinstance(value, dict):
+        return {k: _summarize(v) for k, v in value.items()}
+    return value
+
+
+class SlowRequestLog:
+    """Keeps the most recent tool calls slower than ``threshold`` seconds.
+
+    Each entry has the tool name, its (truncated) arguments, the total time
+    and the time spent in each traced stage. Entries are logged as warnings
+    and, with ``path``, appended to a JSONL file (in a worker thread when
+    called from the event loop).
+    """
+
+    def __init__(
+        self, threshold: float = 2.0, path: Optional[str] = None, max_entries: int = 100
+    ) -> None:
+        self.threshold = threshold
+        self.path = path
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["SlowRequestLog"]:
+        """Create a log from ``CITATION_SLOW_REQUEST_MS``; None unless set.
+
+        Tracking collects spans for every tool call, so it is opt-in.
+        """
+        threshold_ms = env_float("CITATION_SLOW_REQUEST_MS", 0.0)
+        if threshold_ms <= 0:
+            return None
+        return cls(
+            threshold=threshold_ms / 1000,
+            path=env_str("CITATION_SLOW_REQUEST_LOG"),
+            max_entries=env_int("CITATION_SLOW_REQUEST_ENTRIES", 100),
+        )
+
+    @contextmanager
+    def track(self, tool: str, arguments: Dict[str, Any]) -> Iterator[None]:
+        """Time a tool call and record it if it runs over the threshold."""
+        started = time.monotonic()
+        with tracing.collect() as spans:
+            try:
+                yield
+            finally:
+                elapsed = time.monotonic() - started
+                if elapsed >= self.threshold:
+                    self.record(tool, arguments, elapsed, spans)
+
+    def record(
+        self, tool: str, arguments: Dict[str, Any], elapsed: float, spans: List[tracing.Span]
+    ) -> None:
+        """Add a slow call to the log."""
+        stages: Dict[str, float] = {}
+        for finished in spans:
+            duration = (finished.end_ns - finished.start_ns) / 1e6
+            stages[finished.name] = round(stages.get(finished.name, 0.0) + duration, 3)
+        entry = {
+            "ts": time.time(),
+            "tool": tool,
+            "arguments": _summarize(arguments),
+            "duration_ms": round(elapsed * 1000, 3),
+            "stages_ms": stages,
+        }
+        logger.warning(f"Slow tool call {tool} took {entry['duration_ms']}ms: {stages}")
+        with self._lock:
+            self.entries.append(entry)
+        if not self.path:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._append(self.path, entry)
+        else:
+            loop.run_in_executor(None, self._append, self.path, entry)
+
+    def _append(self, path: str, entry: Dict[str, Any]) -> None:
+        try:
+            with self._lock, open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write slow request log {path}: {e}")
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Return the logged entries, newest first."""
+        with self._lock:
+            return list(reversed(self.entries))
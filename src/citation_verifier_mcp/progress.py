@@ -0,0 +1,36 @@
+# src/citation_verifier_mcp/progress.py
+
+"""Progress reporting from inside tool calls.
+
+Transports that can stream install a reporter around a tool call; code deep
+in the call reports progress without knowing whether anyone is listening.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+ProgressCallback = Callable[[float, Optional[float], Optional[str]], None]
+
+_reporter: ContextVar[Optional[ProgressCallback]] = ContextVar(
+    "citation_progress_reporter", default=None
+)
+
+
+@contextmanager
+def progress_reporter(callback: ProgressCallback) -> Iterator[None]:
+    """Send progress reported inside the block to ``callback``."""
+    token = _reporter.set(callback)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+def report_progress(
+    progress: float, total: Optional[float] = None, message: Optional[str] = None
+) -> None:
+    """Report progress to the current reporter, if there is one."""
+    callback = _reporter.get()
+    if callback is not None:
+        callback(progress, total, message)
@@ -0,0 +1,159 @@
+# src/citation_verifier_mcp/recording.py
+
+"""Recording of tool-call traffic and upstream responses for offline replay.
+
+With ``CITATION_RECORD_PATH`` set, the server writes a JSONL recording:
+a header line, then one line per DOI tool call (its time offset, tool name
+and DOIs) and one per upstream lookup (the normalized DOI, how long it took
+and the resulting record row). Nothing else about the request is kept: no
+tenant, titles or other arguments. With ``CITATION_RECORD_HASH_DOIS`` the
+DOI suffixes are replaced by hashes too, and every text field of a record
+(title, authors, journal, publisher and error, which can quote the DOI) by
+filler of the same length. Only the status, year, registry, latency and
+field lengths are kept, so the workload's shape survives but not its content.
+
+:func:`load_recording` reads a recording back for :mod:`.replay`.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import normalize_doi
+from .config import env_bool, env_str
+from .records import VerificationRecord
+
+logger = logging.getLogger(__name__)
+
+FORMAT = "citation-verifier-recording"
+VERSION = 1
+
+# Record row fields blanked by CITATION_RECORD_HASH_DOIS: title, authors,
+# journal, publisher and error
+SCRUBBED_FIELDS = (2, 3, 4, 5, 7)
+
+
+def call_dois(tool: str, arguments: Dict[str, Any]) -> Optional[List[str]]:
+    """DOIs a tool call verifies, or None for calls that don't verify DOIs."""
+    if tool == "verify_citation":
+        return [str(arguments.get("doi", ""))]
+    if tool == "check_citations":
+        citations = arguments.get("citations") or []
+        return [str(c.get("doi", "")) for c in citations if isinstance(c, dict)]
+    return None
+
+
+def hash_doi(doi: str) -> str:
+    """Replace a DOI's suffix with a stable hash, keeping its registrant prefix."""
+    prefix, _, suffix = normalize_doi(doi).partition("/")
+    return f"{prefix}/{hashlib.sha256(suffix.encode()).hexdigest()[:16]}"
+
+
+class TrafficRecorder:
+    """JSONL recording of DOI tool calls and upstream lookups, started afresh on creation."""
+
+    def __init__(self, path: str, hash_dois: bool = False) -> None:
+        self.path = path
+        self.hash_dois = hash_dois
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        # Each server start begins a new recording, since offsets restart from zero
+        self._write(
+            {"format": FORMAT, "version": VERSION, "started": round(time.time(), 3)}, mode="w"
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["TrafficRecorder"]:
+        """Create a recorder if ``CITATION_RECORD_PATH`` is set."""
+        path = env_str("CITATION_RECORD_PATH")
+        if not path:
+            return None
+        return cls(path, hash_dois=env_bool("CITATION_RECORD_HASH_DOIS"))
+
+    def call(self, tool: str, arguments: Dict[str, Any]) -> None:
+        """Record a tool call; calls that don't verify DOIs are skipped."""
+        dois = call_dois(tool, arguments)
+        if dois is None:
+            return
+        self._write({"t": self._offset(), "call": tool, "dois": [self._doi(d) for d in dois]})
+
+    def upstream(self, key: str, record: VerificationRecord, latency: float) -> None:
+        """Record the outcome of an upstream lookup for a normalized DOI."""
+        row = record.to_row()
+        if self.hash_dois:
+            # Lengths are kept so memory use replays faithfully; status, year
+            # and source are left as they are
+            row[1] = self._doi(row[1]) if row[1] else ""
+            for index in SCRUBBED_FIELDS:
+                row[index] = "x" * len(row[index])
+        self._write(
+            {
+                "t": self._offset(),
+                "upstream": self._doi(key),
+                "latency": round(latency, 4),
+                "record": row,
+            }
+        )
+
+    def _doi(self, doi: str) -> str:
+        return hash_doi(doi) if self.hash_dois else doi
+
+    def _offset(self) -> float:
+        return round(time.monotonic() - self._started, 4)
+
+    def _write(self, item: Dict[str, Any], mode: str = "a") -> None:
+        line = json.dumps(item, separators=(",", ":"))
+        try:
+            with self._lock, open(self.path, mode, encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write traffic recording {self.path}: {e}")
+
+
+@dataclass
+class RecordedCall:
+    """A tool call at ``t`` seconds into the recording."""
+
+    t: float
+    tool: str
+    dois: List[str]
+
+
+@dataclass
+class Recording:
+    """Tool calls in time order, and the upstream responses for each DOI key."""
+
+    calls: List[RecordedCall] = field(default_factory=list)
+    responses: Dict[str, List[Tuple[VerificationRecord, float]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+
+def load_recording(path: str) -> Recording:
+    """Read a recording written by :class:`TrafficRecorder`.
+
+    Raises ValueError if the file isn't a recording.
+    """
+    recording = Recording()
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise ValueError(f"{path} is not a traffic recording")
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if "call" in item:
+                recording.calls.append(RecordedCall(item["t"], item["call"], item["dois"]))
+            elif "upstream" in item:
+                record = VerificationRecord.from_row(item["record"])
+                recording.responses[normalize_doi(item["upstream"])].append(
+                    (record, item["latency"])
+                )
+    recording.calls.sort(key=lambda call: call.t)
+    return recording
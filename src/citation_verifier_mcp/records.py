@@ -0,0 +1,128 @@
+# src/citation_verifier_mcp/records.py
+
+"""Compact verification result records.
+
+The verifier library and the fallback registries return one dict per
+lookup. Holding millions of those in the cache is wasteful, so results are
+converted to :class:`VerificationRecord` as soon as they come back from
+upstream and only turned back into dicts (or text) at the transport edge.
+"""
+
+import sys
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, List, Union
+
+
+class Status(IntEnum):
+    """Outcome of a verification."""
+
+    VERIFIED = 1
+    NOT_FOUND = 2
+    ERROR = 3
+
+
+def _intern(value: Any) -> str:
+    """Intern a low-cardinality field so every record shares one copy."""
+    return sys.intern(str(value)) if value is not None else ""
+
+
+@dataclass(frozen=True, slots=True)
+class VerificationRecord:
+    """A verification result stored in a fixed set of slots.
+
+    ``journal``, ``publisher``, ``year`` and ``source`` are interned, and
+    ``url`` is derived from the DOI rather than stored.
+    """
+
+    status: Status
+    doi: str
+    title: str = ""
+    authors: str = ""
+    journal: str = ""
+    publisher: str = ""
+    year: str = ""
+    error: str = ""
+    source: str = "crossref"
+
+    @property
+    def verified(self) -> bool:
+        return self.status is Status.VERIFIED
+
+    @property
+    def url(self) -> str:
+        return f"https://doi.org/{self.doi}"
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> "VerificationRecord":
+        """Convert a verifier or registry result dict."""
+        if result.get("verified"):
+            status = Status.VERIFIED
+        elif str(result.get("error", "")).startswith("DOI not found"):
+            status = Status.NOT_FOUND
+        else:
+            status = Status.ERROR
+        return cls(
+            status=status,
+            doi=str(result.get("doi", "")),
+            title=str(result.get("title", "")),
+            authors=str(result.get("authors", "")),
+            journal=_intern(result.get("journal", "")),
+            publisher=_intern(result.get("publisher", "")),
+            year=_intern(result.get("year", "")),
+            error=str(result.get("error", "")),
+            source=_intern(result.get("source", "crossref")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the verifier's dict shape, plus ``source``."""
+        if not self.verified:
+            return {"verified": False, "doi": self.doi, "error": self.error}
+        return {
+            "verified": True,
+            "doi": self.doi,
+            "title": self.title,
+            "authors": self.authors,
+            "journal": self.journal,
+            "publisher": self.publisher,
+            "year": self.year,
+            "url": self.url,
+            "source": self.source,
+        }
+
+    def to_row(self) -> List[Any]:
+        """Return the fields as a list, the compact form used for storage."""
+        return [
+            int(self.status),
+            self.doi,
+            self.title,
+            self.authors,
+            self.journal,
+            self.publisher,
+            self.year,
+            self.error,
+            self.source,
+        ]
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "VerificationRecord":
+        """Rebuild a record from :meth:`to_row` output."""
+        status, doi, title, authors, journal, publisher, year, error, source = row
+        return cls(
+            status=Status(status),
+            doi=doi,
+            title=title,
+            authors=authors,
+            journal=_intern(journal),
+            publisher=_intern(publisher),
+            year=_intern(year),
+            error=error,
+            source=_intern(source),
+        )
+
+
+def as_record(result: Union[VerificationRecord, Dict[str, Any]]) -> VerificationRecord:
+    """Accept either a record or a result dict."""
+    if isinstance(result, VerificationRecord):
+        return result
+    return VerificationRecord.from_dict(result)
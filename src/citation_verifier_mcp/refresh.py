@@ -0,0 +1,97 @@
+# src/citation_verifier_mcp/refresh.py
+
+"""Refresh-ahead of popular cache entries before they expire."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from .config import env_float, env_int
+from .verification import VerificationService
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshAheadScheduler:
+    """Re-fetches busy cache entries that are close to expiry.
+
+    Every ``interval`` seconds the scheduler looks for entries expiring
+    within ``window`` seconds that were read at least ``min_hits`` times,
+    and refreshes them busiest first. Refreshes only start while no client
+    lookups are in flight, and at most ``rate`` per second, so background
+    work never competes with live traffic for upstream capacity.
+    """
+
+    def __init__(
+        self,
+        service: VerificationService,
+        window: float = 3600.0,
+        interval: float = 60.0,
+        rate: float = 1.0,
+        min_hits: int = 1,
+    ) -> None:
+        self.service = service
+        self.window = window
+        self.interval = interval
+        self.rate = rate
+        self.min_hits = min_hits
+        self.refreshed = 0
+        self.failed = 0
+
+    @classmethod
+    def from_env(cls, service: VerificationService) -> Optional["RefreshAheadScheduler"]:
+        """Create a scheduler from ``CITATION_REFRESH_*`` variables.
+
+        Returns None when ``CITATION_REFRESH_INTERVAL`` is 0.
+        """
+        interval = env_float("CITATION_REFRESH_INTERVAL", 60.0)
+        if interval <= 0:
+            return None
+        return cls(
+            service,
+            window=env_float("CITATION_REFRESH_WINDOW", service.cache.ttl * 0.1),
+            interval=interval,
+            rate=env_float("CITATION_REFRESH_RATE", 1.0),
+            min_hits=env_int("CITATION_REFRESH_MIN_HITS", 1),
+        )
+
+    async def refresh_once(self, verifier: Any) -> int:
+        """Refresh the current batch of expiring entries; return how many were refreshed."""
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        count = 0
+        for key, _ in self.service.cache.expiring(self.window, self.min_hits):
+            # Wait for live traffic to drain, but give up at the next scan
+            deadline = time.monotonic() + self.interval
+            while self.service.inflight and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            if self.service.inflight:
+                break
+
+            started = time.monotonic()
+            try:
+                await self.service.refresh(verifier, key)
+                self.refreshed += 1
+                count += 1
+            except Exception as e:
+                self.failed += 1
+                logger.debug(f"Refresh-ahead failed for {key}: {e}")
+
+            remaining = interval - (time.monotonic() - started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+        return count
+
+    async def run(self, verifier: Any) -> None:
+        """Scan for expiring entries forever."""
+        logger.info(
+            f"Refresh-ahead enabled: window={self.window:.0f}s, interval={self.interval:.0f}s"
+        )
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                count = await self.refresh_once(verifier)
+                if count:
+                    logger.info(f"Refreshed {count} cache entries ahead of expiry")
+            except Exception as e:
+                logger.error(f"Refresh-ahead scan failed: {e}")
@@ -0,0 +1,289 @@
+# src/citation_verifier_mcp/registries.py
+
+"""Fallback resolution of DOIs that Crossref doesn't know about.
+
+Crossref is only one of several DOI registration agencies. Datasets and
+software are usually registered with DataCite, and any registered DOI can be
+confirmed through the doi.org handle API. :class:`RegistryResolver` tries
+those when Crossref reports a DOI as missing, and remembers which registry
+answered for each registrant prefix so later DOIs go straight there.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import requests
+
+from .config import env_float, env_str
+from .records import VerificationRecord
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+DATACITE_API = "https://api.datacite.org"
+HANDLE_API = "https://doi.org/api/handles"
+
+# Display names used when formatting results
+REGISTRY_NAMES = {"crossref": "Crossref", "datacite": "DataCite", "doi.org": "doi.org"}
+
+NOT_FOUND_ERROR = "DOI not found in Crossref, DataCite or doi.org - possibly hallucinated"
+
+
+def doi_prefix(doi: str) -> str:
+    """Return the registrant prefix of a DOI (the part before the first slash)."""
+    return doi.split("/", 1)[0].lower()
+
+
+def is_not_found(result: Dict[str, Any]) -> bool:
+    """Return True if a result says the registry doesn't know the DOI."""
+    return not result.get("verified") and str(result.get("error", "")).startswith("DOI not found")
+
+
+def is_failure(result: Dict[str, Any]) -> bool:
+    """Return True if a lookup failed rather than answering (network, 5xx, rate limit)."""
+    return not result.get("verified") and not is_not_found(result)
+
+
+# Called with the round trip of a Crossref call and whether it failed
+CrossrefObserver = Callable[[float, bool], None]
+
+
+async def verify_with_crossref(
+    verifier: Any, doi: str, observe: Optional[CrossrefObserver] = None
+) -> Dict[str, Any]:
+    """Look a DOI up through the verifier library, reporting the Crossref call to ``observe``.
+
+    Only the Crossref request is timed, so congestion control and the
+    circuit breaker see Crossref's health and not that of fallback registries.
+    """
+    started = time.monotonic()
+    with span("upstream.crossref", {"doi": doi}):
+        try:
+            result: Dict[str, Any] = await asyncio.to_thread(verifier.verify_doi, doi)
+        except Exception:
+            if observe is not None:
+                observe(time.monotonic() - started, True)
+            raise
+    if observe is not None:
+        observe(time.monotonic() - started, is_failure(result))
+    return result
+
+
+def registry_note(record: VerificationRecord) -> str:
+    """Describe where a verified result came from, for the formatted output."""
+    source = record.source
+    if source == "doi.org":
+        return (
+            "This DOI is registered in the doi.org handle system, but neither Crossref nor "
+            "DataCite has bibliographic metadata for it. Check the landing page to confirm "
+            "the cited work."
+        )
+    return (
+        f"This DOI exists in the {REGISTRY_NAMES.get(source, source)} database "
+        "and appears to be a legitimate citation."
+    )
+
+
+def _unknown_metadata(doi: str, source: str) -> Dict[str, Any]:
+    """A verified result with no bibliographic metadata."""
+    return {
+        "verified": True,
+        "doi": doi,
+        "title": "Unknown",
+        "authors": "Unknown",
+        "journal": "Unknown",
+        "publisher": "Unknown",
+        "year": "Unknown",
+        "url": f"https://doi.org/{doi}",
+        "source": source,
+    }
+
+
+def _format_creators(creators: List[Dict[str, Any]]) -> str:
+    """Format DataCite creators like the Crossref author list."""
+    names = []
+    for creator in creators[:3]:
+        if creator.get("familyName"):
+            names.append(f"{creator.get('givenName', '')} {creator['familyName']}".strip())
+        elif creator.get("name"):
+            names.append(creator["name"])
+    if len(creators) > 3:
+        names.append("et al.")
+    return ", ".join(names) if names else "Unknown"
+
+
+class RegistryResolver:
+    """Resolves DOIs through Crossref, then DataCite and the doi.org handle API.
+
+    Fallback registries are queried after a Crossref "not found", either
+    one after another or all at once (``parallel``), in which case the first
+    positive answer wins and the remaining lookups are abandoned. Network
+    failures in the fallbacks produce an error result rather than a "not
+    found", so they are not cached as negatives.
+    """
+
+    def __init__(
+        self,
+        registries: Sequence[str] = ("datacite", "doi.org"),
+        parallel: bool = True,
+        timeout: float = 10.0,
+        max_routes: int = 10000,
+    ) -> None:
+        self.timeout = timeout
+        self.parallel = parallel
+        self.max_routes = max_routes
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "citation-verifier-mcp"
+        available: Dict[str, Callable[[str], Optional[Dict[str, Any]]]] = {
+            "datacite": self.lookup_datacite,
+            "doi.org": self.lookup_handle,
+        }
+        self.lookups = {name: available[name] for name in registries if name in available}
+        self.routes: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["RegistryResolver"]:
+        """Create a resolver from ``CITATION_REGISTRIES`` and ``CITATION_REGISTRY_MODE``.
+
+        Returns None when ``CITATION_REGISTRIES`` is set to an empty value or "none".
+        """
+        names = env_str("CITATION_REGISTRIES", "datacite,doi.org") or ""
+        registries = [name.strip() for name in names.split(",") if name.strip()]
+        if not registries or registries == ["none"]:
+            return None
+        return cls(
+            registries,
+            parallel=(env_str("CITATION_REGISTRY_MODE", "parallel") != "sequential"),
+            timeout=env_float("CITATION_REGISTRY_TIMEOUT", 10.0),
+        )
+
+    def route_for(self, doi: str) -> Optional[str]:
+        """Return the registry that last resolved a DOI with this prefix."""
+        with self._lock:
+            return self.routes.get(doi_prefix(doi))
+
+    def learn(self, doi: str, registry: str) -> None:
+        """Remember which registry resolved a DOI's prefix."""
+        with self._lock:
+            self.routes[doi_prefix(doi)] = registry
+            self.routes.move_to_end(doi_prefix(doi))
+            while len(self.routes) > self.max_routes:
+                self.routes.popitem(last=False)
+
+    def lookup_datacite(self, doi: str) -> Optional[Dict[str, Any]]:
+        """Look a DOI up in DataCite; None if it isn't registered there."""
+        with span("upstream.datacite", {"doi": doi}):
+            response = self.session.get(f"{DATACITE_API}/dois/{doi}", timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        attributes = response.json()["data"]["attributes"]
+
+        publisher = attributes.get("publisher") or "Unknown"
+        if isinstance(publisher, dict):
+            publisher = publisher.get("name", "Unknown")
+        titles = attributes.get("titles") or [{}]
+        container = attributes.get("container") or {}
+        return {
+            **_unknown_metadata(doi, "datacite"),
+            "title": titles[0].get("title", "Unknown"),
+            "authors": _format_creators(attributes.get("creators") or []),
+            "journal": container.get("title", "Unknown"),
+            "publisher": publisher,
+            "year": str(attributes.get("publicationYear") or "Unknown"),
+        }
+
+    def lookup_handle(self, doi: str) -> Optional[Dict[str, Any]]:
+        """Check that a DOI is registered with the doi.org handle system."""
+        with span("upstream.doi.org", {"doi": doi}):
+            response = self.session.get(f"{HANDLE_API}/{doi}", timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        if response.json().get("responseCode") != 1:
+            return None
+        return _unknown_metadata(doi, "doi.org")
+
+    async def resolve(
+        self, verifier: Any, doi: str, observe: Optional[CrossrefObserver] = None
+    ) -> Dict[str, Any]:
+        """Verify a DOI, falling back to other registries on a Crossref miss.
+
+        ``observe`` is told about the Crossref call only, if one is made.
+        """
+        routed = self.route_for(doi)
+        # A routed registry that is down can't confirm a miss, so its error is kept
+        failure: Optional[Exception] = None
+        if routed in self.lookups:
+            try:
+                result = await asyncio.to_thread(self.lookups[routed], doi)
+                if result:
+                    return result
+            except Exception as e:
+                logger.debug(f"{routed} lookup for routed DOI {doi} failed: {e}")
+                failure = e
+
+        crossref = await verify_with_crossref(verifier, doi, observe)
+        if crossref.get("verified"):
+            self.learn(doi, "crossref")
+            return crossref
+        if not is_not_found(crossref) or not self.lookups:
+            return crossref
+
+        remaining = [name for name in self.lookups if name != routed]
+        if self.parallel:
+            return await self._race(doi, remaining, failure)
+        return await self._sequential(doi, remaining, failure)
+
+    async def _sequential(
+        self, doi: str, registries: List[str], failure: Optional[Exception] = None
+    ) -> Dict[str, Any]:
+        """Try each fallback registry in turn."""
+        for name in registries:
+            try:
+                result = await asyncio.to_thread(self.lookups[name], doi)
+            except Exception as e:
+                failure = e
+                continue
+            if result:
+                self.learn(doi, name)
+                return result
+        return self._miss(doi, failure)
+
+    async def _race(
+        self, doi: str, registries: List[str], failure: Optional[Exception] = None
+    ) -> Dict[str, Any]:
+        """Query every fallback registry at once; the first positive answer wins."""
+        tasks = {
+            asyncio.ensure_future(asyncio.to_thread(self.lookups[name], doi)): name
+            for name in registries
+        }
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception as e:
+                    failure = e
+                    continue
+                if result:
+                    self.learn(doi, result["source"])
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
+        return self._miss(doi, failure)
+
+    def _miss(self, doi: str, failure: Optional[Exception]) -> Dict[str, Any]:
+        """Result for a DOI no registry confirmed."""
+        if failure is not None:
+            return {
+                "verified": False,
+                "doi": doi,
+                "error": f"Not found in Crossref; other registries unreachable: {failure}",
+            }
+        return {"verified": False, "doi": doi, "error": NOT_FOUND_ERROR}
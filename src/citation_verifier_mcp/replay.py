@@ -0,0 +1,155 @@
+# src/citation_verifier_mcp/replay.py
+
+"""Replay of recorded traffic against a local verification pipeline.
+
+Usage::
+
+    citation-verifier-replay traffic.jsonl --speed 10 --cache-size 5000 --concurrency 8
+
+Calls from a :mod:`.recording` are issued at their recorded offsets (divided
+by ``--speed``; ``0`` issues them back to back, each after the last one
+finishes) to a fresh
+:class:`~.verification.VerificationService`. Upstream lookups are answered
+by :class:`RecordedVerifier` from the recorded responses, after the
+recorded latency, so runs are deterministic and need no network. The
+report gives call latencies, cache hits and misses and the number of
+upstream lookups, for comparing cache sizes and concurrency settings.
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .cache import VerificationCache, normalize_doi
+from .recording import Recording, load_recording
+from .scheduling import FairScheduler
+from .verification import VerificationService
+
+
+class RecordedVerifier:
+    """Stand-in for ``CitationVerifier`` that answers from a recording.
+
+    Each DOI's recorded responses are returned in order, the last one
+    repeating; each takes its recorded latency divided by ``speed``.
+    DOIs with no recorded response are reported as not found.
+    """
+
+    def __init__(self, recording: Recording, speed: float = 1.0) -> None:
+        self.responses = recording.responses
+        self.speed = speed
+        self.calls = 0
+        self.unrecorded = 0
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def verify_doi(self, doi: str) -> Dict[str, Any]:
+        key = normalize_doi(doi)
+        responses = self.responses.get(key)
+        with self._lock:
+            self.calls += 1
+            if not responses:
+                self.unrecorded += 1
+                return {"verified": False, "doi": doi, "error": "DOI not found (not in recording)"}
+            index = self._next.get(key, 0)
+            self._next[key] = index + 1
+        record, latency = responses[min(index, len(responses) - 1)]
+        if self.speed > 0:
+            time.sleep(latency / self.speed)
+        return record.to_dict()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def replay(
+    recording: Recording,
+    speed: float = 1.0,
+    cache_size: int = 10000,
+    concurrency: int = 8,
+) -> Dict[str, Any]:
+    """Replay a recording and return the latency and cache report."""
+    verifier = RecordedVerifier(recording, speed)
+    cache = VerificationCache(max_entries=cache_size)
+    service = VerificationService(
+        cache, scheduler=FairScheduler(capacity=concurrency) if concurrency > 0 else None
+    )
+    latencies: List[float] = []
+
+    async def drive(dois: List[str]) -> None:
+        started = time.monotonic()
+        if len(dois) == 1:
+            await service.verify(verifier, dois[0])
+        else:
+            await service.verify_many(verifier, dois)
+        latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    tasks: List["asyncio.Task[None]"] = []
+    for call in recording.calls:
+        if speed <= 0:
+            # Without timing, overlapping everything would turn all repeats into
+            # coalesced misses; one at a time keeps the cache figures meaningful
+            await drive(call.dois)
+            continue
+        delay = call.t / speed - (time.monotonic() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(drive(call.dois)))
+    await asyncio.gather(*tasks)
+    duration = time.monotonic() - started
+
+    lookups = cache.hits + cache.misses
+    return {
+        "calls": len(recording.calls),
+        "duration_s": round(duration, 3),
+        "latency_ms": {
+            name: round(_percentile(latencies, fraction) * 1000, 1)
+            for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        },
+        "cache": {
+            "size": cache_size,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_ratio": round(cache.hits / lookups, 4) if lookups else 0.0,
+        },
+        "upstream": {"calls": verifier.calls, "unrecorded": verifier.unrecorded},
+        "concurrency": concurrency,
+        "speed": speed,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="citation-verifier-replay", description="Replay recorded traffic offline."
+    )
+    parser.add_argument("recording", help="File written with CITATION_RECORD_PATH")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Time acceleration; 0 = one call at a time, no waits",
+    )
+    parser.add_argument("--cache-size", type=int, default=10000, help="In-process cache entries")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Upstream lookups at once; 0 = unlimited"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for ``citation-verifier-replay``."""
+    args = build_parser().parse_args(argv)
+    recording = load_recording(args.recording)
+    report = asyncio.run(replay(recording, args.speed, args.cache_size, args.concurrency))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
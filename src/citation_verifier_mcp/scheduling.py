@@ -0,0 +1,133 @@
+# src/citation_verifier_mcp/scheduling.py
+
+"""Weighted fair sharing of upstream capacity between tenants."""
+
+import asyncio
+import heapq
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from . import metrics
+from .config import env_int
+from .limits import AdaptiveLimit
+from .tenants import Tenant
+
+queue_depth = metrics.gauge(
+    "citation_scheduler_queue_depth", "Upstream lookups waiting for a slot", ("tenant",)
+)
+wait_seconds = metrics.counter(
+    "citation_scheduler_wait_seconds_total", "Time spent waiting for an upstream slot", ("tenant",)
+)
+dispatched = metrics.counter(
+    "citation_scheduler_dispatched_total", "Upstream lookups given a slot", ("tenant",)
+)
+
+
+class FairScheduler:
+    """Weighted fair queuing of upstream lookups across tenants.
+
+    At most ``capacity`` lookups run at once. When they are all busy, waiting
+    lookups are tagged with a virtual finish time: the later of the virtual
+    clock and the tenant's previous tag, plus ``1 / weight``. A freed slot
+    goes to the smallest tag, so a tenant with many queued lookups can't
+    starve one with a few, and a tenant with weight 2 gets twice the share
+    of a tenant with weight 1 while both are backlogged. Cache hits never
+    reach the scheduler.
+
+    With an adaptive ``limit``, the capacity follows it: lookups report how
+    they went through :meth:`observe`, and waiters are let in as soon as
+    the limit grows.
+    """
+
+    def __init__(self, capacity: int = 8, limit: Optional[AdaptiveLimit] = None) -> None:
+        self._capacity = capacity
+        self.limit = limit
+        self.active = 0
+        self._vtime = 0.0
+        self._last_tag: Dict[str, float] = {}
+        self._queue: List[Tuple[float, int, "asyncio.Future[None]", str]] = []
+        self._seq = 0
+
+    @classmethod
+    def from_env(cls, limit: Optional[AdaptiveLimit] = None) -> "FairScheduler":
+        """Create a scheduler sized by ``CITATION_UPSTREAM_CONCURRENCY`` or ``limit``."""
+        return cls(capacity=env_int("CITATION_UPSTREAM_CONCURRENCY", 8), limit=limit)
+
+    @property
+    def capacity(self) -> int:
+        """Lookups allowed to run at once."""
+        return self.limit.limit if self.limit is not None else self._capacity
+
+    @property
+    def waiting(self) -> int:
+        """Number of lookups queued for a slot."""
+        return sum(1 for _, _, future, _ in self._queue if not future.done())
+
+    @asynccontextmanager
+    async def slot(self, tenant: Tenant) -> AsyncIterator[None]:
+        """Hold one upstream slot for the duration of the block."""
+        tag = max(self._vtime, self._last_tag.get(tenant.name, 0.0)) + 1.0 / tenant.weight
+        self._last_tag[tenant.name] = tag
+
+        if self.active < self.capacity and not self.waiting:
+            self.active += 1
+            self._vtime = tag
+        else:
+            await self._wait(tag, tenant.name)
+        dispatched.inc(tenant=tenant.name)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _wait(self, tag: float, tenant: str) -> None:
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._queue, (tag, self._seq, future, tenant))
+        queue_depth.inc(tenant=tenant)
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self._release()
+            else:
+                queue_depth.dec(tenant=tenant)
+            raise
+        finally:
+            wait_seconds.inc(time.monotonic() - started, tenant=tenant)
+
+    def observe(self, rtt: float, dropped: bool = False) -> None:
+        """Report a finished lookup to the adaptive limit, if there is one."""
+        if self.limit is None:
+            return
+        self.limit.observe(rtt, self.active, dropped)
+        self._dispatch()
+
+    def _release(self) -> None:
+        """Free a slot and hand it to the waiter with the smallest tag, if any."""
+        self.active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Give free slots to waiters in tag order, up to the capacity."""
+        while self._queue and self.active < self.capacity:
+            tag, _, future, tenant = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self._vtime = tag
+            self.active += 1
+            queue_depth.dec(tenant=tenant)
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        stats: Dict[str, Optional[float]] = {
+            "capacity": self.capacity,
+            "active": self.active,
+            "waiting": self.waiting,
+        }
+        if self.limit is not None:
+            stats["baseline_rtt"] = self.limit.baseline
+        return stats
@@ -0,0 +1,151 @@
+# src/citation_verifier_mcp/search.py
+
+"""Fuzzy title/author search for citations whose DOI can't be verified."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import env_float, env_int
+from .crossref import CrossrefClient, summarize_work
+from .similarity import author_overlap, normalize_text, similarity
+
+logger = logging.getLogger(__name__)
+
+
+def score_candidate(
+    candidate: Dict[str, Any], title: str, authors: str = "", year: str = ""
+) -> float:
+    """Score how well a candidate matches the claimed title, authors and year (0-1)."""
+    weights = [(0.7, similarity(title, candidate["title"]))]
+    if authors:
+        weights.append((0.2, author_overlap(authors, candidate["authors"])))
+    if year and candidate["year"] != "Unknown":
+        try:
+            gap = abs(int(year) - int(candidate["year"]))
+        except ValueError:
+            gap = 2
+        weights.append((0.1, 1.0 if gap == 0 else 0.5 if gap == 1 else 0.0))
+    total = sum(weight for weight, _ in weights)
+    return sum(weight * score for weight, score in weights) / total
+
+
+class CitationSearcher:
+    """Finds likely DOIs for a citation from its title, authors and year.
+
+    A few query variants are sent to Crossref concurrently. Candidates are
+    ranked by :func:`score_candidate`, and the search stops early as soon as
+    one scores at least ``accept_score``. Query results are cached so agents
+    retrying the same citation don't repeat upstream calls.
+    """
+
+    def __init__(
+        self,
+        client: Optional[CrossrefClient] = None,
+        rows: int = 5,
+        accept_score: float = 0.9,
+        cache_size: int = 1000,
+        cache_ttl: float = 3600.0,
+    ) -> None:
+        self.client = client if client is not None else CrossrefClient.from_env()
+        self.rows = rows
+        self.accept_score = accept_score
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CitationSearcher":
+        """Create a searcher configured from ``CITATION_SEARCH_*`` variables."""
+        return cls(
+            rows=env_int("CITATION_SEARCH_ROWS", 5),
+            accept_score=env_float("CITATION_SEARCH_ACCEPT_SCORE", 0.9),
+            cache_size=env_int("CITATION_SEARCH_CACHE_SIZE", 1000),
+            cache_ttl=env_float("CITATION_SEARCH_CACHE_TTL", 3600.0),
+        )
+
+    def _query_variants(self, title: str, authors: str, year: str) -> List[Dict[str, str]]:
+        """Build the Crossref queries to run for a citation."""
+        variants = [{"query.bibliographic": " ".join(part for part in (title, year) if part)}]
+        if authors:
+            variants.append({"query.title": title, "query.author": authors})
+        return variants
+
+    def _query(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Run one query through the cache (called in a worker thread)."""
+        key = tuple(sorted((name, normalize_text(value)) for name, value in params.items()))
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        results = [summarize_work(work) for work in self.client.search_works(params, self.rows)]
+        with self._lock:
+            self._cache[key] = (now + self.cache_ttl, results)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return results
+
+    async def search(
+        self, title: str, authors: str = "", year: str = "", limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return candidates ranked best first, each with a ``score`` field."""
+        year = str(year or "").strip()
+        tasks = [
+            asyncio.ensure_future(asyncio.to_thread(self._query, params))
+            for params in self._query_variants(title, authors, year)
+        ]
+
+        candidates: Dict[str, Dict[str, Any]] = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    results = await next_done
+                except Exception as e:
+                    logger.warning(f"Crossref search query failed: {e}")
+                    continue
+                for result in results:
+                    key = result["doi"].lower()
+                    if key and key not in candidates:
+                        candidates[key] = {
+                            **result,
+                            "score": score_candidate(result, title, authors, year),
+                        }
+                if any(c["score"] >= self.accept_score for c in candidates.values()):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        ranked = sorted(candidates.values(), key=lambda c: c["score"], reverse=True)
+        return ranked[:limit]
+
+
+def format_search_results(
+    candidates: List[Dict[str, Any]], heading: str = "# 🔎 Citation Search Results"
+) -> str:
+    """Format ranked search candidates for display."""
+    if not candidates:
+        return f"{heading}\n\nNo matching works were found in the Crossref database."
+
+    lines = [heading, ""]
+    for rank, candidate in enumerate(candidates, start=1):
+        lines.append(
+            f"{rank}. **{candidate['title']}** ({candidate['year']})\n"
+            f"   **DOI:** {candidate['doi']}\n"
+            f"   **Authors:** {candidate['authors']}\n"
+            f"   **Journal:** {candidate['journal']}\n"
+            f"   **Match score:** {candidate['score']:.2f}"
+        )
+    lines.append("")
+    lines.append(
+        "**Recommendation:** Use the highest-scoring DOI only if its title and authors "
+        "match the citation; verify it with `verify_citation`."
+    )
+    return "\n".join(lines)
@@ -2,13 +2,32 @@
 
 import asyncio
 import logging
-from typing import Any, Dict, List
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 import mcp.server.stdio
 import mcp.types as types
-from llm_citation_verifier import CitationVerifier
 from mcp.server import Server
 
+from .bibliography import check_bibliography, format_bibliography_report
+from .breaker import CircuitBreaker
+from .config import env_bool
+from .consistency import check_citations, format_consistency_report
+from .limits import AdaptiveLimit
+from .profiling import SlowRequestLog
+from .recording import TrafficRecorder
+from .records import VerificationRecord, as_record
+from .registries import RegistryResolver, registry_note
+from .scheduling import FairScheduler
+from .search import CitationSearcher
+from .shared_cache import SharedCache
+from .tools import TOOL_DEFINITIONS, TOOL_NAMES, run_search_tool, suggest_alternatives
+from .tracing import extract_context, span
+from .upstream import UpstreamPool
+from .verification import VerificationService
+from .warmup import AccessLog, CacheWarmer
+from .watchdog import LoopWatchdog
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,8 +35,41 @@ logger = logging.getLogger(__name__)
 # Initialize the MCP server
 server: Server = Server("citation-verifier", version="0.1.2")
 
+if TYPE_CHECKING:
+    from llm_citation_verifier import CitationVerifier
+
 # Global citation verifier instance
-citation_verifier = None
+citation_verifier: Optional["CitationVerifier"] = None
+
+# Background verifier initialization started by main() in lazy mode
+verifier_init_task: Optional["asyncio.Task[None]"] = None
+
+# Upstream concurrency that follows Crossref's latency; None unless enabled
+upstream_limit = AdaptiveLimit.from_env()
+
+# Recording of DOI calls and upstream responses for offline replay; None unless enabled
+traffic_recorder = TrafficRecorder.from_env()
+
+# Pooled connections to Crossref for the verifier library, pre-opened at startup
+upstream_pool = UpstreamPool.from_env()
+
+# Cached, single-flight verification front end shared by tool calls and warm-up
+verification_service = VerificationService(
+    resolver=RegistryResolver.from_env(),
+    shared=SharedCache.from_env(),
+    scheduler=FairScheduler.from_env(upstream_limit) if upstream_limit else None,
+    breaker=CircuitBreaker.from_env(),
+    recorder=traffic_recorder,
+)
+
+# Crossref title/author search for citations whose DOI fails verification
+citation_searcher = CitationSearcher.from_env()
+
+# Optional log of requested DOIs, used to warm the cache on the next start
+access_log = AccessLog.from_env()
+
+# Tool calls slower than CITATION_SLOW_REQUEST_MS, with their timing breakdown
+slow_requests = SlowRequestLog.from_env()
 
 
 async def initialize_citation_verifier() -> None:
@@ -25,55 +77,116 @@ async def initialize_citation_verifier() -> None:
     global citation_verifier
 
     try:
-        citation_verifier = CitationVerifier()
+        # Importing the verifier library is the slowest part of startup; keep it off the loop
+        citation_verifier = await asyncio.to_thread(_create_citation_verifier)
         logger.info("Citation verifier initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize citation verifier: {e}")
         raise
 
 
+def _create_citation_verifier() -> "CitationVerifier":
+    """Import the verifier library on first use and construct a verifier."""
+    from llm_citation_verifier import CitationVerifier
+
+    upstream_pool.install()
+    return CitationVerifier()
+
+
+async def ensure_citation_verifier() -> None:
+    """Wait for the background verifier initialization, if one is running."""
+    if citation_verifier is None and verifier_init_task is not None:
+        await asyncio.shield(verifier_init_task)
+
+
 @server.list_tools()
 async def handle_list_tools() -> List[types.Tool]:
     """List available tools."""
-    return [
-        types.Tool(
-            name="verify_citation",
-            description="Verify a DOI citation against the Crossref database. Detects potentially hallucinated citations by checking if DOIs exist and retrieving bibliographic metadata.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "doi": {
-                        "type": "string",
-                        "description": "The DOI to verify (e.g., '10.1038/nature12373'). Can include URL prefixes which will be automatically stripped.",
-                    }
-                },
-                "required": ["doi"],
-            },
-        )
-    ]
+    return [types.Tool(**definition) for definition in TOOL_DEFINITIONS]
+
+
+def _request_meta() -> Any:
+    """``_meta`` of the request being handled, if there is one."""
+    try:
+        return server.request_context.meta
+    except LookupError:
+        return None
 
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle tool calls."""
+    parent = extract_context(_request_meta())
+    if traffic_recorder:
+        await asyncio.to_thread(traffic_recorder.call, name, arguments)
+    tracked = slow_requests.track(name, arguments) if slow_requests else nullcontext()
+    with tracked, span("mcp.dispatch", {"mcp.transport": "stdio", "mcp.tool": name}, parent=parent):
+        return await _call_tool(name, arguments)
+
 
-    if name != "verify_citation":
+async def _call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Run a tool call."""
+    if name not in TOOL_NAMES:
         raise ValueError(f"Unknown tool: {name}")
 
+    if name == "search_citation":
+        try:
+            text = await run_search_tool(citation_searcher, arguments)
+        except Exception as e:
+            logger.error(f"Error in citation search: {e}")
+            text = f"Error during citation search: {str(e)}"
+        return [types.TextContent(type="text", text=text)]
+
+    if not citation_verifier:
+        await ensure_citation_verifier()
     if not citation_verifier:
         raise RuntimeError("Citation verifier not initialized")
 
+    if name == "check_citations":
+        try:
+            reports = await check_citations(
+                verification_service, citation_verifier, arguments["citations"]
+            )
+            with span("format"):
+                text = format_consistency_report(reports)
+        except Exception as e:
+            logger.error(f"Error in citation consistency check: {e}")
+            text = f"Error during citation consistency check: {str(e)}"
+        return [types.TextContent(type="text", text=text)]
+
+    if name == "verify_bibliography":
+        try:
+            reports = await check_bibliography(
+                verification_service,
+                citation_verifier,
+                citation_searcher,
+                arguments["bibliography"],
+                arguments.get("format"),
+            )
+            with span("format"):
+                # Reports for thousands of entries take a while to render
+                text = await asyncio.to_thread(format_bibliography_report, reports)
+        except Exception as e:
+            logger.error(f"Error in bibliography verification: {e}")
+            text = f"Error during bibliography verification: {str(e)}"
+        return [types.TextContent(type="text", text=text)]
+
     try:
         # Extract DOI from arguments
         doi = arguments["doi"]
 
         logger.info(f"Verifying citation for DOI: {doi}")
+        if access_log:
+            await asyncio.to_thread(access_log.record, doi)
 
-        # Call your citation verifier
-        result = citation_verifier.verify_doi(doi)
+        # Verify through the cache, off the event loop
+        result = await verification_service.verify(citation_verifier, doi)
 
         # Format the result for MCP response
-        formatted_result = format_verification_result(result)
+        with span("format"):
+            formatted_result = format_verification_result(result)
+        if not result.verified:
+            formatted_result += await suggest_alternatives(citation_searcher, arguments)
 
         return [types.TextContent(type="text", text=formatted_result)]
 
@@ -84,49 +197,77 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.T
         ]
 
 
-def format_verification_result(result: Dict) -> str:
+def format_verification_result(result: Union[VerificationRecord, Dict]) -> str:
     """Format citation verification result for display."""
-    if result["verified"]:
+    record = as_record(result)
+    if record.verified:
         # Successfully verified citation
         output = f"""# ✅ Citation Verified
 
-**DOI:** {result["doi"]}
-**Title:** {result["title"]}
-**Authors:** {result["authors"]}
-**Journal:** {result["journal"]}
-**Publisher:** {result["publisher"]}
-**Year:** {result["year"]}
-**URL:** {result["url"]}
+**DOI:** {record.doi}
+**Title:** {record.title}
+**Authors:** {record.authors}
+**Journal:** {record.journal}
+**Publisher:** {record.publisher}
+**Year:** {record.year}
+**URL:** {record.url}
 
-This DOI exists in the Crossref database and appears to be a legitimate citation."""
+{registry_note(record)}"""
     else:
         # Failed verification - likely hallucinated
         output = f"""# ❌ Citation Not Verified
 
-**DOI:** {result["doi"]}
-**Error:** {result["error"]}
+**DOI:** {record.doi}
+**Error:** {record.error}
 
-⚠️ **Warning:** This DOI was not found in the Crossref database. This may indicate:
+⚠️ **Warning:** This DOI was not found in Crossref, DataCite or doi.org. This may indicate:
 - The DOI is hallucinated/fake
 - The DOI contains typos
-- The paper is very recent and not yet indexed
-- The publisher doesn't use Crossref
+- The paper is very recent and not yet registered
+- A registry could not be reached (see the error above)
 
 **Recommendation:** Verify this citation manually or find an alternative source."""
 
     return output
 
 
+async def warm_cache() -> None:
+    """Prefetch the configured hot DOIs once the verifier is available."""
+    warmer = CacheWarmer.from_env(verification_service)
+    if warmer:
+        await ensure_citation_verifier()
+        await warmer.run(citation_verifier)
+
+
 async def main() -> None:
     """Run the MCP server."""
+    global verifier_init_task
+
     try:
-        # Initialize citation verifier
-        await initialize_citation_verifier()
+        # Initialize citation verifier. In lazy mode (the default) the MCP handshake
+        # and tools/list are answered straight away and the first tools/call waits for it.
+        if env_bool("CITATION_LAZY_INIT", True):
+            verifier_init_task = asyncio.create_task(initialize_citation_verifier())
+        else:
+            await initialize_citation_verifier()
+
+        # Warm the cache and open upstream connections in the background while the session starts
+        warmup_task = asyncio.create_task(warm_cache())
+        prewarm_task = asyncio.create_task(asyncio.to_thread(upstream_pool.prewarm))
+        watchdog = LoopWatchdog.from_env()
+        if watchdog:
+            watchdog.start()
 
         # Start MCP server
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            options = server.create_initialization_options()
-            await server.run(read_stream, write_stream, options)
+        try:
+            async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+                options = server.create_initialization_options()
+                await server.run(read_stream, write_stream, options)
+        finally:
+            warmup_task.cancel()
+            prewarm_task.cancel()
+            if watchdog:
+                watchdog.stop()
     except Exception as e:
         logger.error(f"Failed to start MCP server: {e}")
         raise
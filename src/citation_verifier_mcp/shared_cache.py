@@ -0,0 +1,304 @@
+# src/citation_verifier_mcp/shared_cache.py
+
+"""Shared (L2) verification cache, so a fleet of servers shares lookups.
+
+The in-process :class:`~.cache.VerificationCache` stays the first tier. On a
+miss, :class:`SharedCache` is checked before going upstream, and upstream
+results are written to both. Backends only store bytes with a TTL:
+
+- ``memory://`` — :class:`InMemoryBackend`, a local stand-in for tests and
+  single-instance development.
+- ``redis://host:port/db`` — :class:`RedisBackend`, a minimal Redis protocol
+  (RESP) client with pipelining and no extra dependencies.
+"""
+
+import json
+import logging
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+from urllib.parse import urlparse
+
+from .config import env_float, env_str
+from .records import VerificationRecord
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCacheBackend(Protocol):
+    """Byte store with per-key TTLs."""
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Fetch several keys in one round trip; None for missing keys."""
+        ...
+
+    def set_many(self, items: Sequence[Tuple[str, bytes, float]]) -> None:
+        """Store several ``(key, value, ttl)`` items in one round trip."""
+        ...
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        """Remove several keys in one round trip."""
+        ...
+
+
+class InMemoryBackend:
+    """Process-local backend with the same semantics as the Redis one."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = time.time()
+        with self._lock:
+            values = []
+            for key in keys:
+                item = self._data.get(key)
+                values.append(item[1] if item and item[0] > now else None)
+            return values
+
+    def set_many(self, items: Sequence[Tuple[str, bytes, float]]) -> None:
+        now = time.time()
+        with self._lock:
+            for key, value, ttl in items:
+                self._data[key] = (now + ttl, value)
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+class RedisError(Exception):
+    """Error reply from a Redis server."""
+
+
+class RedisBackend:
+    """Minimal Redis protocol client using one pipelined connection.
+
+    Commands for a batch are written in a single send and their replies read
+    back in order, so a multi-get or multi-set costs one round trip.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: float = 1.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader: Any = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 1.0) -> "RedisBackend":
+        """Create a backend from a ``redis://[:password@]host[:port][/db]`` URL."""
+        parsed = urlparse(url)
+        db = parsed.path.lstrip("/")
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=parsed.password,
+            timeout=timeout,
+        )
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        setup: List[List[Any]] = []
+        if self.password:
+            setup.append(["AUTH", self.password])
+        if self.db:
+            setup.append(["SELECT", self.db])
+        if setup:
+            self._pipeline(setup)
+
+    def close(self) -> None:
+        """Close the connection; the next command reconnects."""
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    def execute(self, commands: List[List[Any]]) -> List[Any]:
+        """Send commands as one pipeline and return their replies."""
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._pipeline(commands)
+            except (OSError, RedisError):
+                self.close()
+                raise
+
+    def _pipeline(self, commands: List[List[Any]]) -> List[Any]:
+        assert self._sock is not None
+        self._sock.sendall(b"".join(_encode(command) for command in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        replies: List[Optional[bytes]] = self.execute([["MGET", *keys]])[0]
+        return replies
+
+    def set_many(self, items: Sequence[Tuple[str, bytes, float]]) -> None:
+        if items:
+            self.execute(
+                [["SET", key, value, "PX", max(1, int(ttl * 1000))] for key, value, ttl in items]
+            )
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        if keys:
+            self.execute([["DEL", *keys]])
+
+
+def _encode(command: List[Any]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class SharedCache:
+    """Stores verification records in a shared backend.
+
+    Both verified and "not found" results are shared, each with its own
+    TTL, so no instance repeats a lookup another has already made. Backend
+    failures are logged and treated as misses; the shared tier must never
+    fail a verification.
+    """
+
+    def __init__(
+        self,
+        backend: SharedCacheBackend,
+        ttl: float = 86400.0,
+        negative_ttl: float = 3600.0,
+        prefix: str = "citation-verifier:doi:",
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["SharedCache"]:
+        """Create a shared cache from ``CITATION_SHARED_CACHE_URL``, if set."""
+        url = env_str("CITATION_SHARED_CACHE_URL")
+        if not url:
+            return None
+        backend: SharedCacheBackend
+        if url.startswith("memory://"):
+            backend = InMemoryBackend()
+        elif url.startswith("redis://"):
+            backend = RedisBackend.from_url(
+                url, timeout=env_float("CITATION_SHARED_CACHE_TIMEOUT", 1.0)
+            )
+        else:
+            raise ValueError(f"Unsupported shared cache URL: {url}")
+        return cls(
+            backend,
+            ttl=env_float("CITATION_CACHE_TTL", 86400.0),
+            negative_ttl=env_float("CITATION_CACHE_NEGATIVE_TTL", 3600.0),
+        )
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, VerificationRecord]:
+        """Fetch records for several normalized DOIs in one round trip."""
+        if not keys:
+            return {}
+        try:
+            values = self.backend.get_many([self.prefix + key for key in keys])
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache read failed: {e}")
+            return {}
+
+        found = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            try:
+                found[key] = VerificationRecord.from_row(json.loads(value))
+            except Exception as e:
+                # Corrupt, foreign or old-schema values are misses, not failures
+                self.errors += 1
+                logger.warning(f"Shared cache value for {key} is unreadable: {e}")
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[VerificationRecord]:
+        """Fetch the record for one normalized DOI."""
+        return self.get_many([key]).get(key)
+
+    def set_many(self, records: Dict[str, VerificationRecord]) -> None:
+        """Store records for several normalized DOIs in one round trip."""
+        items = [
+            (
+                self.prefix + key,
+                json.dumps(record.to_row(), separators=(",", ":")).encode(),
+                self.ttl if record.verified else self.negative_ttl,
+            )
+            for key, record in records.items()
+        ]
+        try:
+            self.backend.set_many(items)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache write failed: {e}")
+
+    def set(self, key: str, record: VerificationRecord) -> None:
+        """Store the record for one normalized DOI."""
+        self.set_many({key: record})
+
+    def delete_many(self, keys: Sequence[str]) -> None:
+        """Remove records for several normalized DOIs in one round trip."""
+        try:
+            self.backend.delete_many([self.prefix + key for key in keys])
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache delete failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and error counters."""
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
@@ -0,0 +1,75 @@
+# src/citation_verifier_mcp/similarity.py
+
+"""Fast normalized string similarity for matching citation metadata."""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import List
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional: pip install "citation-verifier-mcp[fast]"
+    fuzz = None
+    process = None
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _NON_WORD.sub(" ", text.lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def similarity(a: str, b: str) -> float:
+    """Return a 0-1 similarity between two strings, ignoring word order and punctuation."""
+    a, b = normalize_text(a), normalize_text(b)
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if fuzz is not None:
+        return float(fuzz.token_sort_ratio(a, b)) / 100.0
+    return SequenceMatcher(None, " ".join(sorted(a.split())), " ".join(sorted(b.split()))).ratio()
+
+
+def similarity_pairs(left: List[str], right: List[str]) -> List[float]:
+    """Score ``left[i]`` against ``right[i]`` for every i in one call.
+
+    With rapidfuzz installed the whole column is scored in a single
+    vectorized ``cpdist`` call; otherwise each pair is scored in turn.
+    """
+    a = [normalize_text(text) for text in left]
+    b = [normalize_text(text) for text in right]
+    if process is not None and hasattr(process, "cpdist") and a:
+        scores = process.cpdist(a, b, scorer=fuzz.token_sort_ratio, workers=-1)
+        return [
+            0.0 if not x or not y else float(score) / 100.0 for x, y, score in zip(a, b, scores)
+        ]
+    return [similarity(x, y) for x, y in zip(a, b)]
+
+
+def surnames(authors: str) -> List[str]:
+    """Extract normalized surnames from an author string such as "T. Smith, J. Doe, et al."."""
+    names = []
+    for author in re.split(r",|;|\band\b|&", authors):
+        author = normalize_text(author)
+        if not author or author == "et al":
+            continue
+        if author.endswith(" et al"):
+            author = author[: -len(" et al")]
+        names.append(author.split()[-1])
+    return names
+
+
+def author_overlap(claimed: str, actual: str) -> float:
+    """Fraction of claimed surnames that appear among the actual authors."""
+    claimed_names = surnames(claimed)
+    if not claimed_names:
+        return 0.0
+    actual_names = set(surnames(actual))
+    return sum(1 for name in claimed_names if name in actual_names) / len(claimed_names)
@@ -0,0 +1,175 @@
+# src/citation_verifier_mcp/streamable_http.py
+
+"""Sessions and resumable event streams for the MCP Streamable HTTP transport.
+
+A client POSTs JSON-RPC messages to one endpoint. The reply is either a
+plain JSON body or a ``text/event-stream`` that carries progress
+notifications followed by the final response. Every streamed event is
+numbered and kept in the session's history. A client that loses the
+connection can GET the endpoint with ``Last-Event-ID`` and receive the rest
+of that stream, including events sent while it was disconnected.
+"""
+
+import asyncio
+import json
+import secrets
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+from .cancellation import CallRegistry
+from .config import env_float, env_int
+
+SESSION_HEADER = "Mcp-Session-Id"
+
+PROTOCOL_VERSION = "2025-03-26"
+
+
+@dataclass(frozen=True, slots=True)
+class StreamEvent:
+    """One SSE event; ``final`` marks the last event of its stream."""
+
+    id: int
+    stream: str
+    data: str
+    final: bool = False
+
+    def encode(self) -> str:
+        return f"id: {self.id}\nevent: message\ndata: {self.data}\n\n"
+
+
+class Session:
+    """State of one Streamable HTTP session: its recent stream events and running calls."""
+
+    def __init__(self, session_id: str, max_events: int = 1000) -> None:
+        self.id = session_id
+        self.last_seen = time.monotonic()
+        self.events: Deque[StreamEvent] = deque(maxlen=max_events)
+        self._next_id = 0
+        self._changed = asyncio.Event()
+        # Streams that may still get events; a stream leaves on its final event or end_stream
+        self._open: Set[str] = set()
+        self.calls = CallRegistry()
+
+    def open_stream(self) -> str:
+        """Allocate an id for a new response stream."""
+        stream = secrets.token_hex(8)
+        self._open.add(stream)
+        return stream
+
+    def end_stream(self, stream: str) -> None:
+        """Mark a stream as finished, with or without a final event, and wake its readers."""
+        self._open.discard(stream)
+        self._wake()
+
+    def close(self) -> None:
+        """End every stream and cancel the session's running calls."""
+        self._open.clear()
+        self.calls.cancel_all()
+        self._wake()
+
+    def publish(self, stream: str, message: Dict[str, Any], final: bool = False) -> StreamEvent:
+        """Append a message to a stream and wake its readers."""
+        self._next_id += 1
+        event = StreamEvent(self._next_id, stream, json.dumps(message), final)
+        self.events.append(event)
+        if final:
+            self._open.discard(stream)
+        self._wake()
+        return event
+
+    def _wake(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def find(self, event_id: int) -> Optional[StreamEvent]:
+        """Return a still-buffered event by id."""
+        for event in self.events:
+            if event.id == event_id:
+                return event
+        return None
+
+    async def follow(self, stream: str, after: int = 0) -> AsyncIterator[StreamEvent]:
+        """Yield a stream's events after ``after``, waiting for new ones until the stream ends.
+
+        Returns straight away if ``after`` is at or past the final event, and
+        once the stream ends without one (its call failed or the session closed).
+        """
+        cursor = after
+        while True:
+            changed = self._changed
+            # Checked before the scan, so events published before the end are still sent
+            ended = stream not in self._open
+            for event in list(self.events):
+                if event.id > cursor and event.stream == stream:
+                    cursor = event.id
+                    yield event
+                    if event.final:
+                        return
+            if ended:
+                return
+            await changed.wait()
+
+
+class SessionStore:
+    """Live sessions, expired after ``ttl`` seconds idle and capped at ``max_sessions``."""
+
+    def __init__(
+        self, ttl: float = 3600.0, max_sessions: int = 10000, max_events: int = 1000
+    ) -> None:
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_events = max_events
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "SessionStore":
+        """Create a store configured from ``CITATION_SESSION_*`` variables."""
+        return cls(
+            ttl=env_float("CITATION_SESSION_TTL", 3600.0),
+            max_sessions=env_int("CITATION_SESSION_LIMIT", 10000),
+            max_events=env_int("CITATION_SESSION_EVENTS", 1000),
+        )
+
+    def create(self) -> Session:
+        """Start a new session, evicting expired or least recently used ones."""
+        self._prune()
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)[1].close()
+        session = Session(secrets.token_urlsafe(24), self.max_events)
+        self._sessions[session.id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Return a live session and mark it as used."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if time.monotonic() - session.last_seen > self.ttl:
+            del self._sessions[session_id]
+            session.close()
+            return None
+        session.last_seen = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def close(self, session_id: str) -> bool:
+        """End a session, cancelling its running calls; False if it didn't exist."""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_seen > cutoff:
+                break
+            self._sessions.popitem(last=False)
+            oldest.close()
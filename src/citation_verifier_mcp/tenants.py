@@ -0,0 +1,174 @@
+# src/citation_verifier_mcp/tenants.py
+
+"""API client (tenant) identification and request quotas.
+
+Tenants are configured in a JSON file named by ``CITATION_TENANTS`` that
+maps API keys to settings::
+
+    {"k3y...": {"name": "audit-bot", "weight": 1, "quota": 20000},
+     "s3cr...": {"name": "chat", "weight": 4}}
+
+``weight`` is the tenant's share of upstream capacity (see
+:class:`~.scheduling.FairScheduler`) and ``quota`` the number of tool calls
+allowed per quota window (0 means unlimited). Requests without a known key
+run as the ``anonymous`` tenant, unless ``CITATION_REQUIRE_API_KEY`` is set.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+from . import metrics
+from .config import env_bool, env_float, env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+API_KEY_HEADER = "x-api-key"
+
+# WebSocket clients can't set headers from browsers, so the key may be offered
+# as a subprotocol instead: Sec-WebSocket-Protocol: mcp, apikey.<key>
+API_KEY_SUBPROTOCOL = "apikey."
+
+QUOTA_EXCEEDED = -32029
+
+tool_calls = metrics.counter(
+    "citation_tenant_tool_calls_total", "Tool calls accepted per tenant", ("tenant",)
+)
+quota_rejections = metrics.counter(
+    "citation_tenant_quota_rejections_total",
+    "Tool calls rejected because the tenant's quota was used up",
+    ("tenant",),
+)
+quota_used = metrics.gauge(
+    "citation_tenant_quota_used", "Tool calls counted in the current quota window", ("tenant",)
+)
+quota_limit = metrics.gauge(
+    "citation_tenant_quota_limit",
+    "Tool calls allowed per quota window (0 = unlimited)",
+    ("tenant",),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Tenant:
+    """An API client and its share of the service."""
+
+    name: str
+    weight: float = 1.0
+    quota: int = 0
+
+
+ANONYMOUS = Tenant("anonymous")
+
+_current_tenant: ContextVar[Tenant] = ContextVar("citation_current_tenant", default=ANONYMOUS)
+
+
+def current_tenant() -> Tenant:
+    """The tenant whose request is being handled."""
+    return _current_tenant.get()
+
+
+@contextmanager
+def tenant_context(tenant: Tenant) -> Iterator[None]:
+    """Run the block (and tasks and threads it starts) on behalf of ``tenant``."""
+    token = _current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+class QuotaExceededError(Exception):
+    """Raised when a tenant has used up its quota."""
+
+
+def subprotocol_key(subprotocols: Any) -> Optional[str]:
+    """Find an API key offered as an ``apikey.<key>`` WebSocket subprotocol."""
+    for protocol in subprotocols or []:
+        if protocol.startswith(API_KEY_SUBPROTOCOL):
+            return str(protocol[len(API_KEY_SUBPROTOCOL) :])
+    return None
+
+
+class TenantRegistry:
+    """Maps API keys to tenants and enforces per-tenant quotas over a fixed window."""
+
+    def __init__(
+        self,
+        tenants: Dict[str, Tenant],
+        anonymous: Tenant = ANONYMOUS,
+        window: float = 3600.0,
+        require_key: bool = False,
+    ) -> None:
+        self.tenants = tenants
+        self.anonymous = anonymous
+        self.window = window
+        self.require_key = require_key
+        self._windows: Dict[str, float] = {}
+        self._used: Dict[str, int] = {}
+        for tenant in [anonymous, *tenants.values()]:
+            quota_limit.set(tenant.quota, tenant=tenant.name)
+
+    @classmethod
+    def from_env(cls) -> Optional["TenantRegistry"]:
+        """Load tenants from the ``CITATION_TENANTS`` file; None when it isn't set."""
+        path = env_str("CITATION_TENANTS")
+        if not path:
+            return None
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        tenants = {
+            key: Tenant(
+                settings.get("name", f"tenant-{index}"),
+                float(settings.get("weight", 1.0)),
+                int(settings.get("quota", 0)),
+            )
+            for index, (key, settings) in enumerate(config.items())
+        }
+        anonymous = Tenant(
+            "anonymous",
+            env_float("CITATION_ANONYMOUS_WEIGHT", 1.0),
+            env_int("CITATION_ANONYMOUS_QUOTA", 0),
+        )
+        logger.info(f"Loaded {len(tenants)} tenants from {path}")
+        return cls(
+            tenants,
+            anonymous=anonymous,
+            window=env_float("CITATION_QUOTA_WINDOW", 3600.0),
+            require_key=env_bool("CITATION_REQUIRE_API_KEY", False),
+        )
+
+    def identify(self, api_key: Optional[str]) -> Optional[Tenant]:
+        """Return the tenant for an API key; None if the key is required but unknown."""
+        tenant = self.tenants.get(api_key) if api_key else None
+        if tenant is None and self.require_key:
+            return None
+        return tenant or self.anonymous
+
+    def consume(self, tenant: Tenant) -> None:
+        """Count one tool call, raising :class:`QuotaExceededError` if it isn't allowed."""
+        now = time.monotonic()
+        started = self._windows.get(tenant.name)
+        if started is None or now - started >= self.window:
+            self._windows[tenant.name] = now
+            self._used[tenant.name] = 0
+        used = self._used.get(tenant.name, 0)
+        if tenant.quota and used >= tenant.quota:
+            quota_rejections.inc(tenant=tenant.name)
+            raise QuotaExceededError(
+                f"Quota of {tenant.quota} tool calls per {self.window:g}s exceeded"
+            )
+        self._used[tenant.name] = used + 1
+        quota_used.set(used + 1, tenant=tenant.name)
+        tool_calls.inc(tenant=tenant.name)
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """Tool calls used and allowed in the current window, per tenant."""
+        return {
+            tenant.name: {"used": self._used.get(tenant.name, 0), "quota": tenant.quota}
+            for tenant in [self.anonymous, *self.tenants.values()]
+        }
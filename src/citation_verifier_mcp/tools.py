@@ -0,0 +1,161 @@
+# src/citation_verifier_mcp/tools.py
+
+"""MCP tool definitions and helpers shared by the stdio and remote servers."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from .cancellation import time_left
+from .config import env_bool, env_float
+from .search import CitationSearcher, format_search_results
+
+logger = logging.getLogger(__name__)
+
+VERIFY_CITATION_TOOL: Dict[str, Any] = {
+    "name": "verify_citation",
+    "description": "Verify a DOI citation against Crossref, falling back to DataCite and doi.org for DOIs Crossref doesn't know. Detects potentially hallucinated citations by checking if DOIs exist and retrieving bibliographic metadata.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "doi": {
+                "type": "string",
+                "description": "The DOI to verify (e.g., '10.1038/nature12373'). Can include URL prefixes which will be automatically stripped.",
+            },
+            "title": {
+                "type": "string",
+                "description": "Optional claimed title. If the DOI can't be verified, works matching this title are suggested.",
+            },
+            "authors": {
+                "type": "string",
+                "description": "Optional claimed authors, used to rank suggestions (e.g., 'Takekoshi, Reichsöllner').",
+            },
+            "year": {
+                "type": "string",
+                "description": "Optional claimed publication year, used to rank suggestions.",
+            },
+        },
+        "required": ["doi"],
+    },
+}
+
+SEARCH_CITATION_TOOL: Dict[str, Any] = {
+    "name": "search_citation",
+    "description": "Search Crossref for works matching a citation's title, authors and year. Use this to find the correct DOI when a DOI fails verification or is missing.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": "The title of the cited work."},
+            "authors": {
+                "type": "string",
+                "description": "Author names, comma-separated (e.g., 'Takekoshi, Reichsöllner').",
+            },
+            "year": {"type": "string", "description": "Publication year (e.g., '2014')."},
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of candidates to return (default 5).",
+            },
+        },
+        "required": ["title"],
+    },
+}
+
+CHECK_CITATIONS_TOOL: Dict[str, Any] = {
+    "name": "check_citations",
+    "description": "Check a batch of citations for metadata consistency: verifies each DOI and compares the claimed title, authors, year and journal with the DOI's Crossref record. Detects real DOIs cited with the wrong paper details.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "citations": {
+                "type": "array",
+                "description": "Citations to check. Only 'doi' is required; each claimed field given is compared.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "doi": {"type": "string"},
+                        "title": {"type": "string"},
+                        "authors": {"type": "string"},
+                        "year": {"type": "string"},
+                        "journal": {"type": "string"},
+                    },
+                    "required": ["doi"],
+                },
+            }
+        },
+        "required": ["citations"],
+    },
+}
+
+VERIFY_BIBLIOGRAPHY_TOOL: Dict[str, Any] = {
+    "name": "verify_bibliography",
+    "description": "Verify every entry of a bibliography file (BibTeX, RIS or CSL-JSON). DOIs are verified and the entry's title, authors, year and journal compared with the DOI's record; entries without a DOI are searched by title. Returns a per-entry report.",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "bibliography": {
+                "type": "string",
+                "description": "The bibliography document, e.g. the contents of a .bib, .ris or CSL-JSON file.",
+            },
+            "format": {
+                "type": "string",
+                "enum": ["bibtex", "ris", "csl-json"],
+                "description": "Format of the document. Detected from its contents when omitted.",
+            },
+        },
+        "required": ["bibliography"],
+    },
+}
+
+TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    VERIFY_CITATION_TOOL,
+    SEARCH_CITATION_TOOL,
+    CHECK_CITATIONS_TOOL,
+    VERIFY_BIBLIOGRAPHY_TOOL,
+]
+
+TOOL_NAMES = {tool["name"] for tool in TOOL_DEFINITIONS}
+
+
+async def run_search_tool(searcher: CitationSearcher, arguments: Dict[str, Any]) -> str:
+    """Run the ``search_citation`` tool and format its result."""
+    candidates = await searcher.search(
+        arguments["title"],
+        authors=arguments.get("authors", ""),
+        year=str(arguments.get("year", "")),
+        limit=int(arguments.get("limit", 5)),
+    )
+    return format_search_results(candidates)
+
+
+async def suggest_alternatives(searcher: CitationSearcher, arguments: Dict[str, Any]) -> str:
+    """Search for the claimed title after a failed verification, within a time budget.
+
+    Returns Markdown to append to the verification result, or an empty
+    string if fallback search is disabled, no title was given, or nothing
+    was found in time.
+    """
+    if not arguments.get("title") or not env_bool("CITATION_FALLBACK_SEARCH", True):
+        return ""
+
+    # Never let the fallback push the call past its deadline
+    budget = time_left(env_float("CITATION_FALLBACK_BUDGET", 3.0))
+    try:
+        candidates = await asyncio.wait_for(
+            searcher.search(
+                arguments["title"],
+                authors=arguments.get("authors", ""),
+                year=str(arguments.get("year", "")),
+                limit=3,
+            ),
+            timeout=budget,
+        )
+    except asyncio.TimeoutError:
+        logger.info(f"Fallback search exceeded its {budget}s budget")
+        return ""
+    except Exception as e:
+        logger.warning(f"Fallback search failed: {e}")
+        return ""
+
+    if not candidates:
+        return ""
+    return "\n\n" + format_search_results(candidates, heading="## 🔎 Possible Matches")
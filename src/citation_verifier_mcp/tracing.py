@@ -0,0 +1,271 @@
+# src/citation_verifier_mcp/tracing.py
+
+"""Request tracing with OpenTelemetry-compatible spans.
+
+Spans carry W3C trace context ids, so a caller can pass a ``traceparent`` in
+an MCP request's ``_meta`` and see our spans under its own trace. Finished
+spans are written as JSON lines using OTLP field names (``traceId``,
+``spanId``, ``parentSpanId``, ``startTimeUnixNano``...).
+
+Tracing is off unless ``CITATION_TRACING`` is set to ``console`` (stderr) or
+``file`` (``CITATION_TRACE_FILE``). When off, :func:`span` does no work
+beyond returning a shared no-op span, except inside :func:`collect`.
+"""
+
+import json
+import logging
+import re
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Protocol, TextIO, Union
+
+from .config import env_str
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    """Identifies a span within a trace."""
+
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        """Format as a W3C ``traceparent`` header value."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("name", "context", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str],
+        start_ns: int,
+        attributes: Dict[str, Any],
+    ) -> None:
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with OTLP field names."""
+        return {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class NoopSpan:
+    """Stand-in returned by :func:`span` when tracing is off."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class StreamExporter:
+    """Writes finished spans as JSON lines to a text stream."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class FileExporter(StreamExporter):
+    """Appends finished spans as JSON lines to a file."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(open(path, "a", encoding="utf-8"))
+
+
+# Active exporter; None means tracing is off
+_exporter: Optional[SpanExporter] = None
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("citation_current_span", default=None)
+
+# Spans finished under collect(), gathered even when no exporter is configured
+_collected: ContextVar[Optional[List[Span]]] = ContextVar("citation_collected", default=None)
+
+
+def configure(exporter: Optional[SpanExporter]) -> None:
+    """Set the span exporter, or turn tracing off with None."""
+    global _exporter
+    _exporter = exporter
+
+
+def configure_from_env() -> None:
+    """Configure tracing from ``CITATION_TRACING`` and ``CITATION_TRACE_FILE``.
+
+    Console output goes to stderr because stdout carries the stdio protocol.
+    """
+    mode = env_str("CITATION_TRACING", "off")
+    if mode == "console":
+        configure(StreamExporter(sys.stderr))
+    elif mode == "file":
+        configure(FileExporter(env_str("CITATION_TRACE_FILE", "traces.jsonl") or "traces.jsonl"))
+    else:
+        configure(None)
+
+
+def parse_traceparent(value: Any) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` value; None if it is missing or malformed."""
+    if not isinstance(value, str):
+        return None
+    match = TRACEPARENT_RE.match(value.strip().lower())
+    if not match or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return SpanContext(match.group(1), match.group(2))
+
+
+def extract_context(meta: Any) -> Optional[SpanContext]:
+    """Read the trace context from an MCP request's ``_meta``.
+
+    Accepts the raw ``_meta`` dict or the ``RequestParams.Meta`` model that
+    the MCP library exposes.
+    """
+    if meta is None or _exporter is None:
+        return None
+    if isinstance(meta, dict):
+        return parse_traceparent(meta.get("traceparent"))
+    return parse_traceparent(getattr(meta, "traceparent", None))
+
+
+def current_context() -> Optional[SpanContext]:
+    """Context of the active span, if any."""
+    current = _current_span.get()
+    return current.context if current else None
+
+
+def _start(
+    name: str,
+    attributes: Optional[Dict[str, Any]],
+    parent: Optional[SpanContext],
+    start_ns: Optional[int],
+) -> Span:
+    if parent is None:
+        parent = current_context()
+    context = SpanContext(
+        parent.trace_id if parent else secrets.token_hex(16), secrets.token_hex(8)
+    )
+    return Span(
+        name,
+        context,
+        parent.span_id if parent else None,
+        start_ns or time.time_ns(),
+        dict(attributes) if attributes else {},
+    )
+
+
+def _export(finished: Span) -> None:
+    collected = _collected.get()
+    if collected is not None:
+        collected.append(finished)
+    exporter = _exporter
+    if exporter is None:
+        return
+    try:
+        exporter.export(finished)
+    except Exception as e:
+        logger.warning(f"Failed to export span {finished.name}: {e}")
+
+
+@contextmanager
+def span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    parent: Optional[SpanContext] = None,
+    start_ns: Optional[int] = None,
+) -> Iterator[Union[Span, NoopSpan]]:
+    """Time a block as a span, a child of ``parent`` or of the active span.
+
+    Context is carried by a context variable, so spans started in tasks and
+    in ``asyncio.to_thread`` workers nest under the span that spawned them.
+    """
+    if _exporter is None and _collected.get() is None:
+        yield NOOP_SPAN
+        return
+
+    current = _start(name, attributes, parent, start_ns)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        _export(current)
+
+
+def record_span(
+    name: str, start_ns: int, end_ns: int, attributes: Optional[Dict[str, Any]] = None
+) -> None:
+    """Export an already-finished span as a child of the active span."""
+    if _exporter is None and _collected.get() is None:
+        return
+    finished = _start(name, attributes, None, start_ns)
+    finished.end_ns = end_ns
+    _export(finished)
+
+
+@contextmanager
+def collect() -> Iterator[List[Span]]:
+    """Gather the spans finished inside the block, including in its tasks and threads.
+
+    Works whether or not an exporter is configured.
+    """
+    collected: List[Span] = []
+    token = _collected.set(collected)
+    try:
+        yield collected
+    finally:
+        _collected.reset(token)
+
+
+configure_from_env()
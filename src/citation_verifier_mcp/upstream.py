@@ -0,0 +1,363 @@
+# src/citation_verifier_mcp/upstream.py
+
+"""Pooled, pre-warmed HTTP connections to upstream APIs.
+
+The verifier library calls ``requests.get`` for every lookup, so each one
+opens a new connection with its own DNS lookup and full TLS handshake.
+:class:`UpstreamPool` routes the library through one pooled session
+instead, and takes the remaining first-request costs off the request path:
+
+- DNS answers are cached for ``CITATION_DNS_TTL`` seconds;
+- ``CITATION_UPSTREAM_PREWARM`` connections to Crossref are opened at
+  startup, and ``/ready`` waits for them;
+- the last TLS session with each host is kept, so new connections resume
+  it instead of repeating the full handshake.
+
+Pool sizes, idle connections, handshakes and warm-up status are exported
+as metrics.
+"""
+
+import logging
+import socket
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.ssl_ import is_ipaddress
+
+from . import metrics
+from .config import env_float, env_int
+from .crossref import CROSSREF_API
+
+logger = logging.getLogger(__name__)
+
+dns_lookups = metrics.counter(
+    "citation_upstream_dns_lookups_total", "Upstream host name lookups", ("result",)
+)
+tls_handshakes = metrics.counter(
+    "citation_upstream_tls_handshakes_total",
+    "TLS handshakes with upstream hosts, by whether a session was resumed",
+    ("resumed",),
+)
+
+
+class DnsCache:
+    """Caches ``getaddrinfo`` answers for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 60.0) -> None:
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses for a host, from the cache while fresh; raises ``socket.gaierror``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry is not None and entry[0] > now:
+            dns_lookups.inc(result="hit")
+            return entry[1]
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (now + self.ttl, addresses)
+        dns_lookups.inc(result="miss")
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class SessionReuseContext(ssl.SSLContext):
+    """Client TLS context that resumes the last session with each host.
+
+    The session is read from the most recent live connection to the host,
+    since TLS 1.3 tickets only arrive after the handshake.
+    """
+
+    def __new__(cls) -> "SessionReuseContext":
+        return super().__new__(cls, ssl.PROTOCOL_TLS_CLIENT)
+
+    def __init__(self) -> None:
+        self.minimum_version = ssl.TLSVersion.TLSv1_2
+        self.options |= ssl.OP_NO_COMPRESSION
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        self._latest: Dict[str, "weakref.ref[ssl.SSLSocket]"] = {}
+        self._session_lock = threading.Lock()
+
+    def wrap_socket(  # type: ignore[override]
+        self,
+        sock: socket.socket,
+        server_side: bool = False,
+        do_handshake_on_connect: bool = True,
+        suppress_ragged_eofs: bool = True,
+        server_hostname: Optional[str] = None,
+        session: Optional[ssl.SSLSession] = None,
+    ) -> ssl.SSLSocket:
+        if session is None and server_hostname and not server_side:
+            session = self._session_for(server_hostname)
+        wrapped = super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+        if server_hostname and not server_side:
+            with self._session_lock:
+                self._latest[server_hostname] = weakref.ref(wrapped)
+            tls_handshakes.inc(resumed="true" if wrapped.session_reused else "false")
+        return wrapped
+
+    def _session_for(self, host: str) -> Optional[ssl.SSLSession]:
+        with self._session_lock:
+            ref = self._latest.get(host)
+            latest = ref() if ref is not None else None
+            session = latest.session if latest is not None else None
+            if session is not None:
+                self._sessions[host] = session
+            return self._sessions.get(host)
+
+
+class _CachedDnsConnection(HTTPConnection):
+    """Connection that resolves its host through a :class:`DnsCache`."""
+
+    dns_cache: Optional[DnsCache] = None
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        if self.dns_cache is None or is_ipaddress(host):
+            return super()._new_conn()
+        try:
+            addresses = self.dns_cache.resolve(host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        error: Optional[Exception] = None
+        for address in addresses:
+            # Only the TCP connect uses the address; TLS still checks the host name
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (ConnectTimeoutError, NewConnectionError) as e:
+                error = e
+            finally:
+                self._dns_host = host
+        # Every cached address failed, so look the name up afresh next time
+        self.dns_cache.forget(host, self.port)
+        assert error is not None
+        raise error
+
+
+class _CachedDnsHTTPSConnection(_CachedDnsConnection, HTTPSConnection):
+    pass
+
+
+class UpstreamAdapter(HTTPAdapter):
+    """Transport adapter whose connections share a DNS cache and TLS context."""
+
+    def __init__(
+        self, dns_cache: Optional[DnsCache], ssl_context: ssl.SSLContext, pool_size: int
+    ) -> None:
+        self.dns_cache = dns_cache
+        self.ssl_context = ssl_context
+        self._loaded: Set[str] = set()
+        self._lock = threading.Lock()
+        super().__init__(pool_maxsize=pool_size)
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        super().init_poolmanager(
+            connections, maxsize, block, ssl_context=self.ssl_context, **pool_kwargs
+        )
+        # Pool and connection classes bound to this adapter's DNS cache
+        cache = {"dns_cache": self.dns_cache}
+        http = type("UpstreamHTTPConnection", (_CachedDnsConnection,), cache)
+        https = type("UpstreamHTTPSConnection", (_CachedDnsHTTPSConnection,), cache)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "UpstreamHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http}
+            ),
+            "https": type(
+                "UpstreamHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https}
+            ),
+        }
+
+    def cert_verify(self, conn: Any, url: str, verify: Any, cert: Any) -> None:
+        super().cert_verify(conn, url, verify, cert)
+        # urllib3 would load the CA bundle into the shared context on every new
+        # connection; load each one once instead
+        for name in ("ca_certs", "ca_cert_dir"):
+            location = getattr(conn, name, None)
+            if not location:
+                continue
+            with self._lock:
+                if location not in self._loaded:
+                    if name == "ca_certs":
+                        self.ssl_context.load_verify_locations(cafile=location)
+                    else:
+                        self.ssl_context.load_verify_locations(capath=location)
+                    self._loaded.add(location)
+            setattr(conn, name, None)
+
+    def pool_for(self, url: str, verify: Any = True) -> HTTPConnectionPool:
+        """The connection pool that requests to ``url`` with ``verify`` use."""
+        request = requests.Request("GET", url).prepare()
+        pool = self.get_connection_with_tls_context(request, verify=verify)
+        self.cert_verify(pool, url, verify, None)
+        return pool
+
+
+class _SessionRequests:
+    """Stands in for the ``requests`` module inside the verifier library."""
+
+    RequestException = requests.RequestException
+
+    def __init__(self, session: requests.Session) -> None:
+        self.session = session
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+
+class UpstreamPool:
+    """One pooled session for upstream calls, warmed up before traffic arrives.
+
+    At most ``pool_size`` idle connections are kept per host.
+    :meth:`prewarm` opens ``prewarm_connections`` of them to
+    ``prewarm_url``; until it has run, :attr:`warm` is False.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 16,
+        dns_ttl: float = 60.0,
+        prewarm_connections: int = 0,
+        prewarm_url: str = CROSSREF_API,
+    ) -> None:
+        self.pool_size = pool_size
+        self.prewarm_connections = min(prewarm_connections, pool_size)
+        self.prewarm_url = prewarm_url
+        self.dns_cache = DnsCache(dns_ttl) if dns_ttl > 0 else None
+        self.adapter = UpstreamAdapter(self.dns_cache, SessionReuseContext(), pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.warm = self.prewarm_connections == 0
+        self.prewarmed = 0
+        metrics.register_collector(self._collect)
+
+    @classmethod
+    def from_env(cls) -> "UpstreamPool":
+        """Create a pool configured from ``CITATION_UPSTREAM_POOL_SIZE`` and friends."""
+        return cls(
+            pool_size=env_int("CITATION_UPSTREAM_POOL_SIZE", 16),
+            dns_ttl=env_float("CITATION_DNS_TTL", 60.0),
+            prewarm_connections=env_int("CITATION_UPSTREAM_PREWARM", 0),
+        )
+
+    def install(self) -> None:
+        """Send the verifier library's requests through this pool."""
+        import llm_citation_verifier.verifier as library
+
+        setattr(library, "requests", _SessionRequests(self.session))
+
+    def prewarm(self) -> int:
+        """Open connections to ``prewarm_url`` and leave them idle in the pool.
+
+        Blocking; run it in a worker thread. Returns how many were opened.
+        """
+        if self.prewarm_connections <= 0:
+            return 0
+        started = time.monotonic()
+        # The same pool requests will use, which depends on e.g. REQUESTS_CA_BUNDLE
+        settings = self.session.merge_environment_settings(self.prewarm_url, {}, None, None, None)
+        pool = self.adapter.pool_for(self.prewarm_url, settings["verify"])
+        connections = [pool._get_conn() for _ in range(self.prewarm_connections)]
+
+        def connect(connection: Any) -> Any:
+            try:
+                if not connection.is_connected:
+                    connection.connect()
+                return connection
+            except Exception as e:
+                logger.warning(f"Failed to pre-open a connection to {self.prewarm_url}: {e}")
+                connection.close()
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+            opened = list(executor.map(connect, connections))
+        for connection in opened:
+            # A failed connection gives its slot back as None, as urllib3 does itself
+            pool._put_conn(connection)
+
+        self.prewarmed = sum(connection is not None for connection in opened)
+        self.warm = True
+        logger.info(
+            f"Opened {self.prewarmed} upstream connections to {self.prewarm_url} "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return self.prewarmed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "warm": self.warm,
+            "prewarmed": self.prewarmed,
+            "hosts": {host: counts for host, counts in self._pools()},
+        }
+
+    def close(self) -> None:
+        metrics.unregister_collector(self._collect)
+        self.session.close()
+
+    def _pools(self) -> Iterable[Tuple[str, Dict[str, int]]]:
+        """Idle and opened connections per host, over all of the host's pools."""
+        manager = self.adapter.poolmanager
+        hosts: Dict[str, Dict[str, int]] = {}
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            queued = list(pool.pool.queue) if pool.pool is not None else []
+            counts = hosts.setdefault(f"{pool.scheme}://{pool.host}", {"idle": 0, "opened": 0})
+            counts["idle"] += sum(c is not None and c.is_connected for c in queued)
+            counts["opened"] += pool.num_connections
+        return hosts.items()
+
+    def _collect(self) -> Iterable[metrics.MetricFamily]:
+        pools = list(self._pools())
+        yield (
+            "citation_upstream_pool_size",
+            "gauge",
+            "Most idle connections kept per upstream host",
+            [({}, self.pool_size)],
+        )
+        yield (
+            "citation_upstream_pool_idle_connections",
+            "gauge",
+            "Open upstream connections waiting in the pool",
+            [({"host": host}, counts["idle"]) for host, counts in pools],
+        )
+        yield (
+            "citation_upstream_connections_opened_total",
+            "counter",
+            "Upstream connections opened",
+            [({"host": host}, counts["opened"]) for host, counts in pools],
+        )
+        yield (
+            "citation_upstream_pool_warm",
+            "gauge",
+            "1 once the startup connections to upstream are open",
+            [({}, 1 if self.warm else 0)],
+        )
@@ -0,0 +1,254 @@
+# src/citation_verifier_mcp/verification.py
+
+"""Cached, single-flight front end for ``CitationVerifier.verify_doi``."""
+
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Dict, List, Optional, Tuple
+
+from .breaker import CircuitBreaker
+from .cache import VerificationCache, is_cacheable, normalize_doi, strip_doi
+from .doi_batch import normalize_dois
+from .progress import report_progress
+from .recording import TrafficRecorder
+from .records import Status, VerificationRecord
+from .registries import RegistryResolver, verify_with_crossref
+from .scheduling import FairScheduler
+from .shared_cache import SharedCache
+from .tenants import current_tenant
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class VerificationService:
+    """Runs DOI lookups off the event loop and shares results between callers.
+
+    ``CitationVerifier.verify_doi`` makes a blocking HTTP request, so it is
+    executed in a worker thread. Concurrent requests for the same DOI share
+    a single upstream lookup, and definitive results are kept in the cache.
+    With a ``resolver``, Crossref misses are retried against other DOI
+    registries. Upstream dicts are converted to compact
+    :class:`VerificationRecord` objects, which is what callers receive.
+
+    With a ``shared`` cache, in-process misses are looked up there before
+    going upstream, and upstream results are written back for other
+    instances. With a ``scheduler``, upstream lookups wait for a slot
+    allotted fairly between tenants, and report their round trip to its
+    adaptive limit. With a ``breaker``, lookups fail fast while upstream
+    keeps failing. With a ``recorder``, each upstream outcome is recorded
+    for offline replay.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[VerificationCache] = None,
+        resolver: Optional[RegistryResolver] = None,
+        shared: Optional[SharedCache] = None,
+        scheduler: Optional[FairScheduler] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        recorder: Optional[TrafficRecorder] = None,
+    ) -> None:
+        self.cache = cache if cache is not None else VerificationCache.from_env()
+        self.resolver = resolver
+        self.shared = shared
+        self.scheduler = scheduler
+        self.breaker = breaker
+        self.recorder = recorder
+        self._inflight: Dict[str, "asyncio.Task[VerificationRecord]"] = {}
+        self._waiters: Dict["asyncio.Task[VerificationRecord]", int] = {}
+
+    @property
+    def inflight(self) -> int:
+        """Number of upstream lookups currently running."""
+        return len(self._inflight)
+
+    async def verify(self, verifier: Any, doi: str) -> VerificationRecord:
+        """Verify a DOI, serving from the cache when possible."""
+        key = normalize_doi(doi)
+        with span("cache.lookup", {"doi": key}) as lookup:
+            cached = self.cache.get(key)
+            lookup.set_attribute("cache.hit", cached is not None)
+        if cached is not None:
+            return cached
+        return await self._shared_lookup(verifier, key, doi)
+
+    async def verify_many(
+        self, verifier: Any, dois: List[str], concurrency: int = 8
+    ) -> List[VerificationRecord]:
+        """Verify several DOIs concurrently, returning results in input order.
+
+        See :meth:`verify_stream`; repeated DOIs share one result object.
+        """
+        return [record async for _, record in self.verify_stream(verifier, dois, concurrency)]
+
+    async def verify_stream(
+        self,
+        verifier: Any,
+        dois: List[str],
+        concurrency: int = 8,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, VerificationRecord]]:
+        """Verify several DOIs, yielding ``(index, record)`` in input order.
+
+        DOIs are deduplicated by normalized key before dispatch: each unique
+        DOI is looked up once and the same record is yielded for every
+        occurrence, so upstream calls and memory scale with unique DOIs.
+        Lookups run at most ``concurrency`` at a time and at most ``window``
+        unique DOIs (default ``4 * concurrency``) are started ahead of the
+        one being yielded, which bounds the reordering buffer.
+
+        Failures are reported as unverified results rather than raised, so one
+        bad DOI doesn't sink the batch. DOIs that aren't DOIs at all (see
+        :func:`~.doi_batch.normalize_dois`) are reported as not found without
+        a lookup. DOIs missing from the in-process cache are fetched from the
+        shared cache in one pipelined request.
+        """
+        batch = normalize_dois(dois)
+        keys = batch.keys
+        await self._prefetch([key for key, first in zip(keys, batch.first) if first])
+        window = window or 4 * concurrency
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def verify_one(doi: str) -> VerificationRecord:
+            async with semaphore:
+                try:
+                    return await self.verify(verifier, doi)
+                except Exception as e:
+                    return VerificationRecord(Status.ERROR, strip_doi(doi), error=str(e))
+
+        results: Dict[str, VerificationRecord] = {
+            key: VerificationRecord(Status.NOT_FOUND, strip_doi(doi), error="Not a valid DOI")
+            for doi, key, valid in zip(dois, keys, batch.valid)
+            if not valid
+        }
+        pending: Dict[str, "asyncio.Task[VerificationRecord]"] = {}
+        ahead = 0
+        try:
+            for index, key in enumerate(keys):
+                # Keys before `ahead` are started or done, so `key` always is after this
+                while ahead < len(keys) and len(pending) < window:
+                    next_key = keys[ahead]
+                    if next_key not in results and next_key not in pending:
+                        pending[next_key] = asyncio.create_task(verify_one(dois[ahead]))
+                    ahead += 1
+                if key not in results:
+                    results[key] = await pending.pop(key)
+                report_progress(index + 1, len(keys), f"Verified {index + 1} of {len(keys)} DOIs")
+                yield index, results[key]
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+    async def refresh(self, verifier: Any, doi: str) -> VerificationRecord:
+        """Re-fetch a DOI from upstream even if it is cached.
+
+        The existing entry is only replaced by a definitive result, so a
+        failed refresh keeps serving the old value until it expires.
+        """
+        return await self._shared_lookup(verifier, normalize_doi(doi), doi, use_shared=False)
+
+    async def _prefetch(self, keys: List[str]) -> None:
+        """Copy shared-cache entries for keys missing locally into the local cache."""
+        if self.shared is None:
+            return
+        missing = [key for key in dict.fromkeys(keys) if key not in self.cache]
+        if not missing:
+            return
+        found = await asyncio.to_thread(self.shared.get_many, missing)
+        for key, record in found.items():
+            self.cache.set(key, record, origin="shared")
+
+    async def _shared_lookup(
+        self, verifier: Any, key: str, doi: str, use_shared: bool = True
+    ) -> VerificationRecord:
+        """Join the in-flight lookup for a key, starting one if there is none.
+
+        The lookup is shielded so one caller going away doesn't cancel it
+        for the others, but when the last caller is cancelled the lookup is
+        cancelled too, giving its upstream slot back.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._lookup(verifier, key, strip_doi(doi), use_shared=use_shared)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                logger.debug(f"Cancelling lookup of {key}: no callers left")
+                self._forget(key, task)
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key: str, task: "asyncio.Task[VerificationRecord]") -> None:
+        """Stop sharing ``task`` for ``key``, unless a newer lookup replaced it."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _upstream_slot(self) -> AsyncContextManager[Any]:
+        """Wait for the current tenant's turn upstream, if a scheduler is set."""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(current_tenant())
+
+    async def _fetch(self, verifier: Any, doi: str) -> Dict[str, Any]:
+        if self.resolver is not None:
+            with span("verification.resolve", {"doi": doi}):
+                return await self.resolver.resolve(verifier, doi, self._observe)
+        return await verify_with_crossref(verifier, doi, self._observe)
+
+    def _observe(self, rtt: float, dropped: bool) -> None:
+        """Feed a Crossref call's outcome to the adaptive limit and the breaker.
+
+        Fallback registries aren't reported: a Crossref 404 followed by a
+        slow or unreachable DataCite says nothing about Crossref's health.
+        """
+        if self.scheduler is not None:
+            self.scheduler.observe(rtt, dropped)
+        if self.breaker is not None:
+            self.breaker.record(not dropped)
+
+    async def _lookup(
+        self, verifier: Any, key: str, doi: str, use_shared: bool = True
+    ) -> VerificationRecord:
+        """Call the blocking verifier in a worker thread and cache the result."""
+        if self.shared is not None and use_shared:
+            with span("cache.shared_lookup", {"doi": key}) as lookup:
+                shared = await asyncio.to_thread(self.shared.get, key)
+                lookup.set_attribute("cache.hit", shared is not None)
+            if shared is not None:
+                self.cache.set(key, shared, origin="shared")
+                return shared
+
+        if self.breaker is not None and not self.breaker.allow():
+            return VerificationRecord(
+                Status.ERROR,
+                strip_doi(doi),
+                error="Upstream unavailable after repeated failures; try again shortly",
+            )
+
+        async with self._upstream_slot():
+            started = time.monotonic()
+            record = VerificationRecord.from_dict(await self._fetch(verifier, doi))
+            latency = time.monotonic() - started
+
+        if self.recorder is not None:
+            await asyncio.to_thread(self.recorder.upstream, key, record, latency)
+
+        if is_cacheable(record):
+            self.cache.set(key, record)
+            if self.shared is not None:
+                await asyncio.to_thread(self.shared.set, key, record)
+        return record
@@ -0,0 +1,191 @@
+# src/citation_verifier_mcp/warmup.py
+
+"""Cache warm-up from a hot-DOI list or the persisted access log."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .cache import normalize_doi
+from .config import env_float, env_int, env_str
+from .verification import VerificationService
+
+logger = logging.getLogger(__name__)
+
+
+class AccessLog:
+    """Append-only JSONL log of requested DOIs, used to seed later warm-ups."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["AccessLog"]:
+        """Create an access log if ``CITATION_ACCESS_LOG`` is set."""
+        path = env_str("CITATION_ACCESS_LOG")
+        return cls(path) if path else None
+
+    def record(self, doi: str) -> None:
+        """Append a DOI request to the log."""
+        line = json.dumps({"ts": round(time.time(), 3), "doi": doi})
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write access log {self.path}: {e}")
+
+
+def load_hot_dois(path: str, limit: Optional[int] = None) -> List[str]:
+    """Load DOIs to warm, most frequently requested first.
+
+    Accepts either a plain list (one DOI per line, ``#`` comments allowed) or
+    a JSONL access log as written by :class:`AccessLog`. Duplicates in any
+    case or URL form are counted towards the same DOI.
+    """
+    counts: Counter = Counter()
+    first_seen: Dict[str, str] = {}
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    doi = str(json.loads(line).get("doi", ""))
+                except ValueError:
+                    continue
+            else:
+                doi = line
+            key = normalize_doi(doi)
+            if not key:
+                continue
+            counts[key] += 1
+            first_seen.setdefault(key, doi)
+
+    return [first_seen[key] for key, _ in counts.most_common(limit)]
+
+
+class CacheWarmer:
+    """Prefetches hot DOIs into the verification cache at a throttled rate.
+
+    The server is considered ready once ``ready_fraction`` of the DOIs are
+    cached, or once ``timeout`` seconds have passed so that an unreachable
+    upstream can't hold a deploy back forever.
+    """
+
+    def __init__(
+        self,
+        service: VerificationService,
+        dois: List[str],
+        rate: float = 5.0,
+        concurrency: int = 4,
+        ready_fraction: float = 0.9,
+        timeout: float = 300.0,
+    ) -> None:
+        self.service = service
+        self.dois = dois
+        self.rate = rate
+        self.concurrency = concurrency
+        self.ready_fraction = ready_fraction
+        self.timeout = timeout
+        self.warmed = 0
+        self.failed = 0
+        self.state = "pending"
+        self._started_at: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, service: VerificationService) -> Optional["CacheWarmer"]:
+        """Create a warmer from ``CITATION_WARMUP_*`` variables.
+
+        DOIs come from ``CITATION_WARMUP_FILE``, falling back to the access
+        log. Returns None when there is nothing to warm.
+        """
+        path = env_str("CITATION_WARMUP_FILE") or env_str("CITATION_ACCESS_LOG")
+        if not path or not os.path.exists(path):
+            return None
+
+        try:
+            dois = load_hot_dois(path, limit=env_int("CITATION_WARMUP_LIMIT", 1000))
+        except OSError as e:
+            logger.warning(f"Failed to read warm-up list {path}: {e}")
+            return None
+
+        return cls(
+            service,
+            dois,
+            rate=env_float("CITATION_WARMUP_RATE", 5.0),
+            concurrency=env_int("CITATION_WARMUP_CONCURRENCY", 4),
+            ready_fraction=env_float("CITATION_WARMUP_READY_FRACTION", 0.9),
+            timeout=env_float("CITATION_WARMUP_TIMEOUT", 300.0),
+        )
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the hot set that is currently warm."""
+        if not self.dois:
+            return 1.0
+        return self.warmed / len(self.dois)
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough of the hot set is warm to take traffic."""
+        if self.fraction >= self.ready_fraction:
+            return True
+        if self._started_at is not None and time.monotonic() - self._started_at >= self.timeout:
+            return True
+        return False
+
+    def status(self) -> Dict[str, Any]:
+        """Return warm-up progress for the readiness endpoint."""
+        return {
+            "state": self.state,
+            "total": len(self.dois),
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "fraction": round(self.fraction, 4),
+            "ready_fraction": self.ready_fraction,
+        }
+
+    async def run(self, verifier: Any) -> None:
+        """Prefetch every DOI, starting at most ``rate`` lookups per second."""
+        self.state = "warming"
+        self._started_at = time.monotonic()
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        logger.info(f"Warming cache with {len(self.dois)} DOIs")
+
+        async def warm(doi: str) -> None:
+            try:
+                await self.service.verify(verifier, doi)
+            except Exception as e:
+                logger.debug(f"Warm-up lookup failed for {doi}: {e}")
+            finally:
+                semaphore.release()
+            if doi in self.service.cache:
+                self.warmed += 1
+            else:
+                self.failed += 1
+
+        tasks = []
+        try:
+            for doi in self.dois:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(warm(doi)))
+                if interval:
+                    await asyncio.sleep(interval)
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            self.state = "cancelled"
+            raise
+
+        self.state = "done"
+        logger.info(f"Cache warm-up finished: {self.warmed} warm, {self.failed} failed")
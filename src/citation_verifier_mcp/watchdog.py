@@ -0,0 +1,111 @@
+# src/citation_verifier_mcp/watchdog.py
+
+"""Detects and reports code that blocks the event loop.
+
+A blocking call in a coroutine (a synchronous HTTP request, a big JSON dump)
+stalls every other request on the server. :class:`LoopWatchdog` keeps a
+heartbeat callback running on the loop and watches it from a separate
+thread; when the heartbeat stops for longer than ``threshold``, the thread
+captures the loop thread's stack, which points at the offending call, and
+logs it. Enable it with ``CITATION_BLOCKING_THRESHOLD_MS``. If the loop is
+also in asyncio debug mode, its slow-callback log uses the same threshold.
+"""
+
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Deque, Dict, List, Optional
+
+from . import metrics
+from .config import env_float
+
+logger = logging.getLogger(__name__)
+
+blocked_total = metrics.counter(
+    "citation_event_loop_blocked_total", "Times the event loop was blocked past the threshold"
+)
+
+
+class LoopWatchdog:
+    """Logs the stack of whatever keeps the event loop from running.
+
+    Each stall is reported once, when it crosses ``threshold`` seconds; its
+    full duration is filled in when the loop wakes up. The most recent
+    ``max_entries`` stalls are kept for :meth:`recent`.
+    """
+
+    def __init__(self, threshold: float = 0.1, max_entries: int = 20) -> None:
+        self.threshold = threshold
+        self._interval = threshold / 4
+        self._entries: Deque[Dict[str, Any]] = collections.deque(maxlen=max_entries)
+        self._beat = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["LoopWatchdog"]:
+        """Create a watchdog from ``CITATION_BLOCKING_THRESHOLD_MS``, if set."""
+        threshold = env_float("CITATION_BLOCKING_THRESHOLD_MS", 0.0)
+        if threshold <= 0:
+            return None
+        return cls(threshold=threshold / 1000)
+
+    def start(self) -> None:
+        """Start watching the running loop; call from a coroutine on it."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        if self._loop.get_debug():
+            self._loop.slow_callback_duration = self.threshold
+        self._stop.clear()
+        self._heartbeat()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Recent stalls, newest first, with their duration and the blocking stack."""
+        return list(reversed(self._entries))
+
+    def _heartbeat(self) -> None:
+        self._beat = time.monotonic()
+        if self._loop is not None and not self._stop.is_set():
+            self._timer = self._loop.call_later(self._interval, self._heartbeat)
+
+    def _watch(self) -> None:
+        stall: Optional[Dict[str, Any]] = None
+        stalled_since = 0.0
+        while not self._stop.wait(self._interval):
+            beat = self._beat
+            silent = time.monotonic() - beat
+            if stall is not None and beat > stalled_since:
+                # The loop is running again; record how long it was stuck
+                stall["blocked_ms"] = round((beat - stalled_since) * 1000, 1)
+                stall = None
+            if stall is None and silent > self.threshold:
+                stalled_since = beat
+                stall = self._report(silent)
+
+    def _report(self, silent: float) -> Dict[str, Any]:
+        frame = sys._current_frames().get(self._loop_thread or 0)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        entry = {"at": time.time(), "blocked_ms": round(silent * 1000, 1), "stack": stack}
+        self._entries.append(entry)
+        blocked_total.inc()
+        logger.warning(
+            f"Event loop blocked for more than {self.threshold * 1000:.0f} ms at:\n{stack}"
+        )
+        return entry
@@ -1,23 +1,147 @@
 # src/citation_verifier_mcp/websocket_server.py
 
 import asyncio
+import importlib
+import itertools
 import json
 import logging
-from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import secrets
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    ContextManager,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 
-import mcp.types as types
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from llm_citation_verifier import CitationVerifier
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from . import metrics
+from .bibliography import check_bibliography, format_bibliography_report
+from .breaker import CircuitBreaker
+from .cache import normalize_doi
+from .cache_transfer import (
+    EXTENSIONS,
+    MEDIA_TYPES,
+    CacheImporter,
+    default_compression,
+    export_cache,
+)
+from .cancellation import (
+    DEADLINE_EXCEEDED,
+    REQUEST_CANCELLED,
+    CallRegistry,
+    DeadlineExceededError,
+    RequestCancelledError,
+    cancel_on_disconnect,
+    cancelled_request,
+    request_timeout,
+)
+from .config import env_float, env_str
+from .consistency import check_citations, format_consistency_report
+from .health import ReadinessProbe, executor_backlog
+from .jsonrpc import error_response, handle_batch
+from .limits import AdaptiveLimit
+from .profiling import ProfilerBusyError, SamplingProfiler, SlowRequestLog
+from .progress import progress_reporter
+from .recording import TrafficRecorder
+from .records import VerificationRecord, as_record
+from .refresh import RefreshAheadScheduler
+from .registries import RegistryResolver, registry_note
+from .scheduling import FairScheduler
+from .search import CitationSearcher
+from .shared_cache import SharedCache
+from .streamable_http import PROTOCOL_VERSION, SESSION_HEADER, Session, SessionStore, StreamEvent
+from .tenants import (
+    ANONYMOUS,
+    API_KEY_HEADER,
+    API_KEY_SUBPROTOCOL,
+    QUOTA_EXCEEDED,
+    QuotaExceededError,
+    Tenant,
+    TenantRegistry,
+    current_tenant,
+    subprotocol_key,
+    tenant_context,
+)
+from .tools import TOOL_DEFINITIONS, TOOL_NAMES, run_search_tool, suggest_alternatives
+from .tracing import extract_context, record_span, span
+from .upstream import UpstreamPool
+from .verification import VerificationService
+from .warmup import AccessLog, CacheWarmer
+from .watchdog import LoopWatchdog
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    import mcp.types as types
+    from llm_citation_verifier import CitationVerifier
+
 # Global citation verifier instance
-citation_verifier: Optional[CitationVerifier] = None
+citation_verifier: Optional["CitationVerifier"] = None
+
+# API clients, their quotas and fair-share weights; None when tenants aren't configured
+tenant_registry = TenantRegistry.from_env()
+
+# Upstream concurrency that follows Crossref's latency; None unless enabled
+upstream_limit = AdaptiveLimit.from_env()
+
+# Recording of DOI calls and upstream responses for offline replay; None unless enabled
+traffic_recorder = TrafficRecorder.from_env()
+
+# Pooled connections to Crossref for the verifier library, pre-opened at startup
+upstream_pool = UpstreamPool.from_env()
+
+# Cached, single-flight verification front end shared by tool calls and warm-up
+verification_service = VerificationService(
+    resolver=RegistryResolver.from_env(),
+    shared=SharedCache.from_env(),
+    scheduler=FairScheduler.from_env(upstream_limit) if tenant_registry or upstream_limit else None,
+    breaker=CircuitBreaker.from_env(),
+    recorder=traffic_recorder,
+)
+
+# Thresholds for /ready, with the event loop lag monitor started at startup
+readiness = ReadinessProbe.from_env()
+
+# Logs what blocks the event loop past CITATION_BLOCKING_THRESHOLD_MS; None when off
+loop_watchdog = LoopWatchdog.from_env()
+
+# Crossref title/author search for citations whose DOI fails verification
+citation_searcher = CitationSearcher.from_env()
+
+# Optional log of requested DOIs, used to warm the cache on the next start
+access_log = AccessLog.from_env()
+
+# Tool calls slower than CITATION_SLOW_REQUEST_MS, with their timing breakdown
+slow_requests = SlowRequestLog.from_env()
+
+# In-process sampling profiler behind the admin endpoints
+profiler = SamplingProfiler(max_seconds=env_float("CITATION_PROFILE_MAX_SECONDS", 60.0))
+
+# Streamable HTTP sessions and their resumable event streams
+sessions = SessionStore.from_env()
+
+# Streamed tool calls still running; they outlive a disconnected client so it can resume
+streamed_calls: Set["asyncio.Task[None]"] = set()
+
+# Bearer token for the /admin endpoints; they are disabled when unset
+admin_token = env_str("CITATION_ADMIN_TOKEN")
+
+# Background cache warm-up, if a hot-DOI list is configured
+cache_warmer: Optional[CacheWarmer] = None
 
 
 async def initialize_citation_verifier() -> None:
@@ -25,25 +149,68 @@ async def initialize_citation_verifier() -> None:
     global citation_verifier
 
     try:
-        citation_verifier = CitationVerifier()
+        # Importing the verifier library is the slowest part of startup; keep it off the loop
+        citation_verifier = await asyncio.to_thread(_create_citation_verifier)
         logger.info("Citation verifier initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize citation verifier: {e}")
         raise
 
 
+def _create_citation_verifier() -> "CitationVerifier":
+    """Import the verifier library on first use and construct a verifier."""
+    from llm_citation_verifier import CitationVerifier
+
+    upstream_pool.install()
+    return CitationVerifier()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage application lifespan."""
-    # Startup
-    await initialize_citation_verifier()
+    global cache_warmer
+
+    # Startup: mcp.types is imported lazily, so load it now rather than on the first request
+    await asyncio.gather(
+        initialize_citation_verifier(), asyncio.to_thread(importlib.import_module, "mcp.types")
+    )
+    cache_warmer = CacheWarmer.from_env(verification_service)
+    background: List["asyncio.Task[Any]"] = []
+    if cache_warmer:
+        background.append(asyncio.create_task(cache_warmer.run(citation_verifier)))
+    refresher = RefreshAheadScheduler.from_env(verification_service)
+    if refresher:
+        background.append(asyncio.create_task(refresher.run(citation_verifier)))
+    background.append(asyncio.create_task(readiness.lag_monitor.run()))
+    background.append(asyncio.create_task(asyncio.to_thread(upstream_pool.prewarm)))
+    if loop_watchdog:
+        loop_watchdog.start()
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    for task in background:
+        task.cancel()
+    if loop_watchdog:
+        loop_watchdog.stop()
 
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(title="Citation Verifier MCP Server", version="0.1.0", lifespan=lifespan)
 
+
+class ArrivalTimeMiddleware:
+    """Stamps each HTTP request with its arrival time, for the parse span."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["received_ns"] = time.time_ns()
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(ArrivalTimeMiddleware)
+
 # Add CORS middleware to allow cross-origin requests
 app.add_middleware(
     CORSMiddleware,
@@ -54,46 +221,87 @@ app.add_middleware(
 )
 
 
-async def handle_list_tools() -> List[types.Tool]:
+async def handle_list_tools() -> List["types.Tool"]:
     """List available tools."""
-    return [
-        types.Tool(
-            name="verify_citation",
-            description="Verify a DOI citation against the Crossref database. Detects potentially hallucinated citations by checking if DOIs exist and retrieving bibliographic metadata.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "doi": {
-                        "type": "string",
-                        "description": "The DOI to verify (e.g., '10.1038/nature12373'). Can include URL prefixes which will be automatically stripped.",
-                    }
-                },
-                "required": ["doi"],
-            },
-        )
-    ]
+    import mcp.types as types
+
+    return [types.Tool(**definition) for definition in TOOL_DEFINITIONS]
 
 
-async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List["types.TextContent"]:
     """Handle tool calls."""
+    if tenant_registry:
+        tenant_registry.consume(current_tenant())
+    if traffic_recorder:
+        await asyncio.to_thread(traffic_recorder.call, name, arguments)
+    tracked = slow_requests.track(name, arguments) if slow_requests else nullcontext()
+    with tracked, span("mcp.dispatch", {"mcp.tool": name}):
+        return await _call_tool(name, arguments)
 
-    if name != "verify_citation":
+
+async def _call_tool(name: str, arguments: Dict[str, Any]) -> List["types.TextContent"]:
+    """Run a tool call."""
+    import mcp.types as types
+
+    if name not in TOOL_NAMES:
         raise ValueError(f"Unknown tool: {name}")
 
+    if name == "search_citation":
+        try:
+            text = await run_search_tool(citation_searcher, arguments)
+        except Exception as e:
+            logger.error(f"Error in citation search: {e}")
+            text = f"Error during citation search: {str(e)}"
+        return [types.TextContent(type="text", text=text)]
+
     if not citation_verifier:
         raise RuntimeError("Citation verifier not initialized")
 
+    if name == "check_citations":
+        try:
+            reports = await check_citations(
+                verification_service, citation_verifier, arguments["citations"]
+            )
+            with span("format"):
+                text = format_consistency_report(reports)
+        except Exception as e:
+            logger.error(f"Error in citation consistency check: {e}")
+            text = f"Error during citation consistency check: {str(e)}"
+        return [types.TextContent(type="text", text=text)]
+
+    if name == "verify_bibliography":
+        try:
+            reports = await check_bibliography(
+                verification_service,
+                citation_verifier,
+                citation_searcher,
+                arguments["bibliography"],
+                arguments.get("format"),
+            )
+            with span("format"):
+                # Reports for thousands of entries take a while to render
+                text = await asyncio.to_thread(format_bibliography_report, reports)
+        except Exception as e:
+            logger.error(f"Error in bibliography verification: {e}")
+            text = f"Error during bibliography verification: {str(e)}"
+        return [types.TextContent(type="text", text=text)]
+
     try:
         # Extract DOI from arguments
         doi = arguments["doi"]
 
         logger.info(f"Verifying citation for DOI: {doi}")
+        if access_log:
+            await asyncio.to_thread(access_log.record, doi)
 
-        # Call your citation verifier
-        result = citation_verifier.verify_doi(doi)
+        # Verify through the cache, off the event loop
+        result = await verification_service.verify(citation_verifier, doi)
 
         # Format the result for MCP response
-        formatted_result = format_verification_result(result)
+        with span("format"):
+            formatted_result = format_verification_result(result)
+        if not result.verified:
+            formatted_result += await suggest_alternatives(citation_searcher, arguments)
 
         return [types.TextContent(type="text", text=formatted_result)]
 
@@ -104,33 +312,34 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.T
         ]
 
 
-def format_verification_result(result: Dict) -> str:
+def format_verification_result(result: Union[VerificationRecord, Dict]) -> str:
     """Format citation verification result for display."""
-    if result["verified"]:
+    record = as_record(result)
+    if record.verified:
         # Successfully verified citation
         output = f"""# ✅ Citation Verified
 
-**DOI:** {result["doi"]}
-**Title:** {result["title"]}
-**Authors:** {result["authors"]}
-**Journal:** {result["journal"]}
-**Publisher:** {result["publisher"]}
-**Year:** {result["year"]}
-**URL:** {result["url"]}
+**DOI:** {record.doi}
+**Title:** {record.title}
+**Authors:** {record.authors}
+**Journal:** {record.journal}
+**Publisher:** {record.publisher}
+**Year:** {record.year}
+**URL:** {record.url}
 
-This DOI exists in the Crossref database and appears to be a legitimate citation."""
+{registry_note(record)}"""
     else:
         # Failed verification - likely hallucinated
         output = f"""# ❌ Citation Not Verified
 
-**DOI:** {result["doi"]}
-**Error:** {result["error"]}
+**DOI:** {record.doi}
+**Error:** {record.error}
 
-⚠️ **Warning:** This DOI was not found in the Crossref database. This may indicate:
+⚠️ **Warning:** This DOI was not found in Crossref, DataCite or doi.org. This may indicate:
 - The DOI is hallucinated/fake
 - The DOI contains typos
-- The paper is very recent and not yet indexed
-- The publisher doesn't use Crossref
+- The paper is very recent and not yet registered
+- A registry could not be reached (see the error above)
 
 **Recommendation:** Verify this citation manually or find an alternative source."""
 
@@ -143,6 +352,7 @@ class MCPConnection:
     def __init__(self, websocket: WebSocket) -> None:
         self.websocket = websocket
         self.initialized = False
+        self.calls = CallRegistry()
 
     async def handle_message(self, message: dict) -> dict:
         """Handle incoming MCP messages."""
@@ -170,7 +380,9 @@ class MCPConnection:
                 name = params.get("name")
                 arguments = params.get("arguments", {})
 
-                result = await handle_call_tool(name, arguments)
+                result = await self.calls.run(
+                    message.get("id"), handle_call_tool(name, arguments), request_timeout(message)
+                )
                 return {
                     "id": message.get("id"),
                     "result": {"content": [content.model_dump() for content in result]},
@@ -185,6 +397,21 @@ class MCPConnection:
                     },
                 }
 
+        except QuotaExceededError as e:
+            return {
+                "id": message.get("id"),
+                "error": {"code": QUOTA_EXCEEDED, "message": str(e)},
+            }
+        except RequestCancelledError as e:
+            return {
+                "id": message.get("id"),
+                "error": {"code": REQUEST_CANCELLED, "message": str(e)},
+            }
+        except DeadlineExceededError as e:
+            return {
+                "id": message.get("id"),
+                "error": {"code": DEADLINE_EXCEEDED, "message": str(e)},
+            }
         except Exception as e:
             logger.error(f"Error handling message: {e}")
             return {
@@ -193,31 +420,96 @@ class MCPConnection:
             }
 
 
+def _request_span(message: Any, transport: str, received: int) -> ContextManager[Any]:
+    """Span for one received message or batch, under the caller's trace context if sent."""
+    if isinstance(message, list):
+        attributes = {"mcp.transport": transport, "mcp.batch_size": len(message)}
+        return span("mcp.request", attributes, start_ns=received)
+    return span(
+        "mcp.request",
+        {"mcp.transport": transport, "mcp.method": message.get("method")},
+        parent=extract_context((message.get("params") or {}).get("_meta")),
+        start_ns=received,
+    )
+
+
+def identify_tenant(api_key: Optional[str]) -> Optional[Tenant]:
+    """The tenant for an API key; None if the key is required and missing or unknown."""
+    if tenant_registry is None:
+        return ANONYMOUS
+    return tenant_registry.identify(api_key)
+
+
+def _unknown_api_key() -> JSONResponse:
+    return _jsonrpc_error(-32001, "A valid API key is required", 401)
+
+
 @app.websocket("/mcp")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     """WebSocket endpoint for MCP communication."""
-    await websocket.accept()
+    # Browsers can't set headers on a WebSocket, so the key may come as a subprotocol
+    offered = websocket.scope.get("subprotocols") or []
+    key_protocol = subprotocol_key(offered)
+    tenant = identify_tenant(websocket.headers.get(API_KEY_HEADER) or key_protocol)
+    if tenant is None:
+        await websocket.close(code=1008, reason="A valid API key is required")
+        return
+
+    chosen = (
+        "mcp"
+        if "mcp" in offered
+        else next((p for p in offered if p.startswith(API_KEY_SUBPROTOCOL)), None)
+    )
+    await websocket.accept(subprotocol=chosen)
     connection = MCPConnection(websocket)
 
     logger.info("New MCP WebSocket connection established")
 
+    async def respond(message: Any, size: int, received: int, parsed: int) -> None:
+        """Handle the message or batch and send the response back to the client."""
+        try:
+            with tenant_context(tenant), _request_span(message, "websocket", received):
+                record_span("mcp.parse", received, parsed, {"size": size})
+                response: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]
+                if isinstance(message, list):
+                    response = await handle_batch(message, connection.handle_message)
+                else:
+                    response = await connection.handle_message(message)
+
+                # A batch of notifications gets no response
+                if response is not None:
+                    await websocket.send_text(json.dumps(response))
+        except Exception as e:
+            logger.error(f"WebSocket error: {e}")
+
+    # Messages are handled concurrently, so the loop keeps reading cancellations
+    pending: Set["asyncio.Task[None]"] = set()
     try:
         while True:
             # Receive message from client
             data = await websocket.receive_text()
+            received = time.time_ns()
             message = json.loads(data)
+            parsed = time.time_ns()
 
-            # Handle the message
-            response = await connection.handle_message(message)
+            cancelled = cancelled_request(message) if isinstance(message, dict) else None
+            if cancelled is not None:
+                connection.calls.cancel(cancelled)
+                continue
 
-            # Send response back to client
-            await websocket.send_text(json.dumps(response))
+            task = asyncio.create_task(respond(message, len(data), received, parsed))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
 
     except WebSocketDisconnect:
         logger.info("MCP WebSocket connection closed")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         await websocket.close()
+    finally:
+        # Nobody is left to read the responses; stop the work and free its upstream slots
+        for task in pending:
+            task.cancel()
 
 
 @app.get("/sse")
@@ -249,9 +541,33 @@ async def sse_endpoint() -> StreamingResponse:
     )
 
 
-@app.post("/messages")
-async def handle_http_message(request: dict) -> dict:
-    """Handle HTTP POST messages for MCP communication."""
+@app.post("/messages", response_model=None)
+async def handle_http_message(
+    request: Union[Dict[str, Any], List[Any]], http_request: Request
+) -> Union[dict, list, Response]:
+    """Handle HTTP POST messages (single or batched) for MCP communication."""
+    # Body read and JSON parsing happen before this handler runs; time them from arrival
+    received = getattr(http_request.state, "received_ns", None) or time.time_ns()
+    tenant = identify_tenant(http_request.headers.get(API_KEY_HEADER))
+    if tenant is None:
+        return _unknown_api_key()
+    with tenant_context(tenant), _request_span(request, "http", received):
+        record_span("mcp.parse", received, time.time_ns())
+        if isinstance(request, list):
+            responses = await cancel_on_disconnect(
+                http_request.receive, handle_batch(request, _handle_http_message)
+            )
+            return Response(status_code=202) if not responses else responses
+        response = await cancel_on_disconnect(http_request.receive, _handle_http_message(request))
+        return _client_closed() if response is None else response
+
+
+async def _handle_http_message(request: dict, calls: Optional[CallRegistry] = None) -> dict:
+    """Dispatch one JSON-RPC message received over HTTP.
+
+    Tool calls are registered in ``calls`` (the session's registry, if any)
+    so that a cancellation notification can stop them.
+    """
     try:
         # Handle the MCP message via HTTP POST
         method = request.get("method")
@@ -281,7 +597,10 @@ async def handle_http_message(request: dict) -> dict:
             name = params.get("name")
             arguments = params.get("arguments", {})
 
-            result = await handle_call_tool(name, arguments)
+            registry = calls if calls is not None else CallRegistry()
+            result = await registry.run(
+                request_id, handle_call_tool(name, arguments), request_timeout(request)
+            )
             return {
                 "jsonrpc": "2.0",
                 "id": request_id,
@@ -295,6 +614,12 @@ async def handle_http_message(request: dict) -> dict:
                 "error": {"code": -32601, "message": f"Method not found: {method}"},
             }
 
+    except QuotaExceededError as e:
+        return error_response(request.get("id", None), QUOTA_EXCEEDED, str(e))
+    except RequestCancelledError as e:
+        return error_response(request.get("id", None), REQUEST_CANCELLED, str(e))
+    except DeadlineExceededError as e:
+        return error_response(request.get("id", None), DEADLINE_EXCEEDED, str(e))
     except Exception as e:
         logger.error(f"Error handling HTTP message: {e}")
         return {
@@ -304,27 +629,352 @@ async def handle_http_message(request: dict) -> dict:
         }
 
 
+def _client_closed() -> Response:
+    """Placeholder response for a client that disconnected before the answer was ready."""
+    return Response(status_code=499)
+
+
+def _jsonrpc_error(code: int, message: str, status_code: int) -> JSONResponse:
+    """A JSON-RPC error that isn't tied to a request id."""
+    return JSONResponse(
+        {"jsonrpc": "2.0", "id": None, "error": {"code": code, "message": message}},
+        status_code=status_code,
+    )
+
+
+def _event_stream(events: AsyncIterator[StreamEvent], session: Session) -> StreamingResponse:
+    """Wrap stream events in an SSE response."""
+
+    async def generate() -> AsyncGenerator[str, None]:
+        async for event in events:
+            yield event.encode()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", SESSION_HEADER: session.id},
+    )
+
+
+async def _streamed_call(session: Session, stream: str, message: Dict[str, Any]) -> None:
+    """Run a request, publishing its progress and final response to a session stream.
+
+    Runs as its own task so the call finishes, and can be resumed, even if the
+    client disconnects mid-stream.
+    """
+    progress_token = ((message.get("params") or {}).get("_meta") or {}).get("progressToken")
+
+    def publish_progress(progress: float, total: Optional[float], text: Optional[str]) -> None:
+        params: Dict[str, Any] = {"progressToken": progress_token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if text:
+            params["message"] = text
+        session.publish(
+            stream, {"jsonrpc": "2.0", "method": "notifications/progress", "params": params}
+        )
+
+    if progress_token is not None:
+        with progress_reporter(publish_progress):
+            response = await _handle_http_message(message, session.calls)
+    else:
+        response = await _handle_http_message(message, session.calls)
+    session.publish(stream, response, final=True)
+
+
+@app.post("/mcp", response_model=None)
+async def streamable_http_post(http_request: Request) -> Response:
+    """Streamable HTTP transport: a JSON-RPC message or batch in, JSON or an SSE stream out."""
+    received = getattr(http_request.state, "received_ns", None) or time.time_ns()
+    try:
+        message = json.loads(await http_request.body())
+    except ValueError:
+        return _jsonrpc_error(-32700, "Parse error", 400)
+    tenant = identify_tenant(http_request.headers.get(API_KEY_HEADER))
+    if tenant is None:
+        return _unknown_api_key()
+    if isinstance(message, list):
+        return await _streamable_http_batch(message, http_request, received, tenant)
+    if not isinstance(message, dict):
+        return _jsonrpc_error(-32600, "Invalid request", 400)
+
+    method = message.get("method")
+    if method == "initialize":
+        session = sessions.create()
+    else:
+        found = _request_session(http_request)
+        if isinstance(found, Response):
+            return found
+        session = found
+
+    # Notifications and client responses need no reply
+    if "id" not in message or method is None:
+        cancelled = cancelled_request(message)
+        if cancelled is not None:
+            session.calls.cancel(cancelled)
+        return Response(status_code=202, headers={SESSION_HEADER: session.id})
+
+    with tenant_context(tenant), _request_span(message, "streamable-http", received):
+        record_span("mcp.parse", received, time.time_ns())
+        accept = http_request.headers.get("accept", "")
+        if method == "tools/call" and "text/event-stream" in accept:
+            stream = session.open_stream()
+            task = asyncio.create_task(_streamed_call(session, stream, message))
+            streamed_calls.add(task)
+            task.add_done_callback(streamed_calls.discard)
+            # Readers stop waiting even if the call ends without a final event
+            task.add_done_callback(lambda _: session.end_stream(stream))
+            return _event_stream(session.follow(stream), session)
+
+        response = await cancel_on_disconnect(
+            http_request.receive, _handle_http_message(message, session.calls)
+        )
+    if response is None:
+        return _client_closed()
+    if method == "initialize" and "result" in response:
+        response["result"]["protocolVersion"] = PROTOCOL_VERSION
+    return JSONResponse(response, headers={SESSION_HEADER: session.id})
+
+
+def _request_session(http_request: Request) -> Union[Session, Response]:
+    """The session named by the request's header, or the error response to send."""
+    session_id = http_request.headers.get(SESSION_HEADER)
+    if not session_id:
+        return _jsonrpc_error(-32600, f"Missing {SESSION_HEADER} header", 400)
+    session = sessions.get(session_id)
+    if session is None:
+        return _jsonrpc_error(-32001, "Session not found", 404)
+    return session
+
+
+async def _streamable_http_batch(
+    messages: List[Any], http_request: Request, received: int, tenant: Tenant
+) -> Response:
+    """Answer a Streamable HTTP batch with one JSON array."""
+    if any(isinstance(m, dict) and m.get("method") == "initialize" for m in messages):
+        return _jsonrpc_error(-32600, "initialize must not be part of a batch", 400)
+    session = _request_session(http_request)
+    if isinstance(session, Response):
+        return session
+
+    with tenant_context(tenant), _request_span(messages, "streamable-http", received):
+        record_span("mcp.parse", received, time.time_ns())
+        responses = await cancel_on_disconnect(
+            http_request.receive,
+            handle_batch(messages, lambda message: _handle_http_message(message, session.calls)),
+        )
+    if not responses:
+        return Response(status_code=202, headers={SESSION_HEADER: session.id})
+    return JSONResponse(responses, headers={SESSION_HEADER: session.id})
+
+
+@app.get("/mcp", response_model=None)
+async def streamable_http_resume(http_request: Request) -> Response:
+    """Resume an interrupted response stream from the event after ``Last-Event-ID``."""
+    session = sessions.get(http_request.headers.get(SESSION_HEADER, ""))
+    if session is None:
+        return _jsonrpc_error(-32001, "Session not found", 404)
+    last_event_id = http_request.headers.get("last-event-id", "")
+    event = session.find(int(last_event_id)) if last_event_id.isdigit() else None
+    if event is None:
+        # No server-initiated messages are sent, so there is no standalone stream
+        return Response(status_code=405, headers={"Allow": "POST, DELETE"})
+    return _event_stream(session.follow(event.stream, after=event.id), session)
+
+
+@app.delete("/mcp", response_model=None)
+async def streamable_http_delete(http_request: Request) -> Response:
+    """End a Streamable HTTP session."""
+    if not sessions.close(http_request.headers.get(SESSION_HEADER, "")):
+        return _jsonrpc_error(-32001, "Session not found", 404)
+    return Response(status_code=204)
+
+
 @app.get("/health")
 async def health_check() -> dict[str, str]:
-    """Health check endpoint."""
+    """Liveness endpoint: the process is up and its event loop answers.
+
+    Load and dependencies are left to ``/ready``, so a slow Crossref takes
+    instances out of rotation rather than getting them restarted.
+    """
     return {"status": "healthy", "service": "citation-verifier-mcp"}
 
 
+@app.get("/ready", response_model=None)
+async def readiness_check() -> JSONResponse:
+    """Readiness endpoint: 503 while warming up, overloaded or cut off from upstream."""
+    scheduler = verification_service.scheduler
+    status, checks = readiness.check(
+        initialized=citation_verifier is not None,
+        warm=(cache_warmer is None or cache_warmer.ready) and upstream_pool.warm,
+        queued=executor_backlog() + (scheduler.waiting if scheduler else 0),
+        breaker=verification_service.breaker,
+    )
+    body: Dict[str, Any] = {
+        "status": status,
+        "service": "citation-verifier-mcp",
+        "checks": checks,
+        "cache": verification_service.cache.stats(),
+    }
+    if verification_service.shared:
+        body["shared_cache"] = verification_service.shared.stats()
+    if cache_warmer:
+        body["warmup"] = cache_warmer.status()
+    body["upstream_pool"] = upstream_pool.stats()
+    return JSONResponse(body, status_code=200 if status == "ready" else 503)
+
+
+def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Allow only requests bearing the admin token; hide the endpoint if none is set."""
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, admin_token):
+        raise HTTPException(status_code=401, detail="Admin token required")
+
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)], response_model=None)
+async def profile_endpoint(seconds: float = 10.0, interval: float = 0.005) -> PlainTextResponse:
+    """Sample all threads for a while and return collapsed stacks for a flamegraph."""
+    try:
+        stacks = await asyncio.to_thread(profiler.profile, seconds, interval)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    return PlainTextResponse(stacks)
+
+
+@app.get("/admin/slow-requests", dependencies=[Depends(require_admin)])
+async def slow_requests_endpoint() -> Dict[str, Any]:
+    """Recent slow tool calls with their timing breakdown, newest first."""
+    if slow_requests is None:
+        return {"threshold_ms": None, "requests": []}
+    return {"threshold_ms": slow_requests.threshold * 1000, "requests": slow_requests.recent()}
+
+
+@app.get("/admin/blocking-calls", dependencies=[Depends(require_admin)])
+async def blocking_calls_endpoint() -> Dict[str, Any]:
+    """Recent event loop stalls with the stack that caused them, newest first."""
+    if loop_watchdog is None:
+        return {"threshold_ms": None, "stalls": []}
+    return {"threshold_ms": loop_watchdog.threshold * 1000, "stalls": loop_watchdog.recent()}
+
+
+@app.get("/admin/tenants", dependencies=[Depends(require_admin)])
+async def tenants_endpoint() -> Dict[str, Any]:
+    """Quota usage per tenant and the upstream scheduler's queue."""
+    if tenant_registry is None:
+        return {"window": None, "tenants": {}, "scheduler": None}
+    scheduler = verification_service.scheduler
+    return {
+        "window": tenant_registry.window,
+        "tenants": tenant_registry.usage(),
+        "scheduler": scheduler.stats() if scheduler else None,
+    }
+
+
+@app.get("/admin/cache", dependencies=[Depends(require_admin)])
+async def cache_endpoint(doi: Optional[str] = None) -> Dict[str, Any]:
+    """Cache statistics, or one DOI's entry with its age and where it came from."""
+    cache = verification_service.cache
+    if doi is None:
+        return cache.stats()
+    entry = cache.peek(doi)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"{doi} is not cached")
+    now = time.time()
+    return {
+        "doi": normalize_doi(doi),
+        "status": entry.value.status.name.lower(),
+        "source": entry.value.source,
+        "origin": entry.origin,
+        "age": now - entry.stored_at,
+        "expires_in": entry.expires_at - now,
+        "hits": entry.hits,
+        "result": entry.value.to_dict(),
+    }
+
+
+@app.delete("/admin/cache", dependencies=[Depends(require_admin)])
+async def invalidate_cache_endpoint(
+    doi: Optional[str] = None, prefix: Optional[str] = None
+) -> Dict[str, Any]:
+    """Drop one DOI's entry, or every entry under a DOI prefix, here and in the shared cache."""
+    cache = verification_service.cache
+    if doi:
+        keys = [normalize_doi(doi)] if cache.invalidate(doi) else []
+        shared_keys = [normalize_doi(doi)]
+    elif prefix:
+        keys = shared_keys = cache.invalidate_prefix(prefix)
+    else:
+        raise HTTPException(status_code=400, detail="Pass doi or prefix")
+    if verification_service.shared is not None and shared_keys:
+        await asyncio.to_thread(verification_service.shared.delete_many, shared_keys)
+    logger.info(f"Invalidated {len(keys)} cache entries")
+    return {"invalidated": len(keys)}
+
+
+@app.get("/admin/cache/export", dependencies=[Depends(require_admin)], response_model=None)
+async def export_cache_endpoint(compression: Optional[str] = None) -> StreamingResponse:
+    """Stream the cache as compressed JSON lines, for :func:`import_cache_endpoint`."""
+    compression = compression or default_compression()
+    try:
+        chunks = export_cache(verification_service.cache, compression)
+        # Fail on a bad or unavailable compression before the response starts
+        first = next(chunks)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    filename = f"citation-cache{EXTENSIONS[compression]}"
+    return StreamingResponse(
+        itertools.chain([first], chunks),
+        media_type=MEDIA_TYPES[compression],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.post("/admin/cache/import", dependencies=[Depends(require_admin)])
+async def import_cache_endpoint(request: Request) -> Dict[str, Any]:
+    """Load an export into the cache as it is uploaded."""
+    importer = CacheImporter(verification_service.cache)
+    try:
+        async for chunk in request.stream():
+            await asyncio.to_thread(importer.feed, chunk)
+        importer.close()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    logger.info(f"Imported {importer.loaded} cache entries ({importer.skipped} expired)")
+    return {"loaded": importer.loaded, "skipped": importer.skipped}
+
+
+@app.get("/metrics", response_model=None)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root() -> dict[str, Any]:
     """Root endpoint with API information."""
     return {
         "name": "Citation Verifier MCP Server",
         "version": "0.1.0",
-        "endpoints": {"websocket": "/mcp", "sse": "/sse", "health": "/health"},
+        "endpoints": {
+            "websocket": "/mcp",
+            "streamable_http": "/mcp",
+            "sse": "/sse",
+            "health": "/health",
+            "ready": "/ready",
+            "metrics": "/metrics",
+        },
         "description": "Remote MCP server for citation verification",
     }
 
 
-@app.post("/")
-async def handle_root_message(request: dict) -> dict:
+@app.post("/", response_model=None)
+async def handle_root_message(
+    request: Union[Dict[str, Any], List[Any]], http_request: Request
+) -> Union[dict, list, Response]:
     """Handle HTTP POST messages at root path for MCP communication."""
-    return await handle_http_message(request)
+    return await handle_http_message(request, http_request)
 
 
 def main() -> None:
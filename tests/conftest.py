@@ -5,6 +5,8 @@ Test configuration and shared fixtures.
 import asyncio
 import os
 import sys
+import threading
+import time
 from typing import Any, Generator
 
 import pytest
@@ -36,3 +38,79 @@ async def citation_verifier() -> Any:
 VALID_DOI = "10.1038/nature12373"  # A real Nature paper
 INVALID_DOI = "10.1234/fake.citation.2024"  # Fake DOI that shouldn't exist
 MALFORMED_DOI = "not-a-doi"  # Invalid DOI format
+
+
+class FakeVerifier:
+    """Offline stand-in for CitationVerifier that records every lookup."""
+
+    def __init__(self, known: Any = None) -> None:
+        self.known = set(known or [VALID_DOI])
+        self.calls: list[str] = []
+
+    def verify_doi(self, doi: str) -> dict:
+        self.calls.append(doi)
+        if doi.lower() in self.known:
+            return {
+                "verified": True,
+                "doi": doi,
+                "title": "A quantum gas of deeply bound ground state molecules",
+                "authors": "T. Takekoshi, L. Reichsöllner, et al.",
+                "journal": "Nature",
+                "publisher": "Springer Science and Business Media LLC",
+                "year": "2014",
+                "url": f"https://doi.org/{doi}",
+            }
+        return {
+            "verified": False,
+            "doi": doi,
+            "error": "DOI not found in Crossref database - possibly hallucinated",
+        }
+
+
+class SlowVerifier(FakeVerifier):
+    """Fake verifier whose lookups block the calling thread for a while."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__(known=[VALID_DOI, "10.1/slow"])
+        self.delay = delay
+        self.started = threading.Event()
+
+    def verify_doi(self, doi: str) -> dict:
+        self.started.set()
+        time.sleep(self.delay)
+        return super().verify_doi(doi)
+
+
+# Crossref /works items served by FakeCrossrefClient
+SAMPLE_WORKS = [
+    {
+        "DOI": VALID_DOI,
+        "title": ["A quantum gas of deeply bound ground state molecules"],
+        "author": [
+            {"given": "T.", "family": "Takekoshi"},
+            {"given": "L.", "family": "Reichsöllner"},
+        ],
+        "container-title": ["Nature"],
+        "publisher": "Springer Science and Business Media LLC",
+        "published-print": {"date-parts": [[2014]]},
+    },
+    {
+        "DOI": "10.1234/unrelated",
+        "title": ["Deep learning for protein folding"],
+        "author": [{"given": "A.", "family": "Smith"}],
+        "container-title": ["Science"],
+        "issued": {"date-parts": [[2020]]},
+    },
+]
+
+
+class FakeCrossrefClient:
+    """Offline stand-in for CrossrefClient that serves canned search results."""
+
+    def __init__(self, works: Any = None) -> None:
+        self.works = works if works is not None else SAMPLE_WORKS
+        self.queries: list[dict] = []
+
+    def search_works(self, params: dict, rows: int = 5) -> list:
+        self.queries.append(params)
+        return self.works[:rows]
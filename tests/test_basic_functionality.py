@@ -28,12 +28,17 @@ class TestMCPServerBasics:
         assert callable(citation_verifier.verify_doi)
 
     async def test_server_lists_tools(self) -> None:
-        """Test: Does the server report the citation verification tool?"""
+        """Test: Does the server report the citation tools?"""
         from citation_verifier_mcp.server import handle_list_tools
 
         tools = await handle_list_tools()
 
-        assert len(tools) == 1
+        assert [tool.name for tool in tools] == [
+            "verify_citation",
+            "search_citation",
+            "check_citations",
+            "verify_bibliography",
+        ]
         tool = tools[0]
         assert tool.name == "verify_citation"
         assert tool.description is not None
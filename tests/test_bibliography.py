@@ -0,0 +1,221 @@
+"""
+Bibliography tests - "Can a whole reference list be checked in one call?"
+
+These tests use an offline fake verifier and Crossref client so they run
+without network access.
+"""
+
+import json
+import threading
+from typing import Any, List
+
+import pytest
+
+from citation_verifier_mcp import bibliography
+from citation_verifier_mcp.bibliography import (
+    BibEntry,
+    check_bibliography,
+    detect_format,
+    format_bibliography_report,
+    parse_bibliography,
+    parse_bibtex,
+    parse_csl_json,
+    parse_ris,
+)
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.search import CitationSearcher
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeCrossrefClient, FakeVerifier
+
+TITLE = "A quantum gas of deeply bound ground state molecules"
+
+BIBTEX = r"""
+@string{nat = "Nature"}
+% A comment line
+@article{takekoshi2014,
+  author  = {Takekoshi, T. and Reichs{\"o}llner, L.},
+  title   = {A Quantum Gas of Deeply Bound {Ground State} Molecules},
+  journal = nat,
+  year    = 2014,
+  doi     = {10.1038/NATURE12373},
+}
+@misc{fake, title = "Made up \& wrong", url = {https://doi.org/10.1234/fake.citation.2024}}
+@book{nodoi,
+  title = {A quantum gas of deeply bound ground state molecules},
+  author = {Takekoshi, T.}
+}
+"""
+
+RIS = """TY  - JOUR
+ID  - takekoshi2014
+AU  - Takekoshi, T.
+AU  - Reichsöllner, L.
+TI  - A quantum gas of deeply bound ground state molecules
+JO  - Nature
+PY  - 2014/06/25
+DO  - 10.1038/nature12373
+ER  -
+TY  - JOUR
+TI  - Another paper
+ER  -
+"""
+
+CSL_JSON = json.dumps(
+    [
+        {
+            "id": "takekoshi2014",
+            "DOI": VALID_DOI,
+            "title": TITLE,
+            "author": [{"family": "Takekoshi", "given": "T."}, {"literal": "L. Reichsöllner"}],
+            "issued": {"date-parts": [[2014, 6]]},
+            "container-title": "Nature",
+        },
+        {"id": "fake", "DOI": INVALID_DOI, "title": "Made up"},
+    ],
+    indent=2,
+)
+
+
+class TestParsers:
+    """Test the streaming bibliography parsers."""
+
+    def test_bibtex(self) -> None:
+        """Test: Are BibTeX fields, braces, escapes and DOI URLs handled?"""
+        entries = list(parse_bibtex(BIBTEX))
+
+        assert [entry.key for entry in entries] == ["takekoshi2014", "fake", "nodoi"]
+        first = entries[0]
+        assert first.doi == "10.1038/NATURE12373"
+        assert first.title == "A Quantum Gas of Deeply Bound Ground State Molecules"
+        assert first.authors == "T. Takekoshi, L. Reichsöllner"
+        assert first.year == "2014"
+        assert entries[1] == BibEntry("fake", doi=INVALID_DOI, title="Made up & wrong")
+        assert entries[2].doi == ""
+
+    def test_ris(self) -> None:
+        """Test: Are RIS records split on ER and their tags mapped?"""
+        entries = list(parse_ris(RIS))
+
+        assert entries[0] == BibEntry(
+            "takekoshi2014",
+            doi=VALID_DOI,
+            title=TITLE,
+            authors="T. Takekoshi, L. Reichsöllner",
+            year="2014",
+            journal="Nature",
+        )
+        assert entries[1] == BibEntry("record-2", title="Another paper")
+
+    def test_csl_json(self) -> None:
+        """Test: Are CSL-JSON items decoded one at a time?"""
+        entries = list(parse_csl_json(CSL_JSON))
+
+        assert entries[0].authors == "T. Takekoshi, L. Reichsöllner"
+        assert entries[0].year == "2014"
+        assert entries[1].doi == INVALID_DOI
+        assert list(parse_csl_json(json.dumps({"id": "one", "title": "x"})))[0].key == "one"
+
+    def test_parsing_is_lazy(self) -> None:
+        """Test: Are entries yielded before the rest of the document is parsed?"""
+        document = "@article{a, doi = {10.1000/a}}\n" * 3 + "@article{broken, title = {"
+        entries = parse_bibtex(document)
+
+        assert next(entries).doi == "10.1000/a"
+
+    def test_detect_format(self) -> None:
+        """Test: Is the format recognised from the document?"""
+        assert detect_format(BIBTEX) == "bibtex"
+        assert detect_format(RIS) == "ris"
+        assert detect_format(CSL_JSON) == "csl-json"
+        with pytest.raises(ValueError):
+            parse_bibliography(BIBTEX, "endnote")
+
+
+class TestCheckBibliography:
+    """Test verifying parsed entries."""
+
+    async def test_report_per_entry(self) -> None:
+        """Test: Is every entry verified, compared or searched, in document order?"""
+        verifier = FakeVerifier()
+        searcher = CitationSearcher(client=FakeCrossrefClient())
+        reports = await check_bibliography(
+            VerificationService(VerificationCache()), verifier, searcher, BIBTEX
+        )
+
+        assert [report["key"] for report in reports] == ["takekoshi2014", "fake", "nodoi"]
+        assert [report["status"] for report in reports] == ["match", "not_found", "suggested"]
+        assert reports[2]["suggestion"]["doi"] == VALID_DOI
+
+        text = format_bibliography_report(reports)
+        assert "**Entries:** 3" in text
+        assert "## 🔎 nodoi" in text
+
+    async def test_thousands_of_entries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Is a large, repetitive bibliography verified with one lookup per DOI?"""
+        document = "".join(
+            f"@article{{e{i}, doi = {{{VALID_DOI if i % 2 else INVALID_DOI}}}}}\n"
+            for i in range(3000)
+        )
+        verifier = FakeVerifier()
+        reports = await check_bibliography(
+            VerificationService(VerificationCache()), verifier, CitationSearcher(), document
+        )
+
+        assert len(reports) == 3000
+        assert len(verifier.calls) == 2
+
+        monkeypatch.setenv("CITATION_MAX_BIBLIOGRAPHY", "100")
+        with pytest.raises(ValueError):
+            await check_bibliography(
+                VerificationService(VerificationCache()), verifier, CitationSearcher(), document
+            )
+
+    async def test_search_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Are title searches capped per call?"""
+        monkeypatch.setenv("CITATION_BIBLIOGRAPHY_SEARCHES", "1")
+        client = FakeCrossrefClient()
+        document = "@misc{a, title = {First}}\n@misc{b, title = {Second}}\n@misc{c}\n"
+        reports = await check_bibliography(
+            VerificationService(VerificationCache()),
+            FakeVerifier(),
+            CitationSearcher(client=client),
+            document,
+        )
+
+        assert reports[0]["status"] == "suggested"
+        assert reports[1]["error"] == "Search limit reached"
+        assert reports[2]["error"] == "No DOI or title"
+
+    async def test_parsing_and_formatting_run_off_the_event_loop(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Are parsing and report formatting done in worker threads?"""
+        import citation_verifier_mcp.server as server_module
+
+        threads: List[str] = []
+
+        def spy(name: str, function: Any) -> Any:
+            def wrapper(*args: Any) -> Any:
+                if threading.current_thread() is not threading.main_thread():
+                    threads.append(name)
+                return function(*args)
+
+            return wrapper
+
+        monkeypatch.setattr(
+            bibliography, "parse_bibliography", spy("parse", bibliography.parse_bibliography)
+        )
+        monkeypatch.setattr(
+            server_module,
+            "format_bibliography_report",
+            spy("format", server_module.format_bibliography_report),
+        )
+        monkeypatch.setattr(server_module, "citation_verifier", FakeVerifier())
+        monkeypatch.setattr(server_module, "verification_service", VerificationService())
+
+        result = await server_module.handle_call_tool(
+            "verify_bibliography", {"bibliography": BIBTEX}
+        )
+
+        assert "**Entries:** 3" in result[0].text
+        assert threads == ["parse", "format"]
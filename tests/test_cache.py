@@ -0,0 +1,244 @@
+"""
+Cache tests - "Do repeated lookups stay off the network?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import List
+
+from citation_verifier_mcp.cache import VerificationCache, normalize_doi
+from citation_verifier_mcp.records import Status, VerificationRecord
+from citation_verifier_mcp.refresh import RefreshAheadScheduler
+from citation_verifier_mcp.verification import VerificationService
+from citation_verifier_mcp.warmup import AccessLog, CacheWarmer, load_hot_dois
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+VERIFIED = VerificationRecord(Status.VERIFIED, VALID_DOI)
+
+
+class TestVerificationCache:
+    """Test the in-process verification cache."""
+
+    def test_normalize_doi_strips_prefixes_and_case(self) -> None:
+        """Test: Do URL and case variants of a DOI share one key?"""
+        assert normalize_doi("https://doi.org/10.1038/NATURE12373") == VALID_DOI
+        assert normalize_doi(" doi:10.1038/nature12373 ") == VALID_DOI
+        assert normalize_doi("http://dx.doi.org/10.1038/nature12373") == VALID_DOI
+
+    def test_cache_evicts_least_recently_used(self) -> None:
+        """Test: Does the cache stay within its size limit?"""
+        cache = VerificationCache(max_entries=2)
+        cache.set("10.1/a", VERIFIED)
+        cache.set("10.1/b", VERIFIED)
+        cache.get("10.1/a")
+        cache.set("10.1/c", VERIFIED)
+
+        assert "10.1/a" in cache
+        assert "10.1/b" not in cache
+        assert len(cache) == 2
+
+    def test_expired_entries_are_misses(self) -> None:
+        """Test: Are entries past their TTL treated as missing?"""
+        cache = VerificationCache(ttl=0.0)
+        cache.set(VALID_DOI, VERIFIED)
+        assert cache.get(VALID_DOI) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_ttl_jitter_spreads_expiry(self) -> None:
+        """Test: Do entries cached together get different expiry times?"""
+        cache = VerificationCache(ttl=1000.0, jitter=0.5)
+        for i in range(20):
+            cache.set(f"10.1/{i}", VERIFIED)
+        entries = [entry for _, entry in cache.expiring(1000.0, min_hits=0)]
+        lifetimes = {round(entry.expires_at - entry.stored_at, 6) for entry in entries}
+        assert len(entries) == 20
+        assert len(lifetimes) > 1
+        assert all(500.0 <= lifetime <= 1000.0 for lifetime in lifetimes)
+
+    def test_expiring_orders_by_hits(self) -> None:
+        """Test: Are the busiest expiring entries listed first, and idle ones skipped?"""
+        cache = VerificationCache(ttl=10.0, jitter=0.0)
+        for doi in ["10.1/cold", "10.1/warm", "10.1/hot"]:
+            cache.set(doi, VERIFIED)
+        cache.get("10.1/warm")
+        for _ in range(3):
+            cache.get("10.1/hot")
+
+        keys = [key for key, _ in cache.expiring(60.0)]
+        assert keys == ["10.1/hot", "10.1/warm"]
+        assert cache.expiring(1.0) == []
+
+
+class TestVerificationService:
+    """Test the cached, single-flight verification front end."""
+
+    async def test_repeat_lookups_are_cached(self) -> None:
+        """Test: Is a DOI only fetched once across case and URL variants?"""
+        verifier = FakeVerifier()
+        service = VerificationService(VerificationCache())
+
+        first = await service.verify(verifier, VALID_DOI)
+        second = await service.verify(verifier, "https://doi.org/10.1038/NATURE12373")
+
+        assert first.verified
+        assert second is first
+        assert verifier.calls == [VALID_DOI]
+
+    async def test_concurrent_lookups_share_one_call(self) -> None:
+        """Test: Do concurrent requests for one DOI share a single upstream call?"""
+        verifier = FakeVerifier()
+        service = VerificationService(VerificationCache())
+
+        results = await asyncio.gather(*(service.verify(verifier, VALID_DOI) for _ in range(5)))
+
+        assert len(verifier.calls) == 1
+        assert all(result.verified for result in results)
+
+    async def test_network_errors_are_not_cached(self) -> None:
+        """Test: Are transient failures retried on the next request?"""
+
+        class FlakyVerifier(FakeVerifier):
+            def verify_doi(self, doi: str) -> dict:
+                self.calls.append(doi)
+                return {"verified": False, "doi": doi, "error": "Network error: timed out"}
+
+        verifier = FlakyVerifier()
+        service = VerificationService(VerificationCache())
+        await service.verify(verifier, VALID_DOI)
+        await service.verify(verifier, VALID_DOI)
+
+        assert len(verifier.calls) == 2
+
+    async def test_batch_duplicates_share_one_result(self) -> None:
+        """Test: Are repeated DOIs in a batch fetched once and fanned out as one object?"""
+
+        class FlakyVerifier(FakeVerifier):
+            def verify_doi(self, doi: str) -> dict:
+                self.calls.append(doi)
+                return {"verified": False, "doi": doi, "error": "Network error: timed out"}
+
+        verifier = FlakyVerifier()
+        service = VerificationService(VerificationCache())
+        dois = [VALID_DOI, "https://doi.org/10.1038/NATURE12373", INVALID_DOI, VALID_DOI.upper()]
+
+        results = await service.verify_many(verifier, dois)
+
+        # Errors aren't cached, so only deduplication keeps this to one call per DOI
+        assert len(verifier.calls) == 2
+        assert results[0] is results[1] is results[3]
+        assert results[2].doi == INVALID_DOI
+
+    async def test_stream_yields_in_order_within_window(self) -> None:
+        """Test: Are streamed results in input order with bounded lookahead?"""
+        started: List[str] = []
+        delays = {f"10.1/{i}": 0.01 * (5 - i) for i in range(5)}
+
+        class SlowVerifier(FakeVerifier):
+            def verify_doi(self, doi: str) -> dict:
+                started.append(doi)
+                time.sleep(delays[doi])
+                return super().verify_doi(doi)
+
+        service = VerificationService(VerificationCache())
+        stream = service.verify_stream(SlowVerifier(), list(delays), concurrency=2, window=2)
+
+        indexes = []
+        async for index, record in stream:
+            indexes.append(index)
+            assert len(started) <= index + 2
+            assert record.doi == f"10.1/{index}"
+
+        assert indexes == [0, 1, 2, 3, 4]
+
+
+class TestCacheWarmup:
+    """Test warming the cache from hot-DOI lists and the access log."""
+
+    def test_load_hot_dois_orders_by_frequency(self, tmp_path: Path) -> None:
+        """Test: Are access-log DOIs deduplicated and ranked by request count?"""
+        log = AccessLog(str(tmp_path / "access.jsonl"))
+        for doi in ["10.1/a", "10.1/b", "https://doi.org/10.1/B", "10.1/b", "10.1/a", "10.1/B"]:
+            log.record(doi)
+
+        assert load_hot_dois(log.path) == ["10.1/b", "10.1/a"]
+        assert load_hot_dois(log.path, limit=1) == ["10.1/b"]
+
+    def test_load_hot_dois_plain_list(self, tmp_path: Path) -> None:
+        """Test: Does a plain one-DOI-per-line file work, with comments?"""
+        path = tmp_path / "hot.txt"
+        path.write_text(f"# hot set\n{VALID_DOI}\n\n{INVALID_DOI}\n")
+        assert load_hot_dois(str(path)) == [VALID_DOI, INVALID_DOI]
+
+    async def test_warmer_fills_cache_and_reports_ready(self) -> None:
+        """Test: Does the warmer prefetch the hot set and then report ready?"""
+        verifier = FakeVerifier()
+        service = VerificationService(VerificationCache())
+        warmer = CacheWarmer(service, [VALID_DOI, INVALID_DOI], rate=0, ready_fraction=1.0)
+
+        assert not warmer.ready
+        await warmer.run(verifier)
+
+        assert warmer.ready
+        assert warmer.status()["warmed"] == 2
+        assert VALID_DOI in service.cache
+        assert INVALID_DOI in service.cache
+
+    async def test_warmer_not_ready_below_fraction(self) -> None:
+        """Test: Does readiness wait for the configured fraction of the hot set?"""
+
+        class DownVerifier(FakeVerifier):
+            def verify_doi(self, doi: str) -> dict:
+                return {"verified": False, "doi": doi, "error": "Network error: unreachable"}
+
+        service = VerificationService(VerificationCache())
+        warmer = CacheWarmer(service, [VALID_DOI, INVALID_DOI], rate=0, ready_fraction=0.5)
+        await warmer.run(DownVerifier())
+
+        assert warmer.status()["failed"] == 2
+        assert not warmer.ready
+
+    def test_access_log_writes_jsonl(self, tmp_path: Path) -> None:
+        """Test: Does the access log persist one JSON object per request?"""
+        log = AccessLog(str(tmp_path / "access.jsonl"))
+        log.record(VALID_DOI)
+        entry = json.loads((tmp_path / "access.jsonl").read_text().strip())
+        assert entry["doi"] == VALID_DOI
+        assert "ts" in entry
+
+
+class TestRefreshAhead:
+    """Test background refresh of cache entries nearing expiry."""
+
+    async def test_refresh_once_refetches_hot_entries(self) -> None:
+        """Test: Are accessed entries near expiry re-fetched in the background?"""
+        verifier = FakeVerifier(known=[VALID_DOI, "10.1/cold"])
+        service = VerificationService(VerificationCache(ttl=30.0, jitter=0.0))
+        await service.verify(verifier, VALID_DOI)
+        await service.verify(verifier, "10.1/cold")
+        await service.verify(verifier, VALID_DOI)  # cache hit
+
+        scheduler = RefreshAheadScheduler(service, window=60.0, rate=0)
+        refreshed = await scheduler.refresh_once(verifier)
+
+        assert refreshed == 1
+        assert verifier.calls == [VALID_DOI, "10.1/cold", VALID_DOI]
+
+    async def test_failed_refresh_keeps_old_entry(self) -> None:
+        """Test: Does a failed refresh keep serving the cached value?"""
+        service = VerificationService(VerificationCache(ttl=30.0, jitter=0.0))
+        await service.verify(FakeVerifier(), VALID_DOI)
+        await service.verify(FakeVerifier(), VALID_DOI)
+
+        class DownVerifier(FakeVerifier):
+            def verify_doi(self, doi: str) -> dict:
+                return {"verified": False, "doi": doi, "error": "Network error: unreachable"}
+
+        scheduler = RefreshAheadScheduler(service, window=60.0, rate=0)
+        await scheduler.refresh_once(DownVerifier())
+
+        cached = service.cache.get(VALID_DOI)
+        assert cached is not None and cached.verified
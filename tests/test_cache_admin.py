@@ -0,0 +1,223 @@
+"""
+Cache admin tests - "Can a bad entry be purged and a warm cache moved?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import time
+from typing import Any, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp.cache import CacheEntry, VerificationCache
+from citation_verifier_mcp.cache_cli import _compression_for, build_parser
+from citation_verifier_mcp.cache_transfer import (
+    CacheImporter,
+    export_cache,
+    import_cache,
+    zstandard,
+)
+from citation_verifier_mcp.records import Status, VerificationRecord
+from citation_verifier_mcp.shared_cache import InMemoryBackend, SharedCache
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+ADMIN_TOKEN = "test-admin-token"
+HEADERS = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+COMPRESSIONS = ["gzip", "none"] + (["zstd"] if zstandard is not None else [])
+
+
+def record(doi: str) -> VerificationRecord:
+    return VerificationRecord(Status.VERIFIED, doi, title=f"Title of {doi}", year="2024")
+
+
+def filled_cache(count: int) -> VerificationCache:
+    cache = VerificationCache(max_entries=count * 2)
+    for i in range(count):
+        cache.set(f"10.1234/entry-{i}", record(f"10.1234/entry-{i}"))
+    return cache
+
+
+def rechunk(chunks: Iterator[bytes], size: int) -> List[bytes]:
+    data = b"".join(chunks)
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestCacheEntries:
+    """Test inspecting and invalidating cache entries."""
+
+    def test_peek_and_invalidate(self) -> None:
+        """Test: Can one entry be inspected without a hit, then dropped?"""
+        cache = VerificationCache()
+        cache.set(VALID_DOI, record(VALID_DOI))
+
+        entry = cache.peek(f"https://doi.org/{VALID_DOI.upper()}")
+        assert entry is not None and entry.origin == "upstream"
+        assert cache.stats()["hits"] == 0
+
+        assert cache.invalidate(VALID_DOI)
+        assert not cache.invalidate(VALID_DOI)
+        assert cache.peek(VALID_DOI) is None
+
+    def test_invalidate_prefix(self) -> None:
+        """Test: Are all entries under a DOI prefix dropped, and only those?"""
+        cache = filled_cache(5)
+        cache.set(VALID_DOI, record(VALID_DOI))
+
+        assert len(cache.invalidate_prefix("10.1234/")) == 5
+        assert len(cache) == 1
+
+    def test_load_keeps_timestamps(self) -> None:
+        """Test: Does a bulk load keep expiry times and skip expired entries?"""
+        cache = VerificationCache()
+        now = time.time()
+        loaded = cache.load(
+            [
+                ("10.1/live", CacheEntry(record("10.1/live"), now - 10, now + 50, origin="import")),
+                ("10.1/dead", CacheEntry(record("10.1/dead"), now - 90, now - 1)),
+            ]
+        )
+
+        assert loaded == 1
+        entry = cache.peek("10.1/live")
+        assert entry is not None and entry.expires_at == now + 50
+        assert "10.1/dead" not in cache
+
+
+class TestExportImport:
+    """Test moving a cache between instances."""
+
+    @pytest.mark.parametrize("compression", COMPRESSIONS)
+    def test_round_trip_in_small_chunks(self, compression: str) -> None:
+        """Test: Does an export load back entry for entry, however it is chunked?"""
+        source = filled_cache(2500)
+        source.set(INVALID_DOI, VerificationRecord(Status.NOT_FOUND, INVALID_DOI, error="nope"))
+        target = VerificationCache()
+
+        importer = import_cache(target, rechunk(export_cache(source, compression), 7))
+
+        assert importer.loaded == 2501
+        assert [key for key, _ in target.items()] == [key for key, _ in source.items()]
+        for key, entry in source.items():
+            imported = target.peek(key)
+            assert imported is not None
+            assert imported.value == entry.value
+            assert imported.expires_at == entry.expires_at
+            assert imported.origin == "import"
+
+    def test_export_is_compact(self) -> None:
+        """Test: Is a compressed export much smaller than the JSON lines?"""
+        cache = filled_cache(2000)
+        plain = b"".join(export_cache(cache, "none"))
+        compressed = b"".join(export_cache(cache, "gzip"))
+
+        assert len(compressed) * 5 < len(plain)
+
+    def test_rejects_other_input(self) -> None:
+        """Test: Is anything but a cache export refused?"""
+        with pytest.raises(ValueError):
+            import_cache(VerificationCache(), [b'{"hello": "world"}\n'])
+        with pytest.raises(ValueError):
+            import_cache(VerificationCache(), [b"\x1f\x8bnot really gzip"])
+        with pytest.raises(ValueError):
+            CacheImporter(VerificationCache()).close()
+
+    @pytest.mark.parametrize("compression", [c for c in COMPRESSIONS if c != "none"])
+    def test_rejects_truncated_export(self, compression: str) -> None:
+        """Test: Is an export cut short refused instead of loading part of the cache?"""
+        data = b"".join(export_cache(filled_cache(500), compression))
+
+        for cut in (len(data) // 2, len(data) - 4):
+            with pytest.raises(ValueError, match="Truncated"):
+                import_cache(VerificationCache(), rechunk(iter([data[:cut]]), 7))
+
+
+class TestCacheEndpoints:
+    """Test the cache admin endpoints."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+        from citation_verifier_mcp import websocket_server
+
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "admin_token", ADMIN_TOKEN)
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(
+                websocket_server,
+                "verification_service",
+                VerificationService(VerificationCache(), shared=SharedCache(InMemoryBackend())),
+            )
+            yield client
+
+    def _verify(self, client: TestClient, doi: str) -> None:
+        client.post(
+            "/messages",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {"name": "verify_citation", "arguments": {"doi": doi}},
+            },
+        )
+
+    def test_inspect_and_invalidate(self, client: TestClient) -> None:
+        """Test: Does an entry show its age and source, and stay gone once invalidated?"""
+        from citation_verifier_mcp import websocket_server
+
+        self._verify(client, VALID_DOI)
+        entry = client.get("/admin/cache", params={"doi": VALID_DOI}, headers=HEADERS).json()
+        assert entry["status"] == "verified"
+        assert entry["source"] == "crossref"
+        assert entry["origin"] == "upstream"
+        assert 0 <= entry["age"] < 5
+
+        response = client.delete("/admin/cache", params={"doi": VALID_DOI}, headers=HEADERS)
+        assert response.json() == {"invalidated": 1}
+        service: Any = websocket_server.verification_service
+        assert service.shared.get(VALID_DOI) is None
+
+        missing = client.get("/admin/cache", params={"doi": VALID_DOI}, headers=HEADERS)
+        assert missing.status_code == 404
+        assert client.delete("/admin/cache", headers=HEADERS).status_code == 400
+        assert client.get("/admin/cache", params={"doi": VALID_DOI}).status_code == 401
+
+    def test_export_then_import(self, client: TestClient) -> None:
+        """Test: Can an exported cache be uploaded into a fresh one?"""
+        from citation_verifier_mcp import websocket_server
+
+        self._verify(client, VALID_DOI)
+        self._verify(client, INVALID_DOI)
+        export = client.get("/admin/cache/export", params={"compression": "gzip"}, headers=HEADERS)
+        assert export.headers["content-type"] == "application/gzip"
+
+        websocket_server.verification_service.cache.clear()
+        result = client.post("/admin/cache/import", content=export.content, headers=HEADERS)
+        assert result.json() == {"loaded": 2, "skipped": 0}
+        assert client.get("/admin/cache", headers=HEADERS).json()["entries"] == 2
+
+        bad = client.post("/admin/cache/import", content=b"nonsense", headers=HEADERS)
+        assert bad.status_code == 400
+        assert (
+            client.get(
+                "/admin/cache/export", params={"compression": "lz4"}, headers=HEADERS
+            ).status_code
+            == 400
+        )
+
+
+class TestCacheCli:
+    """Test the command line client's argument handling."""
+
+    def test_arguments(self) -> None:
+        """Test: Are commands parsed and export compression taken from the file name?"""
+        parser = build_parser()
+
+        args = parser.parse_args(["--token", "t", "invalidate", "--prefix", "10.1234/"])
+        assert (args.command, args.prefix, args.doi) == ("invalidate", "10.1234/", None)
+        assert _compression_for("backup.jsonl.zst") == "zstd"
+        assert _compression_for("backup.jsonl.gz") == "gzip"
+        assert _compression_for("backup.bin") is None
+        with pytest.raises(SystemExit):
+            parser.parse_args(["invalidate"])
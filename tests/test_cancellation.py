@@ -0,0 +1,184 @@
+"""
+Cancellation tests - "Does work stop when the client no longer wants it?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.cancellation import (
+    DEADLINE_EXCEEDED,
+    REQUEST_CANCELLED,
+    CallRegistry,
+    DeadlineExceededError,
+    RequestCancelledError,
+    request_timeout,
+    time_left,
+)
+from citation_verifier_mcp.streamable_http import Session
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import SlowVerifier
+
+
+def slow_call(request_id: int, meta: Any = None) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"name": "verify_citation", "arguments": {"doi": "10.1/slow"}}
+    if meta:
+        params["_meta"] = meta
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": params}
+
+
+def cancel_notification(request_id: int) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "notifications/cancelled",
+        "params": {"requestId": request_id},
+    }
+
+
+def wait_until_idle(service: VerificationService, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while service.inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestCallRegistry:
+    """Test cancelling and bounding individual calls."""
+
+    async def test_cancel_by_request_id(self) -> None:
+        """Test: Does cancelling a request id stop that call only?"""
+        calls = CallRegistry()
+        cancelled = asyncio.create_task(calls.run(1, asyncio.sleep(5)))
+        kept = asyncio.create_task(calls.run(2, asyncio.sleep(0.05, result="done")))
+        await asyncio.sleep(0.01)
+
+        assert calls.cancel(1)
+        assert not calls.cancel(99)
+        with pytest.raises(RequestCancelledError):
+            await cancelled
+        assert await kept == "done"
+        assert len(calls) == 0
+
+    async def test_deadline_is_enforced_and_visible(self) -> None:
+        """Test: Is a call stopped at its deadline, with time_left shrinking inside it?"""
+        seen = []
+
+        async def work() -> None:
+            seen.append(time_left(10.0))
+            await asyncio.sleep(5)
+
+        with pytest.raises(DeadlineExceededError):
+            await CallRegistry().run(1, work(), timeout=0.05)
+
+        assert 0 < seen[0] <= 0.05
+        assert time_left(10.0) == 10.0
+
+    async def test_caller_cancellation_propagates(self) -> None:
+        """Test: Is the call cancelled when its caller is?"""
+        started = asyncio.Event()
+
+        async def work() -> None:
+            started.set()
+            await asyncio.sleep(5)
+
+        inner = asyncio.ensure_future(work())
+        caller = asyncio.create_task(CallRegistry().run(1, inner))
+        await started.wait()
+        caller.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert inner.cancelled()
+
+    def test_request_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Is the client's timeoutMs used, capped by CITATION_REQUEST_TIMEOUT?"""
+        assert request_timeout(slow_call(1)) is None
+        assert request_timeout(slow_call(1, {"timeoutMs": 1500})) == 1.5
+
+        monkeypatch.setenv("CITATION_REQUEST_TIMEOUT", "1")
+        assert request_timeout(slow_call(1)) == 1.0
+        assert request_timeout(slow_call(1, {"timeoutMs": 1500})) == 1.0
+        assert request_timeout(slow_call(1, {"timeoutMs": 200})) == 0.2
+
+
+class TestTransportCancellation:
+    """Test cancellation and deadlines over the remote transports."""
+
+    @pytest.fixture
+    def service(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[VerificationService]:
+        from citation_verifier_mcp import websocket_server
+
+        service = VerificationService(VerificationCache())
+        monkeypatch.setattr(websocket_server, "verification_service", service)
+        monkeypatch.setattr(websocket_server, "access_log", None)
+        yield service
+
+    @pytest.fixture
+    def client(self, service: VerificationService, monkeypatch: pytest.MonkeyPatch) -> Any:
+        from citation_verifier_mcp import websocket_server
+
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "citation_verifier", SlowVerifier(0.5))
+            yield client
+
+    def test_websocket_cancel_notification(
+        self, client: TestClient, service: VerificationService
+    ) -> None:
+        """Test: Does notifications/cancelled stop a WebSocket call and its lookup?"""
+        with client.websocket_connect("/mcp") as websocket:
+            websocket.send_text(json.dumps(slow_call(7)))
+            time.sleep(0.05)
+            websocket.send_text(json.dumps(cancel_notification(7)))
+            response = json.loads(websocket.receive_text())
+
+        assert response["id"] == 7
+        assert response["error"]["code"] == REQUEST_CANCELLED
+        assert service.inflight == 0
+
+    def test_websocket_disconnect_cancels_work(
+        self, client: TestClient, service: VerificationService
+    ) -> None:
+        """Test: Is in-flight work cancelled when the WebSocket client goes away?"""
+        with client.websocket_connect("/mcp") as websocket:
+            websocket.send_text(json.dumps(slow_call(1)))
+            time.sleep(0.05)
+            assert service.inflight == 1
+
+        wait_until_idle(service, timeout=0.3)
+        assert service.inflight == 0
+        assert "10.1/slow" not in service.cache
+
+    def test_deadline_over_websocket_and_http(self, client: TestClient) -> None:
+        """Test: Is a call past the client's deadline answered with an error?"""
+        with client.websocket_connect("/mcp") as websocket:
+            websocket.send_text(json.dumps(slow_call(1, {"timeoutMs": 50})))
+            response = json.loads(websocket.receive_text())
+        assert response["error"]["code"] == DEADLINE_EXCEEDED
+
+        response = client.post("/messages", json=slow_call(2, {"timeoutMs": 50})).json()
+        assert response["error"]["code"] == DEADLINE_EXCEEDED
+
+    async def test_streamed_call_cancelled_by_session(
+        self, service: VerificationService, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Does cancelling a Streamable HTTP call end its stream with an error?"""
+        from citation_verifier_mcp import websocket_server
+
+        monkeypatch.setattr(websocket_server, "citation_verifier", SlowVerifier(0.5))
+        session = Session("test")
+        stream = session.open_stream()
+        call = asyncio.create_task(websocket_server._streamed_call(session, stream, slow_call(3)))
+        await asyncio.sleep(0.05)
+
+        assert session.calls.cancel(3)
+        await call
+        events = [event async for event in session.follow(stream)]
+
+        assert json.loads(events[-1].data)["error"]["code"] == REQUEST_CANCELLED
+        assert service.inflight == 0
@@ -0,0 +1,77 @@
+"""
+Columnar output tests - "Can bulk results be loaded straight into a dataframe?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+They need the optional ``pyarrow`` package.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from citation_verifier_mcp import columnar
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.columnar import COLUMNS, verify_to_file
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+DOIS = [VALID_DOI, INVALID_DOI, f"https://doi.org/{VALID_DOI}", "not a doi", VALID_DOI]
+
+
+class TestColumnarOutput:
+    """Test writing verification results as Parquet and Arrow."""
+
+    async def test_parquet_row_groups(self, tmp_path: Path) -> None:
+        """Test: Is every DOI a row, in order, written in bounded row groups?"""
+        path = tmp_path / "results.parquet"
+        verifier = FakeVerifier()
+        service = VerificationService(VerificationCache())
+
+        summary = await verify_to_file(service, verifier, iter(DOIS), str(path), row_group_size=2)
+
+        parquet = pq.ParquetFile(path)
+        assert summary == {"rows": 5, "row_groups": 3, "verified": 3, "format": "parquet"}
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.column_names == [name for name, _ in COLUMNS]
+        assert table["verified"].to_pylist() == [True, False, True, False, True]
+        assert table["url"][0].as_py() == f"https://doi.org/{VALID_DOI}"
+        assert table["error"][3].as_py() == "Not a valid DOI"
+        # Looked up once; the repeat in a later row group is a cache hit
+        assert verifier.calls == [VALID_DOI, INVALID_DOI]
+        assert table["latency_ms"][0].as_py() is not None
+        assert table["latency_ms"][4].as_py() is None
+
+    async def test_arrow_stream(self, tmp_path: Path) -> None:
+        """Test: Is the Arrow IPC stream readable batch by batch?"""
+        path = tmp_path / "results.arrow"
+        service = VerificationService(VerificationCache())
+
+        await verify_to_file(
+            service, FakeVerifier(), DOIS, str(path), format="arrow", row_group_size=2
+        )
+
+        with pa.ipc.open_stream(path.read_bytes()) as reader:
+            batches = list(reader)
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+        assert pa.Table.from_batches(batches)["doi"][1].as_py() == INVALID_DOI
+
+    def test_cli(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test: Does the bulk command turn a DOI list into a results file?"""
+        monkeypatch.setattr(columnar, "_create_citation_verifier", FakeVerifier)
+        source = tmp_path / "dois.txt"
+        source.write_text("\n".join(DOIS) + "\n\n")
+
+        columnar.main([str(source), "-o", str(tmp_path / "out.parquet")])
+
+        assert json.loads(capsys.readouterr().out)["rows"] == 5
+        assert pq.read_table(tmp_path / "out.parquet").num_rows == 5
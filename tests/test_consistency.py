@@ -0,0 +1,133 @@
+"""
+Consistency tests - "Does the cited DOI match the cited paper?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import threading
+from typing import Any, List
+
+import pytest
+
+from citation_verifier_mcp import consistency
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.consistency import check_citations, format_consistency_report
+from citation_verifier_mcp.similarity import similarity, similarity_pairs
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+TITLE = "A quantum gas of deeply bound ground state molecules"
+
+
+class TestConsistencyCheck:
+    """Test comparing claimed metadata with the Crossref record."""
+
+    async def test_matching_citation(self) -> None:
+        """Test: Is a correctly cited paper reported as consistent?"""
+        service = VerificationService(VerificationCache())
+        reports = await check_citations(
+            service,
+            FakeVerifier(),
+            [
+                {
+                    "doi": VALID_DOI,
+                    "title": TITLE.upper(),
+                    "authors": "Takekoshi, Reichsöllner",
+                    "year": 2014,
+                    "journal": "Nature",
+                }
+            ],
+        )
+
+        assert reports[0]["status"] == "match"
+        assert set(reports[0]["fields"]) == {"title", "authors", "year", "journal"}
+
+    async def test_wrong_title_and_year_are_mismatches(self) -> None:
+        """Test: Is a real DOI cited with the wrong title and year flagged?"""
+        service = VerificationService(VerificationCache())
+        reports = await check_citations(
+            service,
+            FakeVerifier(),
+            [{"doi": VALID_DOI, "title": "Deep learning for protein folding", "year": "2019"}],
+        )
+
+        fields = reports[0]["fields"]
+        assert reports[0]["status"] == "mismatch"
+        assert not fields["title"]["match"]
+        assert not fields["year"]["match"]
+        assert fields["title"]["actual"] == TITLE
+
+    async def test_batch_reuses_cache(self) -> None:
+        """Test: Are records fetched once per DOI and reported in input order?"""
+        verifier = FakeVerifier()
+        service = VerificationService(VerificationCache())
+        await service.verify(verifier, VALID_DOI)
+
+        reports = await check_citations(
+            service,
+            verifier,
+            [{"doi": VALID_DOI, "title": TITLE}, {"doi": INVALID_DOI}, {"doi": VALID_DOI}],
+        )
+
+        assert [r["status"] for r in reports] == ["match", "not_found", "match"]
+        assert verifier.calls == [VALID_DOI, INVALID_DOI]
+
+    async def test_batch_size_is_limited(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Are oversized batches rejected?"""
+        monkeypatch.setenv("CITATION_MAX_BATCH", "2")
+        service = VerificationService(VerificationCache())
+        with pytest.raises(ValueError, match="Too many citations"):
+            await check_citations(service, FakeVerifier(), [{"doi": VALID_DOI}] * 3)
+
+    async def test_scoring_runs_off_the_event_loop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Are title and journal columns scored in a worker thread?"""
+        threads: List[threading.Thread] = []
+
+        def scoring(left: List[str], right: List[str]) -> Any:
+            threads.append(threading.current_thread())
+            return similarity_pairs(left, right)
+
+        monkeypatch.setattr(consistency, "similarity_pairs", scoring)
+        service = VerificationService(VerificationCache())
+        citation = {"doi": VALID_DOI, "title": TITLE, "journal": "Nature"}
+
+        [report] = await check_citations(service, FakeVerifier(), [citation])
+
+        assert report["status"] == "match"
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+
+    def test_similarity_pairs_matches_scalar_scorer(self) -> None:
+        """Test: Does column-wise scoring agree with scoring one pair at a time?"""
+        left = [TITLE, "Nature", ""]
+        right = [TITLE.lower(), "Nature Physics", "Science"]
+        scores = similarity_pairs(left, right)
+        assert scores == pytest.approx([similarity(a, b) for a, b in zip(left, right)])
+
+    async def test_format_consistency_report(self) -> None:
+        """Test: Does the report summarize and list mismatches first?"""
+        service = VerificationService(VerificationCache())
+        reports = await check_citations(
+            service,
+            FakeVerifier(),
+            [{"doi": VALID_DOI, "title": TITLE}, {"doi": VALID_DOI, "year": "1999"}],
+        )
+        formatted = format_consistency_report(reports)
+
+        assert "**Consistent:** 1" in formatted
+        assert "**Mismatched:** 1" in formatted
+        assert formatted.index("⚠️") < formatted.index("✅")
+        assert 'claimed "1999", record says "2014"' in formatted
+
+    async def test_check_citations_tool_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Can we call the consistency tool through the MCP handler?"""
+        import citation_verifier_mcp.server as server_module
+
+        monkeypatch.setattr(server_module, "citation_verifier", FakeVerifier())
+        monkeypatch.setattr(server_module, "verification_service", VerificationService())
+        result = await server_module.handle_call_tool(
+            "check_citations", {"citations": [{"doi": VALID_DOI, "title": TITLE}]}
+        )
+
+        assert "Citation Consistency Report" in result[0].text
+        assert "**Consistent:** 1" in result[0].text
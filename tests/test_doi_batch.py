@@ -0,0 +1,73 @@
+"""
+DOI batch tests - "Are bulk DOI lists cleaned up before any lookups?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import pytest
+
+from citation_verifier_mcp import doi_batch
+from citation_verifier_mcp.cache import VerificationCache, normalize_doi
+from citation_verifier_mcp.doi_batch import normalize_dois
+from citation_verifier_mcp.records import Status
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import VALID_DOI, FakeVerifier
+
+MESSY_DOIS = [
+    " https://doi.org/10.1038/Nature12373 ",
+    "DOI:10.1038/NATURE12373",
+    "doi: 10.1000/abc",
+    "HTTP://DX.DOI.ORG/10.5555/Ü-Ä",
+    "10.5555/İstanbul",
+    "\x1c10.1000/abc\x1f",
+    "https://doi.org/doi:10.1000/abc",
+    "10.1000/has space",
+    "10.abc/xyz",
+    "not a doi",
+    "",
+]
+
+
+class TestNormalizeDois:
+    """Test column-wise normalization, validation and statistics."""
+
+    def test_keys_flags_and_prefixes(self) -> None:
+        """Test: Are keys canonical, junk flagged, repeats marked and prefixes counted?"""
+        batch = normalize_dois(MESSY_DOIS, use_arrow=False)
+
+        assert batch.keys == [normalize_doi(doi) for doi in MESSY_DOIS]
+        assert batch.valid == [True] * 6 + [False] * 5
+        assert batch.first == [True, False, True, True, True, False] + [False] * 5
+        assert batch.unique == 4
+        assert batch.invalid == 5
+        assert batch.prefixes == {"10.1038": 2, "10.1000": 2, "10.5555": 2}
+
+    def test_arrow_matches_python(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Do the Arrow kernels give exactly the pure-Python results?"""
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(doi_batch, "ARROW_MIN_BATCH", 0)
+        dois = MESSY_DOIS * 50 + [f"10.{1000 + i % 7}/item-{i % 300}" for i in range(3000)]
+
+        assert normalize_dois(dois) == normalize_dois(dois, use_arrow=False)
+
+
+class TestBulkPrefilter:
+    """Test that bulk verification skips what can't be a DOI."""
+
+    async def test_invalid_and_repeated_dois_skip_upstream(self) -> None:
+        """Test: Are malformed DOIs reported without a lookup and repeats looked up once?"""
+        verifier = FakeVerifier()
+        service = VerificationService(VerificationCache())
+
+        records = await service.verify_many(
+            verifier, [VALID_DOI, "not a doi", f"https://doi.org/{VALID_DOI.upper()}", ""]
+        )
+
+        assert verifier.calls == [VALID_DOI]
+        assert [record.status for record in records] == [
+            Status.VERIFIED,
+            Status.NOT_FOUND,
+            Status.VERIFIED,
+            Status.NOT_FOUND,
+        ]
+        assert records[1].error == "Not a valid DOI"
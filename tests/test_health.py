@@ -0,0 +1,201 @@
+"""
+Health tests - "Does readiness tell the load balancer when to back off?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.health import LoopLagMonitor, ReadinessProbe
+from citation_verifier_mcp.records import Status
+from citation_verifier_mcp.registries import RegistryResolver
+from citation_verifier_mcp.verification import VerificationService
+from citation_verifier_mcp.watchdog import LoopWatchdog
+from tests.conftest import VALID_DOI, FakeVerifier
+
+
+class DownVerifier(FakeVerifier):
+    """Fails every lookup like an unreachable Crossref."""
+
+    def verify_doi(self, doi: str) -> dict:
+        self.calls.append(doi)
+        return {"verified": False, "doi": doi, "error": "Network error: unreachable"}
+
+
+class TestCircuitBreaker:
+    """Test failing fast while upstream is down."""
+
+    def test_opens_and_probes(self) -> None:
+        """Test: Does the breaker open after repeated failures and close after a good probe?"""
+        breaker = CircuitBreaker(threshold=3, cooldown=0.05)
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record(False)
+
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        breaker.record(True)
+        assert breaker.state == CLOSED
+
+    async def test_lookups_fail_fast_while_open(self) -> None:
+        """Test: Are upstream calls skipped while open, with cache hits still served?"""
+        service = VerificationService(
+            VerificationCache(), breaker=CircuitBreaker(threshold=2, cooldown=60)
+        )
+        await service.verify(FakeVerifier(), VALID_DOI)
+        verifier = DownVerifier()
+
+        for i in range(4):
+            record = await service.verify(verifier, f"10.1/down-{i}")
+            assert not record.verified
+
+        assert len(verifier.calls) == 2
+        assert "Upstream unavailable" in record.error
+        assert (await service.verify(verifier, VALID_DOI)).verified
+
+    async def test_fallback_registry_outage_does_not_open(self) -> None:
+        """Test: Do Crossref 404s with DataCite/doi.org down leave the breaker closed?"""
+
+        class DownFallbacks(RegistryResolver):
+            def lookup_datacite(self, doi: str) -> Optional[Dict[str, Any]]:
+                raise ConnectionError("DataCite unreachable")
+
+            def lookup_handle(self, doi: str) -> Optional[Dict[str, Any]]:
+                raise ConnectionError("doi.org unreachable")
+
+        breaker = CircuitBreaker(threshold=3, cooldown=60)
+        service = VerificationService(
+            VerificationCache(), resolver=DownFallbacks(), breaker=breaker
+        )
+
+        for i in range(5):
+            record = await service.verify(FakeVerifier(), f"10.1/unknown-{i}")
+            assert record.status is Status.ERROR
+
+        assert breaker.state == CLOSED
+        assert (await service.verify(FakeVerifier(), VALID_DOI)).verified
+
+
+class TestReadiness:
+    """Test the readiness signals and thresholds."""
+
+    async def test_loop_lag_detects_blocking(self) -> None:
+        """Test: Does blocking the event loop show up as lag?"""
+        monitor = LoopLagMonitor(interval=0.01)
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.03)
+        time.sleep(0.15)
+        await asyncio.sleep(0.03)
+        task.cancel()
+
+        assert monitor.lag >= 0.1
+
+    def test_probe_statuses(self) -> None:
+        """Test: Is each failing check reported with its own status?"""
+        probe = ReadinessProbe(max_queue=10, max_lag=0.1)
+        breaker = CircuitBreaker(threshold=1)
+
+        assert probe.check(True, True, 0, breaker)[0] == "ready"
+        assert probe.check(False, True, 0, breaker)[0] == "warming"
+        status, checks = probe.check(True, True, 11, breaker)
+        assert status == "overloaded"
+        assert checks["queue"] == {"ok": False, "depth": 11, "limit": 10}
+
+        probe.lag_monitor.sample(0.2)
+        assert probe.check(True, True, 0)[0] == "overloaded"
+
+        breaker.record(False)
+        status, checks = ReadinessProbe().check(True, True, 0, breaker)
+        assert status == "upstream_unavailable"
+        assert checks["upstream"]["state"] == OPEN
+
+
+def block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class TestLoopWatchdog:
+    """Test finding the code that blocks the event loop."""
+
+    async def test_reports_blocking_stack(self) -> None:
+        """Test: Is a blocking call logged with its stack and full duration?"""
+        watchdog = LoopWatchdog(threshold=0.05)
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            block_the_loop(0.25)
+            await asyncio.sleep(0.1)
+        finally:
+            watchdog.stop()
+
+        stalls = watchdog.recent()
+        assert len(stalls) == 1
+        assert "block_the_loop" in stalls[0]["stack"]
+        assert stalls[0]["blocked_ms"] >= 200
+
+    async def test_quiet_loop_not_reported(self) -> None:
+        """Test: Does a loop that only awaits stay unreported?"""
+        watchdog = LoopWatchdog(threshold=0.05)
+        watchdog.start()
+        try:
+            for _ in range(10):
+                await asyncio.sleep(0.02)
+        finally:
+            watchdog.stop()
+
+        assert watchdog.recent() == []
+
+
+class TestHealthEndpoints:
+    """Test liveness and readiness over HTTP."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+        from citation_verifier_mcp import websocket_server
+
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(websocket_server, "readiness", ReadinessProbe(max_lag=0.1))
+            monkeypatch.setattr(
+                websocket_server,
+                "verification_service",
+                VerificationService(VerificationCache(), breaker=CircuitBreaker(threshold=1)),
+            )
+            yield client
+
+    def test_ready_until_overloaded(self, client: TestClient) -> None:
+        """Test: Does /ready turn 503 when the loop lags, while /health stays up?"""
+        from citation_verifier_mcp import websocket_server
+
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert all(check["ok"] for check in response.json()["checks"].values())
+
+        websocket_server.readiness.lag_monitor.sample(0.5)
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "overloaded"
+        assert client.get("/health").status_code == 200
+
+    def test_not_ready_while_upstream_down(self, client: TestClient) -> None:
+        """Test: Does an open circuit breaker take the instance out of rotation?"""
+        from citation_verifier_mcp import websocket_server
+
+        breaker = websocket_server.verification_service.breaker
+        assert breaker is not None
+        breaker.record(False)
+
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "upstream_unavailable"
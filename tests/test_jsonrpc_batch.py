@@ -0,0 +1,139 @@
+"""
+Batch tests - "Can clients send many JSON-RPC requests at once?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.jsonrpc import handle_batch
+from citation_verifier_mcp.streamable_http import SESSION_HEADER
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+
+def verify_request(request_id: int, doi: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "verify_citation", "arguments": {"doi": doi}},
+    }
+
+
+BATCH: List[Any] = [
+    verify_request(1, VALID_DOI),
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    verify_request(2, INVALID_DOI),
+    {"jsonrpc": "2.0", "id": 3, "method": "tools/list"},
+]
+
+
+async def echo(message: Dict[str, Any]) -> Dict[str, Any]:
+    await asyncio.sleep(0.01)
+    return {"jsonrpc": "2.0", "id": message.get("id"), "result": message.get("method")}
+
+
+class TestHandleBatch:
+    """Test batch processing independent of the transport."""
+
+    async def test_responses_in_order_without_notifications(self) -> None:
+        """Test: Are responses returned in request order, skipping notifications?"""
+        responses = await handle_batch(BATCH, echo)
+
+        assert isinstance(responses, list)
+        assert [r["id"] for r in responses] == [1, 2, 3]
+
+    async def test_invalid_and_empty_batches(self) -> None:
+        """Test: Are non-object entries and empty or oversized batches rejected?"""
+        responses = await handle_batch([42, {"jsonrpc": "2.0", "id": 1, "method": "x"}], echo)
+        assert isinstance(responses, list)
+        assert responses[0]["error"]["code"] == -32600
+        assert responses[1]["id"] == 1
+
+        empty = await handle_batch([], echo)
+        assert isinstance(empty, dict) and empty["error"]["code"] == -32600
+        oversized = await handle_batch([{"id": i} for i in range(5)], echo, max_size=4)
+        assert isinstance(oversized, dict) and "exceeds" in oversized["error"]["message"]
+
+    async def test_notification_only_batch_has_no_response(self) -> None:
+        """Test: Does a batch of notifications produce nothing to send?"""
+        assert await handle_batch([{"jsonrpc": "2.0", "method": "notifications/x"}], echo) is None
+
+    async def test_concurrency_is_bounded(self) -> None:
+        """Test: Are at most `concurrency` messages handled at once?"""
+        running = peak = 0
+
+        async def tracked(message: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"id": message["id"]}
+
+        await handle_batch([{"id": i} for i in range(10)], tracked, concurrency=3)
+
+        assert peak == 3
+
+
+class TestTransportBatches:
+    """Test batches over each remote transport."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+        from citation_verifier_mcp import websocket_server
+
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(
+                websocket_server, "verification_service", VerificationService(VerificationCache())
+            )
+            yield client
+
+    def assert_batch_response(self, responses: List[Dict[str, Any]]) -> None:
+        assert [r["id"] for r in responses] == [1, 2, 3]
+        assert "Citation Verified" in str(responses[0]["result"])
+        assert "Citation Not Verified" in str(responses[1]["result"])
+        assert len(responses[2]["result"]["tools"]) == 4
+
+    def test_http_batch(self, client: TestClient) -> None:
+        """Test: Does POST / answer a batch with an array?"""
+        response = client.post("/", json=BATCH)
+
+        assert response.status_code == 200
+        self.assert_batch_response(response.json())
+
+    def test_http_notification_batch(self, client: TestClient) -> None:
+        """Test: Does a batch of only notifications get 202 with no body?"""
+        response = client.post("/messages", json=[{"jsonrpc": "2.0", "method": "notifications/x"}])
+
+        assert response.status_code == 202
+        assert response.content == b""
+
+    def test_websocket_batch(self, client: TestClient) -> None:
+        """Test: Does the WebSocket answer a batch with one array message?"""
+        with client.websocket_connect("/mcp") as websocket:
+            websocket.send_text(json.dumps(BATCH))
+            self.assert_batch_response(json.loads(websocket.receive_text()))
+
+    def test_streamable_http_batch(self, client: TestClient) -> None:
+        """Test: Does the Streamable HTTP endpoint answer a batch with an array?"""
+        initialized = client.post(
+            "/mcp", json={"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}}
+        )
+        headers = {SESSION_HEADER: initialized.headers[SESSION_HEADER]}
+
+        response = client.post("/mcp", json=BATCH, headers=headers)
+
+        self.assert_batch_response(response.json())
+        rejected = client.post(
+            "/mcp", json=[{"jsonrpc": "2.0", "id": 9, "method": "initialize"}], headers=headers
+        )
+        assert rejected.status_code == 400
@@ -0,0 +1,162 @@
+"""
+Adaptive limit tests - "Does upstream concurrency follow Crossref's capacity?"
+
+These tests feed the limit synthetic round trips and use an offline fake
+verifier, so they run without Crossref access.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from citation_verifier_mcp import metrics
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.limits import AdaptiveLimit
+from citation_verifier_mcp.records import Status
+from citation_verifier_mcp.registries import RegistryResolver
+from citation_verifier_mcp.scheduling import FairScheduler
+from citation_verifier_mcp.tenants import ANONYMOUS
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+
+class RateLimitedVerifier(FakeVerifier):
+    """Answers like Crossref does when it is shedding load."""
+
+    def verify_doi(self, doi: str) -> dict:
+        self.calls.append(doi)
+        return {"doi": doi, "verified": False, "error": "429 Too Many Requests"}
+
+
+class SlowFallbackResolver(RegistryResolver):
+    """Fallback registries that take their time to not know a DOI either."""
+
+    def lookup_datacite(self, doi: str) -> Optional[Dict[str, Any]]:
+        time.sleep(0.2)
+        return None
+
+    def lookup_handle(self, doi: str) -> Optional[Dict[str, Any]]:
+        time.sleep(0.2)
+        return None
+
+
+class TestAdaptiveLimit:
+    """Test additive increase and multiplicative decrease."""
+
+    def test_grows_while_fast_and_busy(self) -> None:
+        """Test: Does the limit grow by about one per round of fast lookups?"""
+        limit = AdaptiveLimit(initial=4, max_limit=6)
+        for _ in range(4):
+            limit.observe(0.1, inflight=4)
+        assert limit.limit == 4
+        limit.observe(0.1, inflight=4)
+        assert limit.limit == 5
+
+        for _ in range(100):
+            limit.observe(0.1, inflight=limit.limit)
+        assert limit.limit == 6
+
+    def test_idle_limit_does_not_grow(self) -> None:
+        """Test: Is the limit left alone when it isn't being used?"""
+        limit = AdaptiveLimit(initial=8)
+        for _ in range(50):
+            limit.observe(0.1, inflight=1)
+
+        assert limit.limit == 8
+
+    def test_backs_off_on_errors_and_latency(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Do errors and slow lookups shrink the limit, once per round trip?"""
+        now = [1000.0]
+        monkeypatch.setattr("citation_verifier_mcp.limits.time.monotonic", lambda: now[0])
+        limit = AdaptiveLimit(initial=20, backoff=0.5)
+        limit.observe(0.1, inflight=1)
+
+        for _ in range(5):
+            limit.observe(0.1, inflight=20, dropped=True)
+        assert limit.limit == 10
+
+        now[0] += 1.0
+        limit.observe(0.5, inflight=10)
+        assert limit.limit == 5
+        assert metrics.gauge("citation_upstream_concurrency_limit", "").value() == 5
+
+        for _ in range(20):
+            now[0] += 1.0
+            limit.observe(0.1, inflight=5, dropped=True)
+        assert limit.limit == 1
+
+    def test_baseline_follows_upstream(self) -> None:
+        """Test: Does the baseline rise when Crossref is slower for a while?"""
+        limit = AdaptiveLimit(initial=8, window=10)
+        for _ in range(10):
+            limit.observe(0.1, inflight=1)
+        assert limit.baseline == 0.1
+
+        for _ in range(20):
+            limit.observe(0.15, inflight=1)
+        assert limit.baseline == 0.15
+
+
+class TestAdaptiveScheduling:
+    """Test the limit driving the upstream scheduler."""
+
+    async def test_waiters_let_in_as_limit_grows(self) -> None:
+        """Test: Are queued lookups started as soon as the limit rises?"""
+        scheduler = FairScheduler(limit=AdaptiveLimit(initial=1, max_limit=4))
+        started: List[int] = []
+        release = asyncio.Event()
+
+        async def lookup(i: int) -> None:
+            async with scheduler.slot(ANONYMOUS):
+                started.append(i)
+                await release.wait()
+
+        tasks = [asyncio.create_task(lookup(i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        assert started == [0]
+
+        scheduler.observe(0.1)
+        await asyncio.sleep(0.01)
+        assert started == [0, 1]
+        assert scheduler.stats()["capacity"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    async def test_rate_limited_lookups_lower_the_limit(self) -> None:
+        """Test: Do rate-limited upstream answers lower the limit?"""
+        limit = AdaptiveLimit(initial=8, backoff=0.5)
+        service = VerificationService(VerificationCache(), scheduler=FairScheduler(limit=limit))
+
+        await service.verify(RateLimitedVerifier(), "10.1/busy")
+        assert limit.limit == 4
+
+        # A few lookups that don't fill the limit leave it where it is
+        await service.verify_many(FakeVerifier(), [VALID_DOI, "10.1/a", "10.1/b"])
+        assert limit.limit == 4
+        assert limit.baseline is not None
+        assert "citation_upstream_concurrency_limit" in metrics.render()
+
+    async def test_fallback_registries_are_not_timed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Is only the Crossref call timed, not slow DataCite/doi.org fallbacks?"""
+        scheduler = FairScheduler(limit=AdaptiveLimit(initial=8))
+        observed: List[Any] = []
+        observe = scheduler.observe
+
+        def spy(rtt: float, dropped: bool = False) -> None:
+            observed.append((rtt, dropped))
+            observe(rtt, dropped)
+
+        monkeypatch.setattr(scheduler, "observe", spy)
+        service = VerificationService(
+            VerificationCache(), scheduler=scheduler, resolver=SlowFallbackResolver()
+        )
+
+        record = await service.verify(FakeVerifier(), INVALID_DOI)
+
+        assert record.status is Status.NOT_FOUND
+        [(rtt, dropped)] = observed
+        assert rtt < 0.1
+        assert not dropped
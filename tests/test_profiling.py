@@ -0,0 +1,179 @@
+"""
+Profiling tests - "Can we diagnose latency on a live instance?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.profiling import ProfilerBusyError, SamplingProfiler, SlowRequestLog
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import VALID_DOI, FakeVerifier
+
+ADMIN_TOKEN = "test-admin-token"
+
+
+def spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+class TestSamplingProfiler:
+    """Test the in-process sampling profiler."""
+
+    def test_collapsed_stacks_include_running_code(self) -> None:
+        """Test: Does a profile show what other threads are doing?"""
+        stop = threading.Event()
+        worker = threading.Thread(target=spin_until, args=(stop,), name="spinner")
+        worker.start()
+        try:
+            stacks = SamplingProfiler().profile(0.2, interval=0.005)
+        finally:
+            stop.set()
+            worker.join()
+
+        spinner = [line for line in stacks.splitlines() if line.startswith("spinner;")]
+        assert spinner
+        assert "spin_until (test_profiling.py" in spinner[0]
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks.splitlines())
+
+    def test_one_profile_at_a_time(self) -> None:
+        """Test: Is a second concurrent profile refused?"""
+        profiler = SamplingProfiler()
+        worker = threading.Thread(target=profiler.profile, args=(0.3,))
+        worker.start()
+        time.sleep(0.05)
+        try:
+            with pytest.raises(ProfilerBusyError):
+                profiler.profile(0.1)
+        finally:
+            worker.join()
+
+
+class TestSlowRequestLog:
+    """Test capture of slow tool calls."""
+
+    async def test_slow_call_records_stage_breakdown(self) -> None:
+        """Test: Is a slow call logged with arguments and per-stage timings?"""
+        log = SlowRequestLog(threshold=0.0)
+        service = VerificationService(VerificationCache())
+
+        with log.track("verify_citation", {"doi": VALID_DOI}):
+            await service.verify(FakeVerifier(), VALID_DOI)
+
+        [entry] = log.recent()
+        assert entry["tool"] == "verify_citation"
+        assert entry["arguments"] == {"doi": VALID_DOI}
+        assert set(entry["stages_ms"]) == {"cache.lookup", "upstream.crossref"}
+
+    async def test_fast_call_is_not_logged(self) -> None:
+        """Test: Are calls under the threshold ignored?"""
+        log = SlowRequestLog(threshold=60.0)
+        with log.track("verify_citation", {"doi": VALID_DOI}):
+            pass
+
+        assert log.recent() == []
+
+    def test_large_arguments_are_summarized(self) -> None:
+        """Test: Are big batches shortened in the log?"""
+        log = SlowRequestLog(threshold=0.0)
+        log.record("check_citations", {"citations": [{"doi": VALID_DOI}] * 50}, 1.0, [])
+
+        assert log.recent()[0]["arguments"]["citations"]["items"] == 50
+
+    async def test_opt_in_and_appended_off_the_loop(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Is the log off by default, and written to its file from a worker thread?"""
+        monkeypatch.delenv("CITATION_SLOW_REQUEST_MS", raising=False)
+        assert SlowRequestLog.from_env() is None
+
+        path = tmp_path / "slow.jsonl"
+        writers = []
+        log = SlowRequestLog(threshold=0.0, path=str(path))
+        append = log._append
+
+        def spy(*args: Any) -> None:
+            writers.append(threading.current_thread())
+            append(*args)
+
+        monkeypatch.setattr(log, "_append", spy)
+        with log.track("verify_citation", {"doi": VALID_DOI}):
+            pass
+        for _ in range(100):
+            if path.exists() and path.read_text().endswith("\n"):
+                break
+            await asyncio.sleep(0.01)
+
+        assert json.loads(path.read_text())["tool"] == "verify_citation"
+        assert writers and writers[0] is not threading.main_thread()
+
+
+class TestAdminEndpoints:
+    """Test the admin-only diagnostic endpoints."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+        from citation_verifier_mcp import websocket_server
+
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "admin_token", ADMIN_TOKEN)
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(
+                websocket_server, "verification_service", VerificationService(VerificationCache())
+            )
+            monkeypatch.setattr(websocket_server, "slow_requests", SlowRequestLog(threshold=0.0))
+            yield client
+
+    def test_admin_endpoints_need_the_token(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Are the admin endpoints hidden or refused without the token?"""
+        from citation_verifier_mcp import websocket_server
+
+        assert client.get("/admin/slow-requests").status_code == 401
+        wrong = {"Authorization": "Bearer nope"}
+        assert client.get("/admin/slow-requests", headers=wrong).status_code == 401
+
+        monkeypatch.setattr(websocket_server, "admin_token", None)
+        assert client.get("/admin/profile").status_code == 404
+
+    def test_profile_endpoint(self, client: TestClient) -> None:
+        """Test: Does the profile endpoint return collapsed stacks?"""
+        response = client.get(
+            "/admin/profile",
+            params={"seconds": 0.1},
+            headers={"Authorization": f"Bearer {ADMIN_TOKEN}"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.strip()
+
+    def test_slow_tool_calls_are_listed(self, client: TestClient) -> None:
+        """Test: Does a slow tools/call show up in the slow-request log?"""
+        client.post(
+            "/messages",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {"name": "verify_citation", "arguments": {"doi": VALID_DOI}},
+            },
+        )
+
+        response = client.get(
+            "/admin/slow-requests", headers={"Authorization": f"Bearer {ADMIN_TOKEN}"}
+        )
+        [entry] = response.json()["requests"]
+        assert entry["tool"] == "verify_citation"
+        assert {"mcp.dispatch", "cache.lookup", "format"} <= set(entry["stages_ms"])
@@ -0,0 +1,68 @@
+"""
+Record tests - "Are cached results compact?"
+
+These tests check the slotted result record and its conversion to and from
+the verifier's result dicts.
+"""
+
+import tracemalloc
+
+import pytest
+
+from citation_verifier_mcp.records import Status, VerificationRecord, as_record
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+
+class TestVerificationRecord:
+    """Test the compact verification record."""
+
+    def test_round_trip_verified_result(self) -> None:
+        """Test: Does a verified result survive conversion to a record and back?"""
+        result = FakeVerifier().verify_doi(VALID_DOI)
+        record = VerificationRecord.from_dict(result)
+
+        assert record.status is Status.VERIFIED
+        assert record.verified
+        assert record.url == result["url"]
+        assert record.to_dict() == {**result, "source": "crossref"}
+
+    def test_statuses(self) -> None:
+        """Test: Are not-found and error results told apart?"""
+        not_found = as_record(FakeVerifier().verify_doi(INVALID_DOI))
+        error = as_record({"verified": False, "doi": VALID_DOI, "error": "Network error: down"})
+
+        assert not_found.status is Status.NOT_FOUND
+        assert error.status is Status.ERROR
+        assert not error.to_dict()["verified"]
+        assert as_record(error) is error
+
+    def test_records_are_slotted_and_share_strings(self) -> None:
+        """Test: Do records avoid per-instance dicts and share repeated strings?"""
+        a = VerificationRecord.from_dict(FakeVerifier().verify_doi(VALID_DOI))
+        b = VerificationRecord.from_dict(FakeVerifier().verify_doi(VALID_DOI))
+
+        assert not hasattr(a, "__dict__")
+        assert a.publisher is b.publisher
+        with pytest.raises(AttributeError):
+            a.title = "changed"  # type: ignore[misc]
+
+    def test_records_use_less_memory_than_dicts(self) -> None:
+        """Test: Do cached records take a fraction of the memory of result dicts?"""
+        verifier = FakeVerifier(known=[f"10.1000/{i}" for i in range(5000)])
+
+        def measure(convert: bool) -> int:
+            tracemalloc.start()
+            kept = []
+            for i in range(5000):
+                # Copy the strings so each result owns its fields, as after JSON parsing
+                result = {
+                    k: "".join(v) if isinstance(v, str) else v
+                    for k, v in verifier.verify_doi(f"10.1000/{i}").items()
+                }
+                kept.append(VerificationRecord.from_dict(result) if convert else result)
+                del result
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return size
+
+        assert measure(convert=True) < 0.6 * measure(convert=False)
@@ -0,0 +1,139 @@
+"""
+Registry tests - "Are DOIs outside Crossref still verified?"
+
+These tests replace the DataCite and doi.org lookups with offline fakes.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.records import Status, VerificationRecord
+from citation_verifier_mcp.registries import NOT_FOUND_ERROR, RegistryResolver, registry_note
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+ZENODO_DOI = "10.5281/zenodo.1234"
+
+
+class FakeResolver(RegistryResolver):
+    """Resolver whose fallback registries answer from memory."""
+
+    def __init__(self, datacite: Any = (), handle: Any = (), **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.datacite = set(datacite)
+        self.handle = set(handle)
+        self.handle_delay = 0.0
+        self.lookups_made: list = []
+
+    def lookup_datacite(self, doi: str) -> Optional[Dict[str, Any]]:
+        self.lookups_made.append(("datacite", doi))
+        if doi not in self.datacite:
+            return None
+        return {"verified": True, "doi": doi, "title": "A dataset", "source": "datacite"}
+
+    def lookup_handle(self, doi: str) -> Optional[Dict[str, Any]]:
+        self.lookups_made.append(("doi.org", doi))
+        time.sleep(self.handle_delay)
+        if doi not in self.handle:
+            return None
+        return {"verified": True, "doi": doi, "title": "Unknown", "source": "doi.org"}
+
+
+class TestRegistryResolver:
+    """Test fallback to DataCite and the doi.org handle API."""
+
+    async def test_crossref_hit_skips_fallbacks(self) -> None:
+        """Test: Are Crossref DOIs resolved without querying other registries?"""
+        resolver = FakeResolver(datacite=[VALID_DOI])
+        result = await resolver.resolve(FakeVerifier(), VALID_DOI)
+
+        assert result["verified"]
+        assert resolver.lookups_made == []
+        assert resolver.route_for(VALID_DOI) == "crossref"
+
+    async def test_crossref_miss_falls_back_to_datacite(self) -> None:
+        """Test: Is a DataCite DOI verified after a Crossref miss?"""
+        resolver = FakeResolver(datacite=[ZENODO_DOI], parallel=False)
+        result = await resolver.resolve(FakeVerifier(), ZENODO_DOI)
+
+        assert result["verified"]
+        assert result["source"] == "datacite"
+        assert resolver.lookups_made == [("datacite", ZENODO_DOI)]
+
+    async def test_learned_prefix_goes_straight_to_registry(self) -> None:
+        """Test: Do later DOIs with a learned prefix skip Crossref?"""
+        verifier = FakeVerifier()
+        other = "10.5281/zenodo.5678"
+        resolver = FakeResolver(datacite=[ZENODO_DOI, other])
+
+        await resolver.resolve(verifier, ZENODO_DOI)
+        await resolver.resolve(verifier, other)
+
+        assert verifier.calls == [ZENODO_DOI]
+        assert resolver.route_for(other) == "datacite"
+
+    async def test_parallel_first_positive_wins(self) -> None:
+        """Test: Does a fast positive answer win without waiting for slower registries?"""
+        resolver = FakeResolver(datacite=[ZENODO_DOI], handle=[ZENODO_DOI])
+        resolver.handle_delay = 0.5
+
+        started = time.monotonic()
+        result = await resolver.resolve(FakeVerifier(), ZENODO_DOI)
+
+        assert result["source"] == "datacite"
+        assert time.monotonic() - started < 0.4
+
+    async def test_miss_everywhere_is_not_found(self) -> None:
+        """Test: Is a DOI unknown to every registry reported as not found?"""
+        resolver = FakeResolver()
+        result = await resolver.resolve(FakeVerifier(), INVALID_DOI)
+
+        assert not result["verified"]
+        assert result["error"] == NOT_FOUND_ERROR
+
+    async def test_unreachable_registry_is_not_cached(self) -> None:
+        """Test: Does a fallback network failure avoid caching a negative result?"""
+
+        class DownResolver(FakeResolver):
+            def lookup_datacite(self, doi: str) -> Optional[Dict[str, Any]]:
+                raise ConnectionError("unreachable")
+
+        service = VerificationService(VerificationCache(), resolver=DownResolver())
+        result = await service.verify(FakeVerifier(), INVALID_DOI)
+
+        assert "unreachable" in result.error
+        assert INVALID_DOI not in service.cache
+
+    async def test_routed_registry_outage_is_not_cached(self) -> None:
+        """Test: Is a DOI routed to a registry that is down left uncached, not "not found"?"""
+
+        class FlakyResolver(FakeResolver):
+            down = False
+
+            def lookup_datacite(self, doi: str) -> Optional[Dict[str, Any]]:
+                if self.down:
+                    raise ConnectionError("DataCite unreachable")
+                return super().lookup_datacite(doi)
+
+        resolver = FlakyResolver(datacite=[ZENODO_DOI])
+        service = VerificationService(VerificationCache(), resolver=resolver)
+        await service.verify(FakeVerifier(), ZENODO_DOI)
+        resolver.down = True
+        other = "10.5281/zenodo.5678"
+
+        result = await service.verify(FakeVerifier(), other)
+
+        assert result.status is Status.ERROR
+        assert "DataCite unreachable" in result.error
+        assert other not in service.cache
+
+    def test_registry_note(self) -> None:
+        """Test: Does the formatted note name the registry that answered?"""
+        for source, expected in [
+            ("crossref", "Crossref database"),
+            ("datacite", "DataCite database"),
+            ("doi.org", "handle system"),
+        ]:
+            record = VerificationRecord(Status.VERIFIED, ZENODO_DOI, source=source)
+            assert expected in registry_note(record)
@@ -0,0 +1,201 @@
+"""
+Replay tests - "Can recorded traffic be re-driven offline to tune the server?"
+
+These tests record from an offline fake verifier and replay against the
+recording, so they run without Crossref access.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.recording import (
+    RecordedCall,
+    Recording,
+    TrafficRecorder,
+    hash_doi,
+    load_recording,
+)
+from citation_verifier_mcp.records import Status, VerificationRecord
+from citation_verifier_mcp.replay import RecordedVerifier, main, replay
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+
+def verify_request(doi: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "verify_citation", "arguments": {"doi": doi, "title": "Secret"}},
+    }
+
+
+def synthetic_recording(calls: int, unique: int, latency: float = 0.01) -> Recording:
+    recording = Recording()
+    for i in range(unique):
+        doi = f"10.1000/doi-{i}"
+        recording.responses[doi].append((VerificationRecord(Status.VERIFIED, doi), latency))
+    for i in range(calls):
+        recording.calls.append(
+            RecordedCall(i * 0.001, "verify_citation", [f"10.1000/doi-{i % unique}"])
+        )
+    return recording
+
+
+class TestRecording:
+    """Test recording traffic and upstream responses."""
+
+    async def test_records_calls_and_upstream(self, tmp_path: Path) -> None:
+        """Test: Are DOI calls and upstream outcomes recorded and loaded back?"""
+        recorder = TrafficRecorder(str(tmp_path / "traffic.jsonl"))
+        service = VerificationService(VerificationCache(), recorder=recorder)
+
+        recorder.call("verify_citation", {"doi": VALID_DOI, "title": "Secret"})
+        await service.verify(FakeVerifier(), VALID_DOI)
+        recorder.call("check_citations", {"citations": [{"doi": VALID_DOI}, {"doi": INVALID_DOI}]})
+        await service.verify_many(FakeVerifier(), [VALID_DOI, INVALID_DOI])
+        recorder.call("search_citation", {"title": "Secret"})
+
+        assert "Secret" not in (tmp_path / "traffic.jsonl").read_text()
+        recording = load_recording(str(tmp_path / "traffic.jsonl"))
+        assert [call.dois for call in recording.calls] == [[VALID_DOI], [VALID_DOI, INVALID_DOI]]
+        assert recording.responses[VALID_DOI][0][0].verified
+        assert recording.responses[INVALID_DOI][0][0].status is Status.NOT_FOUND
+
+    async def test_hashed_dois(self, tmp_path: Path) -> None:
+        """Test: Does hashing hide DOIs and titles but keep prefixes and sizes?"""
+        path = tmp_path / "traffic.jsonl"
+        recorder = TrafficRecorder(str(path), hash_dois=True)
+        service = VerificationService(VerificationCache(), recorder=recorder)
+        recorder.call("verify_citation", {"doi": VALID_DOI})
+        await service.verify(FakeVerifier(), VALID_DOI)
+
+        text = path.read_text()
+        assert "nature12373" not in text and "quantum" not in text.lower()
+        recording = load_recording(str(path))
+        key = hash_doi(VALID_DOI)
+        assert key.startswith("10.1038/")
+        assert recording.calls[0].dois == [key]
+        assert recording.responses[key][0][0].verified
+
+    async def test_hashed_errors_and_venues(self, tmp_path: Path) -> None:
+        """Test: Are error text, journal and publisher scrubbed as well?"""
+        path = tmp_path / "traffic.jsonl"
+        recorder = TrafficRecorder(str(path), hash_dois=True)
+        secret = "10.5555/secret-manuscript"
+        error = (
+            f"Network error: HTTPSConnectionPool: Max retries exceeded with url: /works/{secret}"
+        )
+        recorder.upstream(secret, VerificationRecord(Status.ERROR, secret, error=error), 0.1)
+        await VerificationService(VerificationCache(), recorder=recorder).verify(
+            FakeVerifier(), VALID_DOI
+        )
+
+        text = path.read_text()
+        assert "secret" not in text and "Network" not in text
+        assert "Nature" not in text and "Springer" not in text
+        [(record, _)] = load_recording(str(path)).responses[hash_doi(secret)]
+        assert record.status is Status.ERROR
+        assert len(record.error) == len(error)
+
+    def test_rejects_other_files(self, tmp_path: Path) -> None:
+        """Test: Is a file that isn't a recording refused?"""
+        path = tmp_path / "access.jsonl"
+        path.write_text(json.dumps({"ts": 1, "doi": VALID_DOI}) + "\n")
+
+        with pytest.raises(ValueError):
+            load_recording(str(path))
+
+    def test_server_records_tool_calls(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Does the remote server record the calls it handles?"""
+        from citation_verifier_mcp import websocket_server
+
+        recorder = TrafficRecorder(str(tmp_path / "traffic.jsonl"))
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(websocket_server, "access_log", None)
+            monkeypatch.setattr(websocket_server, "traffic_recorder", recorder)
+            monkeypatch.setattr(
+                websocket_server,
+                "verification_service",
+                VerificationService(VerificationCache(), recorder=recorder),
+            )
+            client.post("/messages", json=verify_request(VALID_DOI))
+
+        recording = load_recording(str(tmp_path / "traffic.jsonl"))
+        assert recording.calls[0].dois == [VALID_DOI]
+        assert VALID_DOI in recording.responses
+
+
+class TestReplay:
+    """Test re-driving a recording against a local pipeline."""
+
+    async def test_upstream_calls_follow_cache_size(self) -> None:
+        """Test: Does a smaller cache show up as more upstream calls?"""
+        recording = synthetic_recording(calls=200, unique=20)
+
+        roomy = await replay(recording, speed=0, cache_size=100)
+        cramped = await replay(recording, speed=0, cache_size=5)
+
+        assert roomy["calls"] == 200
+        assert roomy["upstream"] == {"calls": 20, "unrecorded": 0}
+        assert roomy["cache"]["hits"] == 180
+        assert cramped["upstream"]["calls"] > 20
+        assert cramped["cache"]["hit_ratio"] < roomy["cache"]["hit_ratio"]
+
+    async def test_replay_is_deterministic(self) -> None:
+        """Test: Do two runs of the same recording report the same cache behaviour?"""
+        recording = synthetic_recording(calls=100, unique=30)
+
+        first = await replay(recording, speed=0, cache_size=10, concurrency=4)
+        second = await replay(recording, speed=0, cache_size=10, concurrency=4)
+
+        assert first["cache"] == second["cache"]
+        assert first["upstream"] == second["upstream"]
+
+    async def test_recorded_latency_and_speed(self) -> None:
+        """Test: Are recorded latencies replayed, scaled by the speed?"""
+        recording = synthetic_recording(calls=4, unique=4, latency=0.2)
+
+        report = await replay(recording, speed=2.0)
+
+        assert report["latency_ms"]["p50"] >= 90
+        assert report["latency_ms"]["max"] < 400
+
+    def test_responses_in_recorded_order(self) -> None:
+        """Test: Are a DOI's responses returned in order, the last one repeating?"""
+        recording = Recording()
+        recording.responses["10.1/a"] += [
+            (VerificationRecord(Status.ERROR, "10.1/a", error="Timeout"), 0.0),
+            (VerificationRecord(Status.VERIFIED, "10.1/a"), 0.0),
+        ]
+        verifier = RecordedVerifier(recording, speed=0)
+
+        assert [verifier.verify_doi("10.1/A")["verified"] for _ in range(3)] == [
+            False,
+            True,
+            True,
+        ]
+        assert not verifier.verify_doi("10.1/b")["verified"]
+        assert verifier.unrecorded == 1
+
+    def test_cli_round_trip(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test: Does the replay command report on a recorded file?"""
+        path = tmp_path / "traffic.jsonl"
+        recorder = TrafficRecorder(str(path))
+        recorder.upstream(VALID_DOI.lower(), VerificationRecord(Status.VERIFIED, VALID_DOI), 0.01)
+        for _ in range(3):
+            recorder.call("verify_citation", {"doi": VALID_DOI})
+
+        main([str(path), "--speed", "0"])
+
+        report = json.loads(capsys.readouterr().out)
+        assert report["calls"] == 3
+        assert report["upstream"]["calls"] == 1
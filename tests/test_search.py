@@ -0,0 +1,134 @@
+"""
+Search tests - "Can we find the right DOI for a citation?"
+
+These tests use an offline fake Crossref client.
+"""
+
+import asyncio
+
+import pytest
+
+from citation_verifier_mcp.search import CitationSearcher, format_search_results, score_candidate
+from citation_verifier_mcp.similarity import author_overlap, normalize_text, similarity
+from tests.conftest import VALID_DOI, FakeCrossrefClient
+
+TITLE = "A quantum gas of deeply bound ground state molecules"
+
+
+class TestSimilarity:
+    """Test the normalized string similarity scorer."""
+
+    def test_normalize_text(self) -> None:
+        """Test: Are case, accents and punctuation ignored?"""
+        assert (
+            normalize_text("  Reichsöllner, L.: A Quantum-Gas! ") == "reichsollner l a quantum gas"
+        )
+
+    def test_similarity_ignores_word_order_and_case(self) -> None:
+        """Test: Do reordered or re-cased titles still match closely?"""
+        assert similarity(TITLE, TITLE.upper()) == 1.0
+        assert similarity(TITLE, "Deeply bound ground state molecules: a quantum gas") > 0.9
+        assert similarity(TITLE, "Deep learning for protein folding") < 0.5
+
+    def test_author_overlap(self) -> None:
+        """Test: Are claimed surnames matched against the actual author list?"""
+        actual = "T. Takekoshi, L. Reichsöllner, et al."
+        assert author_overlap("Takekoshi, Reichsollner", actual) == 1.0
+        assert author_overlap("Takekoshi and Smith", actual) == 0.5
+        assert author_overlap("", actual) == 0.0
+
+
+class TestCitationSearcher:
+    """Test ranking, caching and early cutoff of Crossref searches."""
+
+    async def test_search_ranks_best_match_first(self) -> None:
+        """Test: Is the work matching title, authors and year ranked first?"""
+        searcher = CitationSearcher(client=FakeCrossrefClient(), accept_score=1.1)
+
+        candidates = await searcher.search(TITLE.lower(), authors="Takekoshi", year="2014")
+
+        assert candidates[0]["doi"] == VALID_DOI
+        assert candidates[0]["score"] > 0.95
+        assert candidates[-1]["score"] < 0.5
+
+    async def test_search_queries_are_cached(self) -> None:
+        """Test: Does repeating a search avoid another upstream query?"""
+        client = FakeCrossrefClient()
+        searcher = CitationSearcher(client=client, accept_score=1.1)
+
+        await searcher.search(TITLE, authors="Takekoshi")
+        await searcher.search(TITLE.upper(), authors="takekoshi")
+
+        assert len(client.queries) == 2  # one per query variant, none repeated
+
+    async def test_search_stops_at_confident_match(self) -> None:
+        """Test: Are slower query variants abandoned once a confident match is found?"""
+
+        class SlowAuthorQueries(FakeCrossrefClient):
+            def search_works(self, params: dict, rows: int = 5) -> list:
+                if "query.author" in params:
+                    import time
+
+                    time.sleep(0.5)
+                return super().search_works(params, rows)
+
+        searcher = CitationSearcher(client=SlowAuthorQueries(), accept_score=0.9)
+        candidates = await asyncio.wait_for(searcher.search(TITLE, authors="Takekoshi"), 0.4)
+
+        assert candidates[0]["doi"] == VALID_DOI
+
+    def test_score_candidate_penalizes_wrong_year(self) -> None:
+        """Test: Does a year mismatch lower the score?"""
+        candidate = {"title": TITLE, "authors": "T. Takekoshi", "year": "2014"}
+        assert score_candidate(candidate, TITLE, year="2014") > score_candidate(
+            candidate, TITLE, year="2009"
+        )
+
+    def test_format_search_results(self) -> None:
+        """Test: Are candidates and an empty result formatted for display?"""
+        candidate = {
+            "doi": VALID_DOI,
+            "title": TITLE,
+            "authors": "T. Takekoshi",
+            "journal": "Nature",
+            "year": "2014",
+            "score": 0.97,
+        }
+        formatted = format_search_results([candidate])
+        assert VALID_DOI in formatted
+        assert "0.97" in formatted
+        assert "No matching works" in format_search_results([])
+
+
+class TestSearchTool:
+    """Test the search_citation tool and the verify_citation fallback."""
+
+    async def test_search_tool_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Can we call the search tool through the MCP handler?"""
+        import citation_verifier_mcp.server as server_module
+
+        monkeypatch.setattr(
+            server_module, "citation_searcher", CitationSearcher(client=FakeCrossrefClient())
+        )
+        result = await server_module.handle_call_tool("search_citation", {"title": TITLE})
+
+        assert "Citation Search Results" in result[0].text
+        assert VALID_DOI in result[0].text
+
+    async def test_failed_verification_suggests_matches(
+        self, citation_verifier: object, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Does a failed DOI with a claimed title come back with suggestions?"""
+        import citation_verifier_mcp.server as server_module
+        from tests.conftest import INVALID_DOI
+
+        monkeypatch.setattr(
+            server_module, "citation_searcher", CitationSearcher(client=FakeCrossrefClient())
+        )
+        result = await server_module.handle_call_tool(
+            "verify_citation", {"doi": INVALID_DOI, "title": TITLE, "year": "2014"}
+        )
+
+        assert "Citation Not Verified" in result[0].text
+        assert "Possible Matches" in result[0].text
+        assert VALID_DOI in result[0].text
@@ -0,0 +1,208 @@
+"""
+Shared cache tests - "Do server instances share verification results?"
+
+The Redis backend is exercised against a small in-process fake that speaks
+enough of the Redis protocol for the commands the client sends.
+"""
+
+import socketserver
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.records import Status, VerificationRecord
+from citation_verifier_mcp.shared_cache import InMemoryBackend, RedisBackend, SharedCache
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Answers PING, GET, MGET and SET ... PX from a shared dict."""
+
+    server: "FakeRedisServer"
+
+    def read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def bulk(self, value: Optional[bytes]) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def lookup(self, key: bytes) -> Optional[bytes]:
+        item = self.server.data.get(key)
+        return item[1] if item and item[0] > time.time() else None
+
+    def handle(self) -> None:
+        while (args := self.read_command()) is not None:
+            command = args[0].upper()
+            self.server.commands.append(command.decode())
+            if command == b"PING":
+                self.wfile.write(b"+PONG\r\n")
+            elif command == b"GET":
+                self.wfile.write(self.bulk(self.lookup(args[1])))
+            elif command == b"MGET":
+                reply = b"*%d\r\n" % (len(args) - 1)
+                self.wfile.write(reply + b"".join(self.bulk(self.lookup(k)) for k in args[1:]))
+            elif command == b"SET":
+                self.server.data[args[1]] = (time.time() + int(args[4]) / 1000, args[2])
+                self.server.ttls[args[1].decode()] = int(args[4]) / 1000
+                self.wfile.write(b"+OK\r\n")
+            else:
+                self.wfile.write(b"-ERR unknown command\r\n")
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.data: Dict[bytes, Tuple[float, bytes]] = {}
+        self.ttls: Dict[str, float] = {}
+        self.commands: List[str] = []
+
+
+@pytest.fixture
+def redis_server() -> Iterator[FakeRedisServer]:
+    server = FakeRedisServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def redis_cache(server: FakeRedisServer, **kwargs: Any) -> SharedCache:
+    host, port = server.server_address[:2]
+    return SharedCache(RedisBackend.from_url(f"redis://{host}:{port}/0"), **kwargs)
+
+
+class TestSharedCache:
+    """Test the shared cache and its backends."""
+
+    def test_records_round_trip_through_redis(self, redis_server: FakeRedisServer) -> None:
+        """Test: Does a record stored in Redis come back unchanged?"""
+        cache = redis_cache(redis_server)
+        record = VerificationRecord(Status.VERIFIED, VALID_DOI, title="A title", year="2014")
+        cache.set(VALID_DOI, record)
+
+        assert cache.get(VALID_DOI) == record
+        assert cache.get("10.1/missing") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "errors": 0}
+
+    def test_multi_get_is_one_command(self, redis_server: FakeRedisServer) -> None:
+        """Test: Are several DOIs fetched with a single pipelined MGET?"""
+        cache = redis_cache(redis_server)
+        cache.set_many(
+            {f"10.1/{i}": VerificationRecord(Status.VERIFIED, f"10.1/{i}") for i in range(5)}
+        )
+        redis_server.commands.clear()
+
+        found = cache.get_many([f"10.1/{i}" for i in range(8)])
+
+        assert sorted(found) == [f"10.1/{i}" for i in range(5)]
+        assert redis_server.commands == ["MGET"]
+
+    def test_negative_results_use_negative_ttl(self, redis_server: FakeRedisServer) -> None:
+        """Test: Are "not found" results shared with their shorter TTL?"""
+        cache = redis_cache(redis_server, ttl=600.0, negative_ttl=60.0)
+        cache.set(VALID_DOI, VerificationRecord(Status.VERIFIED, VALID_DOI))
+        cache.set(INVALID_DOI, VerificationRecord(Status.NOT_FOUND, INVALID_DOI))
+
+        assert redis_server.ttls[cache.prefix + VALID_DOI] == 600.0
+        assert redis_server.ttls[cache.prefix + INVALID_DOI] == 60.0
+        assert cache.get(INVALID_DOI) == VerificationRecord(Status.NOT_FOUND, INVALID_DOI)
+
+    def test_unreachable_backend_is_a_miss(self) -> None:
+        """Test: Does a down Redis degrade to misses instead of errors?"""
+        cache = SharedCache(RedisBackend("127.0.0.1", 1, timeout=0.2))
+        cache.set(VALID_DOI, VerificationRecord(Status.VERIFIED, VALID_DOI))
+
+        assert cache.get(VALID_DOI) is None
+        assert cache.stats()["errors"] == 2
+
+    def test_unreadable_values_are_misses(self) -> None:
+        """Test: Are corrupt or foreign values skipped instead of failing the read?"""
+        cache = SharedCache(InMemoryBackend())
+        cache.set(VALID_DOI, VerificationRecord(Status.VERIFIED, VALID_DOI))
+        cache.backend.set_many(
+            [
+                (cache.prefix + INVALID_DOI, b"\x00not json", 60.0),
+                (cache.prefix + "10.1/foreign", b'{"some": "other app"}', 60.0),
+            ]
+        )
+
+        found = cache.get_many([VALID_DOI, INVALID_DOI, "10.1/foreign"])
+
+        assert list(found) == [VALID_DOI]
+        assert cache.get(INVALID_DOI) is None
+        assert cache.stats() == {"hits": 1, "misses": 3, "errors": 3}
+
+    def test_memory_url(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Does memory:// configure the local stand-in?"""
+        monkeypatch.setenv("CITATION_SHARED_CACHE_URL", "memory://")
+        cache = SharedCache.from_env()
+
+        assert cache is not None
+        assert isinstance(cache.backend, InMemoryBackend)
+
+
+class TestSharedTier:
+    """Test the shared cache as the second tier of VerificationService."""
+
+    async def test_second_instance_reuses_lookup(self) -> None:
+        """Test: Does a second server instance skip the upstream call?"""
+        shared = SharedCache(InMemoryBackend())
+        first = FakeVerifier()
+        second = FakeVerifier()
+
+        await VerificationService(VerificationCache(), shared=shared).verify(first, VALID_DOI)
+        await VerificationService(VerificationCache(), shared=shared).verify(second, VALID_DOI)
+        await VerificationService(VerificationCache(), shared=shared).verify(first, INVALID_DOI)
+        result = await VerificationService(VerificationCache(), shared=shared).verify(
+            second, INVALID_DOI
+        )
+
+        assert first.calls == [VALID_DOI, INVALID_DOI]
+        assert second.calls == []
+        assert result.status is Status.NOT_FOUND
+
+    async def test_batch_prefetches_with_one_request(self, redis_server: FakeRedisServer) -> None:
+        """Test: Does a batch fetch its local misses from Redis in one round trip?"""
+        shared = redis_cache(redis_server)
+        dois = [VALID_DOI, "10.1/b", "10.1/c"]
+        await VerificationService(VerificationCache(), shared=shared).verify_many(
+            FakeVerifier(known=dois), dois
+        )
+        redis_server.commands.clear()
+
+        verifier = FakeVerifier(known=dois)
+        results = await VerificationService(VerificationCache(), shared=shared).verify_many(
+            verifier, dois
+        )
+
+        assert [r.verified for r in results] == [True, True, True]
+        assert verifier.calls == []
+        assert redis_server.commands == ["MGET"]
+
+    async def test_refresh_bypasses_shared_cache(self) -> None:
+        """Test: Does a refresh go upstream even when the shared cache has the DOI?"""
+        shared = SharedCache(InMemoryBackend())
+        shared.set(VALID_DOI, VerificationRecord(Status.VERIFIED, VALID_DOI, title="Old"))
+        verifier = FakeVerifier()
+
+        record = await VerificationService(VerificationCache(), shared=shared).refresh(
+            verifier, VALID_DOI
+        )
+
+        assert verifier.calls == [VALID_DOI]
+        assert shared.get(VALID_DOI) == record
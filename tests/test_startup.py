@@ -0,0 +1,113 @@
+"""
+Startup tests - "Does the server start quickly?"
+
+These tests guard the lazy-import startup path: heavy libraries must not be
+imported until they are needed, so desktop clients get a fast MCP handshake.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Generous default so the benchmark only fails on real regressions
+STARTUP_BUDGET_SECONDS = float(os.getenv("CITATION_STARTUP_BUDGET", "5.0"))
+
+
+def loaded_modules_after_import(module: str) -> set:
+    """Import a module in a fresh interpreter and return the top-level packages loaded."""
+    code = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": SRC_DIR},
+    ).stdout
+    return {name.split(".")[0] for name in json.loads(output.splitlines()[-1])}
+
+
+class TestLazyImports:
+    """Test that heavy modules are only imported on first use."""
+
+    def test_stdio_server_defers_verifier_library(self) -> None:
+        """Test: Does importing the stdio server skip the verifier library?"""
+        modules = loaded_modules_after_import("citation_verifier_mcp.server")
+        assert "llm_citation_verifier" not in modules
+        assert "llm" not in modules
+
+    def test_remote_server_defers_mcp_and_verifier(self) -> None:
+        """Test: Does importing the remote server skip mcp and the verifier library?"""
+        modules = loaded_modules_after_import("citation_verifier_mcp.websocket_server")
+        assert "llm_citation_verifier" not in modules
+        assert "mcp" not in modules
+
+    async def test_tool_call_waits_for_background_initialization(self) -> None:
+        """Test: Does the first tool call wait for a verifier still being created?"""
+        import citation_verifier_mcp.server as server_module
+        from tests.conftest import INVALID_DOI
+
+        server_module.citation_verifier = None
+        server_module.verifier_init_task = asyncio.create_task(
+            server_module.initialize_citation_verifier()
+        )
+        try:
+            result = await server_module.handle_call_tool("verify_citation", {"doi": INVALID_DOI})
+        finally:
+            server_module.verifier_init_task = None
+
+        assert server_module.citation_verifier is not None
+        assert INVALID_DOI in result[0].text
+
+
+class TestStartupBenchmark:
+    """Benchmark time to the first MCP response over stdio."""
+
+    @pytest.mark.slow
+    def test_stdio_handshake_is_fast(self) -> None:
+        """Test: Are initialize and tools/list answered within the startup budget?"""
+        messages = [
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {},
+                    "clientInfo": {"name": "startup-benchmark", "version": "0"},
+                },
+            },
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+        ]
+
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "citation_verifier_mcp.server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env={**os.environ, "PYTHONPATH": SRC_DIR},
+        )
+        try:
+            assert process.stdin is not None and process.stdout is not None
+            process.stdin.write("".join(json.dumps(m) + "\n" for m in messages))
+            process.stdin.flush()
+
+            responses = [json.loads(process.stdout.readline()) for _ in range(2)]
+            elapsed = time.perf_counter() - started
+        finally:
+            process.kill()
+            process.wait()
+
+        print(f"\nstdio initialize + tools/list answered in {elapsed * 1000:.0f} ms")
+        assert responses[0]["id"] == 1
+        assert responses[1]["result"]["tools"][0]["name"] == "verify_citation"
+        assert elapsed < STARTUP_BUDGET_SECONDS
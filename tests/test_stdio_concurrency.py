@@ -0,0 +1,108 @@
+"""
+Stdio concurrency tests - "Can a desktop client run several tool calls at once?"
+
+These tests drive the stdio server over in-memory streams with an offline
+fake verifier, so they run without Crossref access.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+import mcp.types as types
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import VALID_DOI, FakeVerifier, SlowVerifier
+
+
+@pytest.fixture
+def stdio_server(monkeypatch: pytest.MonkeyPatch) -> Any:
+    from citation_verifier_mcp import server
+
+    monkeypatch.setattr(server, "verification_service", VerificationService(VerificationCache()))
+    monkeypatch.setattr(server, "access_log", None)
+    return server
+
+
+class TestConcurrentToolCalls:
+    """Test that stdio tool calls don't wait for each other."""
+
+    async def test_parallel_calls_take_the_time_of_the_slowest(
+        self, stdio_server: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Do parallel calls for different DOIs overlap?"""
+        monkeypatch.setattr(stdio_server, "citation_verifier", SlowVerifier(0.3))
+
+        async with create_connected_server_and_client_session(stdio_server.server) as client:
+            started = time.monotonic()
+            results = await asyncio.gather(
+                *(client.call_tool("verify_citation", {"doi": f"10.1/call-{i}"}) for i in range(4)),
+                client.send_ping(),
+            )
+            elapsed = time.monotonic() - started
+
+        assert elapsed < 0.9
+        assert all("Citation Not Verified" in str(result) for result in results[:4])
+
+    async def test_cancelled_notification_aborts_lookup(
+        self, stdio_server: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Does notifications/cancelled stop the upstream lookup?"""
+        verifier = SlowVerifier(0.5)
+        monkeypatch.setattr(stdio_server, "citation_verifier", verifier)
+        service = stdio_server.verification_service
+
+        async with create_connected_server_and_client_session(stdio_server.server) as client:
+            call = asyncio.create_task(client.call_tool("verify_citation", {"doi": "10.1/slow"}))
+            await asyncio.to_thread(verifier.started.wait, 1.0)
+            assert service.inflight == 1
+
+            # Request 0 was `initialize`, so the tool call is request 1
+            await client.send_notification(
+                types.ClientNotification(
+                    types.CancelledNotification(
+                        method="notifications/cancelled",
+                        params=types.CancelledNotificationParams(requestId=1),
+                    )
+                )
+            )
+            with pytest.raises(McpError):
+                await call
+
+        assert service.inflight == 0
+        assert "10.1/slow" not in service.cache
+
+
+class TestSingleFlightCancellation:
+    """Test cancellation of shared upstream lookups."""
+
+    async def test_lookup_survives_while_callers_remain(self) -> None:
+        """Test: Does one cancelled caller leave the lookup running for the others?"""
+        verifier = SlowVerifier(0.1)
+        service = VerificationService(VerificationCache())
+
+        first = asyncio.create_task(service.verify(verifier, VALID_DOI))
+        second = asyncio.create_task(service.verify(verifier, VALID_DOI))
+        await asyncio.sleep(0.02)
+        first.cancel()
+
+        assert (await second).verified
+        assert len(verifier.calls) == 1
+
+    async def test_last_caller_cancels_lookup(self) -> None:
+        """Test: Is the lookup cancelled when its only caller goes away?"""
+        service = VerificationService(VerificationCache())
+
+        caller = asyncio.create_task(service.verify(SlowVerifier(0.2), VALID_DOI))
+        await asyncio.sleep(0.02)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        assert service.inflight == 0
+        # A new caller starts a fresh lookup rather than joining the cancelled one
+        assert (await service.verify(FakeVerifier(), VALID_DOI)).verified
@@ -0,0 +1,217 @@
+"""
+Streamable HTTP tests - "Can clients without WebSockets stream tool calls?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.streamable_http import SESSION_HEADER, Session, SessionStore
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import INVALID_DOI, VALID_DOI, FakeVerifier
+
+BOTH = "application/json, text/event-stream"
+
+
+def parse_sse(body: str) -> List[Dict[str, Any]]:
+    """Return the events of an SSE body as {"id", "data"} dicts."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append({"id": int(fields["id"]), "data": json.loads(fields["data"])})
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    from citation_verifier_mcp import websocket_server
+
+    with TestClient(websocket_server.app) as client:
+        monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+        monkeypatch.setattr(
+            websocket_server, "verification_service", VerificationService(VerificationCache())
+        )
+        monkeypatch.setattr(websocket_server, "sessions", SessionStore())
+        yield client
+
+
+def initialize(client: TestClient) -> str:
+    response = client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}},
+        headers={"Accept": BOTH},
+    )
+    assert response.status_code == 200
+    return response.headers[SESSION_HEADER]
+
+
+def check_citations_call(progress_token: Any = None) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "name": "check_citations",
+        "arguments": {"citations": [{"doi": VALID_DOI}, {"doi": INVALID_DOI}]},
+    }
+    if progress_token is not None:
+        params["_meta"] = {"progressToken": progress_token}
+    return {"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": params}
+
+
+class TestSessions:
+    """Test Streamable HTTP session handling."""
+
+    def test_initialize_issues_a_session(self, client: TestClient) -> None:
+        """Test: Does initialize return a session id and the transport's protocol version?"""
+        response = client.post(
+            "/mcp", json={"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}}
+        )
+
+        assert response.headers[SESSION_HEADER]
+        assert response.json()["result"]["protocolVersion"] == "2025-03-26"
+
+    def test_requests_need_a_live_session(self, client: TestClient) -> None:
+        """Test: Are requests without a session, or with an unknown one, refused?"""
+        request = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+
+        assert client.post("/mcp", json=request).status_code == 400
+        assert client.post("/mcp", json=request, headers={SESSION_HEADER: "x"}).status_code == 404
+
+    def test_notifications_are_accepted(self, client: TestClient) -> None:
+        """Test: Do notifications get 202 with no body?"""
+        session_id = initialize(client)
+        response = client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+            headers={SESSION_HEADER: session_id},
+        )
+
+        assert response.status_code == 202
+        assert response.content == b""
+
+    def test_delete_ends_the_session(self, client: TestClient) -> None:
+        """Test: Does DELETE end a session?"""
+        session_id = initialize(client)
+
+        assert client.delete("/mcp", headers={SESSION_HEADER: session_id}).status_code == 204
+        request = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+        assert (
+            client.post("/mcp", json=request, headers={SESSION_HEADER: session_id}).status_code
+            == 404
+        )
+
+    def test_idle_sessions_expire(self) -> None:
+        """Test: Are sessions dropped once idle past their TTL?"""
+        store = SessionStore(ttl=0.0)
+        session = store.create()
+
+        assert store.get(session.id) is None
+
+
+class TestStreaming:
+    """Test JSON and SSE responses and stream resumption."""
+
+    def test_json_response_when_sse_not_accepted(self, client: TestClient) -> None:
+        """Test: Do clients that only accept JSON get a JSON body?"""
+        session_id = initialize(client)
+        response = client.post(
+            "/mcp",
+            json=check_citations_call(),
+            headers={SESSION_HEADER: session_id, "Accept": "application/json"},
+        )
+
+        assert response.headers["content-type"].startswith("application/json")
+        assert response.json()["id"] == 7
+
+    def test_tool_call_streams_progress_then_result(self, client: TestClient) -> None:
+        """Test: Does a streamed tool call send progress notifications before its result?"""
+        session_id = initialize(client)
+        response = client.post(
+            "/mcp",
+            json=check_citations_call(progress_token="tok"),
+            headers={SESSION_HEADER: session_id, "Accept": BOTH},
+        )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.text)
+        progress = [e["data"]["params"] for e in events[:-1]]
+        assert [p["progress"] for p in progress] == [1, 2]
+        assert all(p["progressToken"] == "tok" and p["total"] == 2 for p in progress)
+        assert events[-1]["data"]["id"] == 7
+        assert "result" in events[-1]["data"]
+
+    def test_stream_resumes_after_last_event_id(self, client: TestClient) -> None:
+        """Test: Does GET with Last-Event-ID replay the rest of the stream?"""
+        session_id = initialize(client)
+        events = parse_sse(
+            client.post(
+                "/mcp",
+                json=check_citations_call(progress_token=1),
+                headers={SESSION_HEADER: session_id, "Accept": BOTH},
+            ).text
+        )
+
+        resumed = client.get(
+            "/mcp",
+            headers={SESSION_HEADER: session_id, "Last-Event-ID": str(events[0]["id"])},
+        )
+
+        assert parse_sse(resumed.text) == events[1:]
+
+    def test_resume_after_final_event_ends_at_once(self, client: TestClient) -> None:
+        """Test: Does resuming from the final event return an empty stream instead of hanging?"""
+        session_id = initialize(client)
+        events = parse_sse(
+            client.post(
+                "/mcp",
+                json=check_citations_call(progress_token=1),
+                headers={SESSION_HEADER: session_id, "Accept": BOTH},
+            ).text
+        )
+
+        resumed = client.get(
+            "/mcp",
+            headers={SESSION_HEADER: session_id, "Last-Event-ID": str(events[-1]["id"])},
+        )
+
+        assert resumed.status_code == 200
+        assert resumed.text == ""
+
+    def test_get_without_last_event_id_is_not_allowed(self, client: TestClient) -> None:
+        """Test: Is a standalone GET stream refused (the server never pushes)?"""
+        session_id = initialize(client)
+
+        assert client.get("/mcp", headers={SESSION_HEADER: session_id}).status_code == 405
+
+    async def test_followers_wait_for_new_events(self) -> None:
+        """Test: Does a reader that caught up receive events published later?"""
+        session = Session("s")
+        stream = session.open_stream()
+        session.publish(stream, {"n": 1})
+        reader = session.follow(stream)
+
+        assert json.loads((await reader.__anext__()).data) == {"n": 1}
+        pending = reader.__anext__()
+        session.publish(session.open_stream(), {"other": True})
+        session.publish(stream, {"n": 2}, final=True)
+        assert json.loads((await pending).data) == {"n": 2}
+
+    async def test_followers_stop_when_stream_ends_without_final_event(self) -> None:
+        """Test: Do readers stop when a call dies or the session closes before its result?"""
+        session = Session("s")
+        failed, open_stream = session.open_stream(), session.open_stream()
+        session.publish(failed, {"n": 1})
+        session.publish(open_stream, {"n": 1})
+
+        session.end_stream(failed)
+        assert [event.id async for event in session.follow(failed)] == [1]
+
+        reader = session.follow(open_stream, after=2)
+        pending = asyncio.ensure_future(reader.__anext__())
+        await asyncio.sleep(0)
+        session.close()
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(pending, 1)
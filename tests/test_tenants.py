@@ -0,0 +1,261 @@
+"""
+Tenant tests - "Do API clients get their own quotas and a fair share of upstream capacity?"
+
+These tests use an offline fake verifier so they run without Crossref access.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp import metrics
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.scheduling import FairScheduler
+from citation_verifier_mcp.tenants import (
+    QUOTA_EXCEEDED,
+    QuotaExceededError,
+    Tenant,
+    TenantRegistry,
+    current_tenant,
+    subprotocol_key,
+    tenant_context,
+)
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import VALID_DOI, FakeVerifier
+
+BULK = Tenant("bulk", weight=1.0, quota=0)
+CHAT = Tenant("chat", weight=4.0, quota=2)
+
+
+def verify_request(request_id: int) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "verify_citation", "arguments": {"doi": VALID_DOI}},
+    }
+
+
+class TestTenantRegistry:
+    """Test API key lookup and quotas."""
+
+    def test_identify(self) -> None:
+        """Test: Do known keys map to tenants and unknown keys to anonymous?"""
+        registry = TenantRegistry({"bulk-key": BULK})
+
+        assert registry.identify("bulk-key") == BULK
+        assert registry.identify("nope").name == "anonymous"  # type: ignore[union-attr]
+        assert registry.identify(None).name == "anonymous"  # type: ignore[union-attr]
+
+    def test_require_key(self) -> None:
+        """Test: Are unknown keys refused when a key is required?"""
+        registry = TenantRegistry({"bulk-key": BULK}, require_key=True)
+
+        assert registry.identify("bulk-key") == BULK
+        assert registry.identify("nope") is None
+        assert registry.identify(None) is None
+
+    def test_quota_window(self) -> None:
+        """Test: Is the quota enforced and reset when the window rolls over?"""
+        registry = TenantRegistry({"chat-key": CHAT}, window=0.05)
+
+        registry.consume(CHAT)
+        registry.consume(CHAT)
+        with pytest.raises(QuotaExceededError):
+            registry.consume(CHAT)
+        assert registry.usage()["chat"] == {"used": 2, "quota": 2}
+
+        time.sleep(0.06)
+        registry.consume(CHAT)
+        assert registry.usage()["chat"]["used"] == 1
+
+    def test_from_env(self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test: Are tenants loaded from the CITATION_TENANTS file?"""
+        path = tmp_path / "tenants.json"
+        path.write_text(json.dumps({"k": {"name": "audit", "weight": 2, "quota": 10}}))
+        monkeypatch.setenv("CITATION_TENANTS", str(path))
+        monkeypatch.setenv("CITATION_REQUIRE_API_KEY", "true")
+
+        registry = TenantRegistry.from_env()
+
+        assert registry is not None
+        assert registry.identify("k") == Tenant("audit", 2.0, 10)
+        assert registry.require_key
+
+    def test_subprotocol_key(self) -> None:
+        """Test: Is an API key found among offered WebSocket subprotocols?"""
+        assert subprotocol_key(["mcp", "apikey.s3cret"]) == "s3cret"
+        assert subprotocol_key(["mcp"]) is None
+        assert subprotocol_key(None) is None
+
+    async def test_tenant_context_reaches_tasks(self) -> None:
+        """Test: Do tasks started inside tenant_context see the tenant?"""
+        with tenant_context(CHAT):
+            seen = await asyncio.create_task(self._current())
+
+        assert seen == CHAT
+        assert current_tenant().name == "anonymous"
+
+    async def _current(self) -> Tenant:
+        return current_tenant()
+
+
+class TestFairScheduler:
+    """Test weighted fair sharing of upstream slots."""
+
+    async def _run(self, scheduler: FairScheduler, tenant: Tenant, order: List[str]) -> None:
+        async with scheduler.slot(tenant):
+            order.append(tenant.name)
+            await asyncio.sleep(0.01)
+
+    async def test_capacity_respected(self) -> None:
+        """Test: Are at most `capacity` lookups run at once?"""
+        scheduler = FairScheduler(capacity=2)
+        running = peak = 0
+
+        async def lookup() -> None:
+            nonlocal running, peak
+            async with scheduler.slot(BULK):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(lookup() for _ in range(6)))
+
+        assert peak == 2
+        assert scheduler.stats() == {"capacity": 2, "active": 0, "waiting": 0}
+
+    async def test_backlogged_tenant_does_not_starve_others(self) -> None:
+        """Test: Does a late interactive lookup jump ahead of a bulk backlog?"""
+        scheduler = FairScheduler(capacity=1)
+        order: List[str] = []
+
+        bulk = [asyncio.create_task(self._run(scheduler, BULK, order)) for _ in range(8)]
+        await asyncio.sleep(0)
+        chat = asyncio.create_task(self._run(scheduler, CHAT, order))
+        await asyncio.gather(*bulk, chat)
+
+        assert order.index("chat") <= 2
+
+    async def test_weights_share_capacity(self) -> None:
+        """Test: Does a weight-4 tenant get about four slots per bulk slot?"""
+        scheduler = FairScheduler(capacity=1)
+        order: List[str] = []
+        heavy = Tenant("heavy", weight=4.0)
+
+        async with scheduler.slot(BULK):
+            tasks = [asyncio.create_task(self._run(scheduler, BULK, order)) for _ in range(5)]
+            tasks += [asyncio.create_task(self._run(scheduler, heavy, order)) for _ in range(8)]
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert order[:10].count("heavy") == 8
+
+    async def test_cancelled_waiter_releases_its_place(self) -> None:
+        """Test: Does cancelling a queued lookup leave the scheduler consistent?"""
+        scheduler = FairScheduler(capacity=1)
+        order: List[str] = []
+
+        async with scheduler.slot(BULK):
+            waiter = asyncio.create_task(self._run(scheduler, CHAT, order))
+            other = asyncio.create_task(self._run(scheduler, BULK, order))
+            await asyncio.sleep(0)
+            assert scheduler.waiting == 2
+            waiter.cancel()
+            await asyncio.sleep(0)
+        await other
+
+        assert order == ["bulk"]
+        assert scheduler.stats() == {"capacity": 1, "active": 0, "waiting": 0}
+
+
+class TestMetrics:
+    """Test the Prometheus text output."""
+
+    def test_render(self) -> None:
+        """Test: Are counters rendered with HELP, TYPE and labels?"""
+        counter = metrics.counter("citation_test_total", "A test counter", ("tenant",))
+        counter.inc(tenant='a"b')
+        counter.inc(2, tenant='a"b')
+
+        text = metrics.render()
+
+        assert "# HELP citation_test_total A test counter" in text
+        assert "# TYPE citation_test_total counter" in text
+        assert 'citation_test_total{tenant="a\\"b"} 3' in text
+        assert metrics.counter("citation_test_total", "again") is counter
+
+
+class TestTransportTenants:
+    """Test API keys and quotas over the remote transports."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+        from citation_verifier_mcp import websocket_server
+
+        registry = TenantRegistry({"chat-key": CHAT, "bulk-key": BULK})
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(websocket_server, "tenant_registry", registry)
+            monkeypatch.setattr(
+                websocket_server,
+                "verification_service",
+                VerificationService(VerificationCache(), scheduler=FairScheduler(2)),
+            )
+            yield client
+
+    def test_http_quota(self, client: TestClient) -> None:
+        """Test: Does the X-API-Key tenant's quota reject the third call?"""
+        headers = {"X-API-Key": "chat-key"}
+        for request_id in (1, 2):
+            response = client.post("/messages", json=verify_request(request_id), headers=headers)
+            assert "Citation Verified" in str(response.json()["result"])
+
+        rejected = client.post("/messages", json=verify_request(3), headers=headers)
+
+        assert rejected.json()["error"]["code"] == QUOTA_EXCEEDED
+        other = client.post("/messages", json=verify_request(4), headers={"X-API-Key": "bulk-key"})
+        assert "result" in other.json()
+
+    def test_unknown_key_refused_when_required(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Is a request without a known key refused with 401 when keys are required?"""
+        from citation_verifier_mcp import websocket_server
+
+        monkeypatch.setattr(websocket_server.tenant_registry, "require_key", True)
+
+        assert client.post("/messages", json=verify_request(1)).status_code == 401
+        assert client.post("/mcp", json=verify_request(1)).status_code == 401
+
+    def test_websocket_subprotocol_key(self, client: TestClient) -> None:
+        """Test: Is an apikey.<key> subprotocol used to identify the WebSocket tenant?"""
+        with client.websocket_connect("/mcp", subprotocols=["mcp", "apikey.chat-key"]) as ws:
+            assert ws.accepted_subprotocol == "mcp"
+            for request_id in (1, 2, 3):
+                ws.send_text(json.dumps(verify_request(request_id)))
+                response = json.loads(ws.receive_text())
+
+        assert response["error"]["code"] == QUOTA_EXCEEDED
+
+    def test_metrics_and_admin_usage(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Do /metrics and /admin/tenants report quota usage?"""
+        from citation_verifier_mcp import websocket_server
+
+        monkeypatch.setattr(websocket_server, "admin_token", "t0ken")
+        client.post("/messages", json=verify_request(1), headers={"X-API-Key": "chat-key"})
+
+        text = client.get("/metrics").text
+        usage = client.get("/admin/tenants", headers={"Authorization": "Bearer t0ken"}).json()
+
+        assert 'citation_tenant_quota_used{tenant="chat"} 1' in text
+        assert "citation_scheduler_dispatched_total" in text
+        assert usage["tenants"]["chat"] == {"used": 1, "quota": 2}
+        assert usage["scheduler"]["capacity"] == 2
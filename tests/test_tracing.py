@@ -0,0 +1,150 @@
+"""
+Tracing tests - "Can we see where a slow tool call spent its time?"
+
+Spans are exported to a JSON-lines file and read back, so these run offline.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp import tracing
+from citation_verifier_mcp.cache import VerificationCache
+from citation_verifier_mcp.tracing import FileExporter, parse_traceparent, span
+from citation_verifier_mcp.verification import VerificationService
+from tests.conftest import VALID_DOI, FakeVerifier
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+@pytest.fixture
+def trace_file(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "traces.jsonl"
+    exporter = FileExporter(str(path))
+    tracing.configure(exporter)
+    yield path
+    tracing.configure(None)
+    exporter.stream.close()
+
+
+def read_spans(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Exported spans keyed by name (last one wins)."""
+    spans: List[Dict[str, Any]] = [json.loads(line) for line in path.read_text().splitlines()]
+    return {s["name"]: s for s in spans}
+
+
+class TestTracing:
+    """Test span creation, nesting and export."""
+
+    def test_disabled_tracing_is_a_noop(self, tmp_path: Path) -> None:
+        """Test: Does tracing do nothing when no exporter is configured?"""
+        with span("work") as current:
+            current.set_attribute("ignored", True)
+
+        assert current is tracing.NOOP_SPAN
+        assert tracing.extract_context({"traceparent": TRACEPARENT}) is None
+
+    def test_traceparent_parsing(self) -> None:
+        """Test: Are W3C traceparent values parsed and bad ones ignored?"""
+        context = parse_traceparent(TRACEPARENT)
+        assert context is not None
+        assert (context.trace_id, context.span_id) == (TRACE_ID, PARENT_ID)
+        assert context.traceparent == TRACEPARENT
+        assert parse_traceparent("00-" + "0" * 32 + f"-{PARENT_ID}-01") is None
+        assert parse_traceparent("garbage") is None
+        assert parse_traceparent(None) is None
+
+    async def test_spans_nest_across_threads(self, trace_file: Path) -> None:
+        """Test: Do spans in worker threads join the caller's trace?"""
+
+        def blocking() -> None:
+            with span("in-thread"):
+                pass
+
+        with span("outer", {"k": "v"}, parent=parse_traceparent(TRACEPARENT)):
+            await asyncio.to_thread(blocking)
+
+        spans = read_spans(trace_file)
+        outer, inner = spans["outer"], spans["in-thread"]
+        assert outer["traceId"] == inner["traceId"] == TRACE_ID
+        assert outer["parentSpanId"] == PARENT_ID
+        assert inner["parentSpanId"] == outer["spanId"]
+        assert outer["attributes"] == {"k": "v"}
+        assert outer["endTimeUnixNano"] >= outer["startTimeUnixNano"]
+
+    def test_errors_mark_the_span(self, trace_file: Path) -> None:
+        """Test: Is an exception recorded on the span that raised it?"""
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+
+        assert read_spans(trace_file)["failing"]["status"] == {
+            "code": "ERROR",
+            "message": "ValueError: boom",
+        }
+
+    async def test_cache_spans(self, trace_file: Path) -> None:
+        """Test: Are cache lookups and upstream calls traced separately?"""
+        service = VerificationService(VerificationCache())
+        await service.verify(FakeVerifier(), VALID_DOI)
+
+        spans = read_spans(trace_file)
+        assert spans["cache.lookup"]["attributes"]["cache.hit"] is False
+        assert spans["upstream.crossref"]["attributes"]["doi"] == VALID_DOI
+
+
+class TestTransportTracing:
+    """Test that traces follow a request through the remote server."""
+
+    @pytest.fixture
+    def client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+        from citation_verifier_mcp import websocket_server
+
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(
+                websocket_server, "verification_service", VerificationService(VerificationCache())
+            )
+            yield client
+
+    def request(self) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {
+                "name": "verify_citation",
+                "arguments": {"doi": VALID_DOI},
+                "_meta": {"traceparent": TRACEPARENT},
+            },
+        }
+
+    def assert_request_trace(self, trace_file: Path, transport: str) -> None:
+        spans = read_spans(trace_file)
+        for name in ("mcp.request", "mcp.parse", "mcp.dispatch", "cache.lookup", "format"):
+            assert spans[name]["traceId"] == TRACE_ID
+        assert spans["mcp.request"]["parentSpanId"] == PARENT_ID
+        assert spans["mcp.request"]["attributes"]["mcp.transport"] == transport
+        assert spans["mcp.parse"]["parentSpanId"] == spans["mcp.request"]["spanId"]
+        assert spans["mcp.dispatch"]["parentSpanId"] == spans["mcp.request"]["spanId"]
+
+    def test_websocket_request_trace(self, client: TestClient, trace_file: Path) -> None:
+        """Test: Does a WebSocket tool call produce one trace under the caller's parent?"""
+        with client.websocket_connect("/mcp") as websocket:
+            websocket.send_text(json.dumps(self.request()))
+            assert "Citation Verified" in websocket.receive_text()
+
+        self.assert_request_trace(trace_file, "websocket")
+
+    def test_http_request_trace(self, client: TestClient, trace_file: Path) -> None:
+        """Test: Does an HTTP tool call produce one trace under the caller's parent?"""
+        response = client.post("/messages", json=self.request())
+        assert "Citation Verified" in str(response.json())
+
+        self.assert_request_trace(trace_file, "http")
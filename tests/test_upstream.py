@@ -0,0 +1,213 @@
+"""
+Upstream pool tests - "Is the first lookup after a restart as fast as the rest?"
+
+These tests use a local HTTP server in place of Crossref so they run without
+network access.
+"""
+
+import inspect
+import json
+import socket
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, List
+
+import pytest
+import requests
+import urllib3
+from fastapi.testclient import TestClient
+
+from citation_verifier_mcp import metrics
+from citation_verifier_mcp.health import ReadinessProbe
+from citation_verifier_mcp.upstream import DnsCache, UpstreamPool
+from tests.conftest import SAMPLE_WORKS, VALID_DOI, FakeVerifier
+
+# Host name only the patched resolver knows
+UPSTREAM_HOST = "upstream.test"
+
+
+class CrossrefHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a Crossref work, keeping the connection open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"message": SAMPLE_WORKS[0]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def upstream_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CrossrefHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://{UPSTREAM_HOST}:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def lookups(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Resolve UPSTREAM_HOST to the local server, recording every lookup."""
+    calls: List[str] = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host: str, port: Any, *args: Any, **kwargs: Any) -> Any:
+        calls.append(host)
+        if host == UPSTREAM_HOST:
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+        return real_getaddrinfo(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    return calls
+
+
+@pytest.fixture
+def pool(upstream_url: str) -> Iterator[UpstreamPool]:
+    pool = UpstreamPool(pool_size=4, prewarm_connections=3, prewarm_url=f"{upstream_url}/")
+    yield pool
+    pool.close()
+
+
+class TestLibraryInternals:
+    """Test that the requests and urllib3 internals the pool relies on still exist."""
+
+    def test_internals_the_pool_uses(self) -> None:
+        """Test: Would a requests or urllib3 upgrade that breaks the pool fail here first?"""
+        from requests.adapters import HTTPAdapter
+        from urllib3.connection import HTTPConnection
+        from urllib3.connectionpool import HTTPConnectionPool
+
+        # _CachedDnsConnection swaps the address it connects to through _dns_host
+        connection = HTTPConnection(UPSTREAM_HOST, 80)
+        assert connection._dns_host == UPSTREAM_HOST
+        assert callable(connection._new_conn)
+
+        # prewarm takes connections out of the pool and puts them back
+        pool = HTTPConnectionPool(UPSTREAM_HOST, 80, maxsize=2)
+        taken = pool._get_conn()
+        assert pool.num_connections == 1
+        pool._put_conn(taken)
+        assert pool.pool is not None and pool.pool.qsize() == 2
+
+        # The adapter picks pools by TLS settings and binds pool classes per scheme
+        assert callable(HTTPAdapter.get_connection_with_tls_context)
+        assert HTTPAdapter().poolmanager.pool_classes_by_scheme.keys() >= {"http", "https"}
+        assert "session" in inspect.signature(ssl.SSLContext.wrap_socket).parameters
+        assert int(urllib3.__version__.split(".")[0]) >= 2
+        assert tuple(int(part) for part in requests.__version__.split(".")[:3]) >= (2, 32, 2)
+
+
+class TestDnsCache:
+    """Test caching of host name lookups."""
+
+    def test_answers_reused_until_ttl(self, lookups: List[str]) -> None:
+        """Test: Is a host looked up once per TTL, and again once forgotten?"""
+        cache = DnsCache(ttl=60)
+        assert cache.resolve(UPSTREAM_HOST, 443) == ["127.0.0.1"]
+        assert cache.resolve(UPSTREAM_HOST, 443) == ["127.0.0.1"]
+        assert lookups == [UPSTREAM_HOST]
+
+        cache.forget(UPSTREAM_HOST, 443)
+        cache.resolve(UPSTREAM_HOST, 443)
+        expired = DnsCache(ttl=0)
+        expired.resolve(UPSTREAM_HOST, 443)
+        expired.resolve(UPSTREAM_HOST, 443)
+        assert len(lookups) == 4
+
+
+class TestUpstreamPool:
+    """Test pre-opening and reusing upstream connections."""
+
+    def test_prewarmed_connections_are_reused(
+        self, pool: UpstreamPool, upstream_url: str, lookups: List[str]
+    ) -> None:
+        """Test: Do concurrent first requests use the pre-opened connections?"""
+        assert not pool.warm
+        assert pool.prewarm() == 3
+        assert pool.warm
+        host = f"http://{UPSTREAM_HOST}"
+        assert pool.stats()["hosts"] == {host: {"idle": 3, "opened": 3}}
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            responses = list(
+                executor.map(lambda i: pool.session.get(f"{upstream_url}/works/{i}"), range(3))
+            )
+
+        assert [response.status_code for response in responses] == [200] * 3
+        assert pool.stats()["hosts"] == {host: {"idle": 3, "opened": 3}}
+        # Resolved once while pre-warming, then served from the DNS cache
+        assert lookups.count(UPSTREAM_HOST) == 1
+
+    def test_unreachable_upstream_still_becomes_warm(self) -> None:
+        """Test: Does a failed warm-up leave the pool usable rather than stuck warming?"""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        pool = UpstreamPool(prewarm_connections=2, prewarm_url=f"http://127.0.0.1:{port}/")
+        try:
+            assert pool.prewarm() == 0
+            assert pool.warm
+        finally:
+            pool.close()
+
+    def test_library_requests_use_the_pool(
+        self, pool: UpstreamPool, upstream_url: str, lookups: List[str]
+    ) -> None:
+        """Test: Does the verifier library go through the pool once installed?"""
+        library = pytest.importorskip("llm_citation_verifier.verifier")
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(library, "requests", library.requests)
+            pool.prewarm()
+            pool.install()
+            verifier = library.CitationVerifier()
+            verifier.base_url = upstream_url
+
+            results = [verifier.verify_doi(VALID_DOI) for _ in range(3)]
+
+        assert all(result["verified"] for result in results)
+        assert pool.stats()["hosts"][f"http://{UPSTREAM_HOST}"]["opened"] == 3
+
+    def test_metrics(self, pool: UpstreamPool, lookups: List[str]) -> None:
+        """Test: Are pool size, idle connections and warm-up status exported?"""
+        assert "citation_upstream_pool_warm 0" in metrics.render()
+        pool.prewarm()
+
+        text = metrics.render()
+        assert "citation_upstream_pool_size 4" in text
+        assert f'citation_upstream_pool_idle_connections{{host="http://{UPSTREAM_HOST}"}} 3' in text
+        assert "citation_upstream_pool_warm 1" in text
+
+
+class TestReadiness:
+    """Test that new instances wait for their upstream connections."""
+
+    def test_not_ready_until_prewarmed(
+        self, pool: UpstreamPool, lookups: List[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test: Does /ready report warming until the connections are open?"""
+        from citation_verifier_mcp import websocket_server
+
+        with TestClient(websocket_server.app) as client:
+            monkeypatch.setattr(websocket_server, "citation_verifier", FakeVerifier())
+            monkeypatch.setattr(websocket_server, "readiness", ReadinessProbe())
+            monkeypatch.setattr(websocket_server, "upstream_pool", pool)
+
+            response = client.get("/ready")
+            assert response.status_code == 503
+            assert response.json()["upstream_pool"]["warm"] is False
+
+            pool.prewarm()
+            response = client.get("/ready")
+            assert response.status_code == 200
+            assert response.json()["upstream_pool"]["prewarmed"] == 3
@@ -32,6 +32,14 @@ class TestWebSocketServer:
         assert "service" in data
         assert data["service"] == "citation-verifier-mcp"
 
+    def test_readiness_endpoint(self, test_app: TestClient) -> None:
+        """Test: Does the readiness endpoint report ready once started?"""
+        response = test_app.get("/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert "cache" in data
+
     def test_server_info_endpoint(self, test_app: TestClient) -> None:
         """Test: Does the server info endpoint work?"""
         response = test_app.get("/")
@@ -54,7 +62,7 @@ class TestWebSocketServer:
         assert data["id"] == 1
         assert "result" in data
         assert "tools" in data["result"]
-        assert len(data["result"]["tools"]) == 1
+        assert len(data["result"]["tools"]) == 4
         tool = data["result"]["tools"][0]
         assert tool["name"] == "verify_citation"
 